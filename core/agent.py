@@ -11,6 +11,7 @@ try:
 except ModuleNotFoundError:
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
     from core.config import Config
+from core import registry
 
 
 class Agent:
@@ -45,6 +46,7 @@ class Agent:
 
         language_instruction = self._language_instruction()
         persona_instruction = self._persona_instruction()
+        apps_instruction = self._apps_instruction()
         system_prompt = (
             "You are HANA, an advanced real-time AI assistant and autonomous agent. "
             "Core purpose: interact naturally through text, understand intent, and use tools safely. "
@@ -57,12 +59,16 @@ class Agent:
             "Memory: remember user preferences and context during the session. "
             "Action format when needed: return ONLY JSON with keys "
             "{\"type\":\"action\",\"action\":\"...\",\"args\":{...},\"message\":\"...\"}. "
-            "Allowed actions: file.open, file.rename, file.move, file.delete, file.create_folder, "
-            "system.launch, system.open_path, system.open_url. "
+            f"{registry.prompt_section()}"
+            "When the user refers to a file by description instead of an exact path, use file.find "
+            "to locate it first. "
+            "When the user asks about something that was on their screen earlier, use screen.search "
+            "(query words and/or minutes back). "
             "You are allowed to open apps, folders, and websites. "
             "When the user asks to open or launch something, ALWAYS return an action JSON. "
             "Use system.open_url with {\"url\":\"https://...\"} or {\"query\":\"...\"} for websites. "
             "Use system.launch with {\"target\":\"app_name\"} to open apps (Telegram, Explorer, etc.). "
+            f"{apps_instruction}"
             "If the user asks to play a song/video on YouTube and gives no URL, "
             "use system.open_url with {\"provider\":\"youtube\",\"query\":\"...\",\"play\":true}. "
             "For replies: {\"type\":\"reply\",\"message\":\"...\"}. "
@@ -220,14 +226,17 @@ class Agent:
                     parsed["args"] = {}
                 if response_type == "action":
                     parsed["action"] = self._normalize_action_name(str(parsed.get("action", "")))
+                    self._prefetch_action(parsed["action"], parsed["args"])
                 return parsed
             if "action" in parsed:
-                return {
+                normalized = {
                     "type": "action",
                     "action": self._normalize_action_name(str(parsed.get("action", ""))),
                     "args": parsed.get("args", {}) if isinstance(parsed.get("args"), dict) else {},
                     "message": str(parsed.get("message", "")),
                 }
+                self._prefetch_action(normalized["action"], normalized["args"])
+                return normalized
             if "message" in parsed:
                 return {"type": "reply", "message": str(parsed.get("message", ""))}
 
@@ -236,25 +245,20 @@ class Agent:
             message = "Empty response from model."
         return {"type": "reply", "message": message}
 
+    def _prefetch_action(self, action: str, args: dict) -> None:
+        # Resolve the YouTube video while the reply is shown/spoken, before the executor needs it.
+        if action != "system.open_url" or str(args.get("provider", "")).lower() != "youtube":
+            return
+        if args.get("query") and (args.get("play") or args.get("play_first")):
+            from tools import youtube_resolver
+
+            youtube_resolver.get_resolver().prefetch(str(args["query"]))
+
     def _normalize_action_name(self, action: str) -> str:
         if not action:
             return action
         lowered = action.strip().lower()
-        alias_map = {
-            "open_url": "system.open_url",
-            "openurl": "system.open_url",
-            "open-web": "system.open_url",
-            "open_web": "system.open_url",
-            "browser.open": "system.open_url",
-            "open_path": "system.open_path",
-            "openpath": "system.open_path",
-            "open_file": "file.open",
-            "openfile": "file.open",
-            "launch": "system.launch",
-            "launch_app": "system.launch",
-            "start_app": "system.launch",
-        }
-        return alias_map.get(lowered, action)
+        return registry.resolve_alias(lowered) or action
 
     def _language_instruction(self) -> str:
         language = (self._config.language or "english").strip().lower()
@@ -264,6 +268,14 @@ class Agent:
             return "Reply to the user in Uzbek (Latin script) unless they ask for another language."
         return "Reply to the user in English unless they ask for another language."
 
+    def _apps_instruction(self) -> str:
+        from tools import app_index
+
+        names = app_index.get_index().names(limit=60)
+        if not names:
+            return ""
+        return "Installed apps (prefer these names for system.launch targets): " + ", ".join(names) + ". "
+
     def _persona_instruction(self) -> str:
         persona = (getattr(self._config, "persona", "assistant") or "assistant").strip().lower()
         if persona in ("waifu", "companion", "girlfriend", "vtuber"):
@@ -361,6 +373,9 @@ class Agent:
             drop_words = set(open_verbs) | set(play_verbs) | set(search_verbs) | set(youtube_keys)
             query = self._extract_query(lowered, drop_words)
             if query and has_play:
+                from tools import youtube_resolver
+
+                youtube_resolver.get_resolver().prefetch(query)
                 return {
                     "type": "action",
                     "action": "system.open_url",
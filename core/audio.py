@@ -0,0 +1,175 @@
+"""Streaming TTS playback helpers: ffmpeg-piped decoding and a long-lived PCM output stream (both optional)."""
+
+import asyncio
+import queue
+import shutil
+import threading
+import time
+
+try:
+    import sounddevice
+except Exception:  # ImportError, or OSError when PortAudio is missing
+    sounddevice = None
+
+
+SAMPLE_RATE = 24000  # edge-tts streams 24 kHz mono MP3
+SAMPLE_WIDTH = 2  # s16le
+_PCM_READ = 4096
+
+
+def streaming_available() -> bool:
+    return sounddevice is not None and shutil.which("ffmpeg") is not None
+
+
+async def decode_audio_stream(chunks, input_format: str = "mp3", sample_rate: int = SAMPLE_RATE):
+    """Yield mono s16le PCM while `chunks` (async iterator of bytes) are still arriving."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-loglevel",
+        "quiet",
+        "-f",
+        input_format,
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+
+    async def _feed() -> None:
+        try:
+            async for chunk in chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        finally:
+            try:
+                proc.stdin.close()
+            except Exception:
+                pass
+
+    feeder = asyncio.ensure_future(_feed())
+    try:
+        while True:
+            pcm = await proc.stdout.read(_PCM_READ)
+            if not pcm:
+                break
+            yield pcm
+        await feeder
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+
+
+class PcmOutput:
+    """One persistent output stream; `write` queues PCM and returns immediately.
+
+    With a `lipsync` (core.lipsync.LipSync), the mouth envelope is computed
+    when PCM is queued and published when it starts playing. Samples past the
+    last whole envelope frame are carried into the next write, so block sizes
+    never cut a frame short.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, lipsync=None) -> None:
+        self._sample_rate = sample_rate
+        self._lipsync = lipsync
+        self._lip_carry = b""  # queued samples not yet covered by an envelope frame
+        self._play_end = 0.0  # monotonic time the audio written so far finishes playing
+        self._queue: queue.Queue = queue.Queue()
+        self._stream = None
+        self._thread = None
+        self._pending = 0
+        self._generation = 0  # bumped by flush(); PCM queued under an older generation is skipped
+        self._cond = threading.Condition()
+
+    def _open_stream(self):
+        stream = sounddevice.RawOutputStream(samplerate=self._sample_rate, channels=1, dtype="int16")
+        stream.start()
+        return stream
+
+    def _ensure_started(self) -> None:
+        with self._cond:
+            if self._stream is None:
+                self._stream = self._open_stream()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._pump, daemon=True)
+                self._thread.start()
+
+    def write(self, pcm: bytes) -> None:
+        if not pcm:
+            return
+        self._ensure_started()
+        levels, lead = self._analyze(pcm) if self._lipsync is not None else (None, 0.0)
+        with self._cond:
+            self._pending += 1
+            generation = self._generation
+        self._queue.put((generation, pcm, levels, lead))
+
+    def _analyze(self, pcm: bytes):
+        """(envelope of the carried samples + whole frames of `pcm`, seconds the carry plays before `pcm`)."""
+        data = self._lip_carry + pcm
+        whole = len(data) // self._lipsync.frame_bytes * self._lipsync.frame_bytes
+        lead = len(self._lip_carry) / (self._sample_rate * SAMPLE_WIDTH)
+        self._lip_carry = data[whole:]
+        return self._lipsync.analyze(data[:whole]), lead
+
+    def mark(self, callback) -> None:
+        """Queue `callback` to run when playback reaches this point."""
+        self._ensure_started()
+        self._lip_carry = b""  # a sentence boundary; its last partial frame stays closed
+        with self._cond:
+            self._pending += 1
+        self._queue.put(callback)
+
+    def flush(self) -> None:
+        """Drop PCM that is queued but not played yet; markers still run, in order."""
+        with self._cond:
+            self._generation += 1
+        self._play_end = 0.0
+        self._lip_carry = b""
+        if self._lipsync is not None:
+            self._lipsync.clear()
+
+    def drain(self) -> None:
+        """Block until everything written so far has been played."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending == 0)
+        stream = self._stream
+        if stream is not None:
+            time.sleep(float(stream.latency or 0.0))
+
+    def _publish(self, pcm: bytes, levels, lead: float) -> None:
+        # A blocking write returns once the block is buffered, so it starts playing
+        # after everything already buffered (or after the device latency if idle).
+        now = time.monotonic()
+        starts_at = max(now + float(self._stream.latency or 0.0), self._play_end)
+        self._play_end = starts_at + len(pcm) / (self._sample_rate * SAMPLE_WIDTH)
+        self._lipsync.push(levels, starts_at - lead)
+
+    def _pump(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if callable(item):
+                    item()
+                elif item[0] == self._generation:
+                    if item[2] is not None:
+                        self._publish(item[1], item[2], item[3])
+                    self._stream.write(item[1])
+            except Exception:
+                pass
+            with self._cond:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._cond.notify_all()
@@ -10,10 +10,20 @@ class Config:
         self.api_url = os.environ.get("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
         self.language = os.environ.get("HANA_LANGUAGE", "english")
         self.tts_voice = os.environ.get("EDGE_TTS_VOICE", "ru-RU-SvetlanaNeural")
+        self.tts_backend = os.environ.get("HANA_TTS_BACKEND", "auto")
         self.avatar_mode = os.environ.get("HANA_AVATAR_MODE", "3d")
         self.persona = os.environ.get("HANA_PERSONA", "waifu")
         self.db_path = os.path.join(base_dir, "hana.db")
+        # Own file: screen history runs in WAL mode, which would otherwise switch hana.db for everyone.
+        self.screen_history_path = os.path.join(base_dir, "screen_history.db")
         self.trash_dir = os.path.join(base_dir, ".hana_trash")
+        self.cache_dir = os.path.join(base_dir, ".hana_cache")
+        self.tts_cache_dir = os.path.join(self.cache_dir, "tts")
+        self.tts_cache_mb = int(os.environ.get("HANA_TTS_CACHE_MB", "64") or 64)
+        self.screen_history_days = float(os.environ.get("HANA_SCREEN_HISTORY_DAYS", "14") or 14)
+        self.find_roots = [os.path.expanduser("~")] + [
+            path for path in os.environ.get("HANA_FIND_ROOTS", "").split(os.pathsep) if path.strip()
+        ]
 
     def save_api_key(self, api_key: str) -> None:
         env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".env"))
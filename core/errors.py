@@ -0,0 +1,2 @@
+class ActionCancelled(Exception):
+    """Raised by cancellable tools when the user stops a running action."""
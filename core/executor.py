@@ -1,17 +1,20 @@
 import json
 import os
 import sqlite3
+import time
 from datetime import datetime
 
+from core import registry
 from core.config import Config
-from core.safety import assess_action, normalize_path
-from tools import file_tools, system_tools
+from core.errors import ActionCancelled
+from core.safety import assess_action
 
 
 class Executor:
     def __init__(self) -> None:
         self._config = Config()
         self._init_db()
+        registry.warm_up()
 
     def _init_db(self) -> None:
         os.makedirs(os.path.dirname(self._config.db_path), exist_ok=True)
@@ -19,17 +22,25 @@ class Executor:
             conn.execute(
                 "CREATE TABLE IF NOT EXISTS actions ("
                 "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-                "timestamp TEXT, action TEXT, args TEXT, status TEXT, message TEXT)"
+                "timestamp TEXT, action TEXT, args TEXT, status TEXT, message TEXT, duration_ms REAL)"
             )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(actions)")}
+            if "duration_ms" not in columns:
+                conn.execute("ALTER TABLE actions ADD COLUMN duration_ms REAL")
 
-    def _log(self, action: str, args: dict, status: str, message: str) -> None:
+    def _log(self, action: str, args: dict, status: str, message: str, duration_ms: float | None = None) -> None:
         with sqlite3.connect(self._config.db_path) as conn:
             conn.execute(
-                "INSERT INTO actions (timestamp, action, args, status, message) VALUES (?, ?, ?, ?, ?)",
-                (datetime.utcnow().isoformat(), action, json.dumps(args), status, message),
+                "INSERT INTO actions (timestamp, action, args, status, message, duration_ms) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.utcnow().isoformat(), action, json.dumps(args), status, message, duration_ms),
             )
 
-    def execute_action(self, action: str, args: dict, confirmed: bool) -> dict:
+    def execute_action(self, action: str, args: dict, confirmed: bool, progress=None, cancel=None) -> dict:
+        """Validate and run an action; safe to call from a worker thread.
+
+        `progress(fraction, message)` and the `cancel` event are forwarded to
+        tools declared cancellable in the registry.
+        """
         allowed, risky, reason = assess_action(action, args)
         if not allowed:
             self._log(action, args, "denied", reason)
@@ -38,29 +49,31 @@ class Executor:
         if risky and not confirmed:
             return {"status": "needs_confirmation", "message": reason}
 
+        tool = registry.get_tool(action)
+        started = time.perf_counter()
         try:
-            result = self._dispatch(action, args)
-            self._log(action, args, "success", "OK")
-            return {"status": "success", "message": "Action executed.", "result": result}
+            result = self._dispatch(action, args, progress=progress, cancel=cancel)
+        except ActionCancelled as exc:
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            tool.record(duration_ms, ok=True)
+            self._log(action, args, "cancelled", str(exc), duration_ms)
+            return {"status": "cancelled", "message": "Action cancelled."}
         except Exception as exc:
-            self._log(action, args, "error", str(exc))
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            tool.record(duration_ms, ok=False)
+            self._log(action, args, "error", str(exc), duration_ms)
             return {"status": "error", "message": str(exc)}
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        tool.record(duration_ms, ok=True)
+        self._log(action, args, "success", "OK", duration_ms)
+        return {"status": "success", "message": "Action executed.", "result": result}
 
-    def _dispatch(self, action: str, args: dict) -> dict:
-        if action == "file.open":
-            return file_tools.open_file(normalize_path(args["path"]))
-        if action == "file.rename":
-            return file_tools.rename_file(normalize_path(args["src"]), normalize_path(args["dst"]))
-        if action == "file.move":
-            return file_tools.move_file(normalize_path(args["src"]), normalize_path(args["dst"]))
-        if action == "file.delete":
-            return file_tools.delete_file(normalize_path(args["path"]), self._config.trash_dir)
-        if action == "file.create_folder":
-            return file_tools.create_folder(normalize_path(args["path"]))
-        if action == "system.launch":
-            return system_tools.launch_app(args["target"], args.get("args", []))
-        if action == "system.open_path":
-            return system_tools.open_path(normalize_path(args["path"]))
-        if action == "system.open_url":
-            return system_tools.open_url(args)
-        raise ValueError(f"Unknown action: {action}")
+    def _dispatch(self, action: str, args: dict, progress=None, cancel=None) -> dict:
+        tool = registry.get_tool(action)
+        if tool is None:
+            raise ValueError(f"Unknown action: {action}")
+        kwargs = tool.bind(args, self._config)
+        if tool.cancellable:
+            kwargs["progress"] = progress
+            kwargs["cancel"] = cancel
+        return tool.load()(**kwargs)
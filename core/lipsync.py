@@ -0,0 +1,85 @@
+"""Mouth-openness envelope (one 0..1 level per 20 ms of s16le PCM) for avatar lip sync."""
+
+import collections
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from core.audio import SAMPLE_RATE
+
+
+FRAME_MS = 20
+_FLOOR_DB = -50.0  # quieter than this: mouth closed
+_REFERENCE_DB = -16.0  # loud speech: mouth fully open
+
+
+def envelope(pcm: bytes, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS):
+    """Per-frame mouth openness (float32 array, 0..1) for mono s16le `pcm`; None without NumPy."""
+    if numpy is None or not pcm:
+        return None
+    samples = numpy.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2")
+    hop = max(1, sample_rate * frame_ms // 1000)
+    frames = -(-len(samples) // hop)
+    padded = numpy.zeros(frames * hop, dtype=numpy.float32)
+    padded[: len(samples)] = samples
+    rms = numpy.sqrt(numpy.mean(numpy.square(padded.reshape(frames, hop) / 32768.0), axis=1))
+    db = 20.0 * numpy.log10(rms + 1e-9)
+    return numpy.clip((db - _FLOOR_DB) / (_REFERENCE_DB - _FLOOR_DB), 0.0, 1.0).astype(numpy.float32)
+
+
+class LipSync:
+    """Envelope of the audio currently playing, shared between the audio thread and renderers."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS) -> None:
+        self._sample_rate = sample_rate
+        self._frame_ms = frame_ms
+        self._frame_s = frame_ms / 1000.0
+        # (monotonic time the block starts playing, envelope) for the last few queued blocks
+        self._blocks: collections.deque = collections.deque(maxlen=16)
+
+    @property
+    def frame_bytes(self) -> int:
+        return max(1, self._sample_rate * self._frame_ms // 1000) * 2
+
+    @property
+    def enabled(self) -> bool:
+        return numpy is not None
+
+    def analyze(self, pcm: bytes):
+        return envelope(pcm, self._sample_rate, self._frame_ms)
+
+    def push(self, levels, starts_at: float) -> None:
+        self._blocks.append((starts_at, levels))
+
+    def clear(self) -> None:
+        self._blocks.clear()
+
+    def _block_at(self, now: float):
+        # Blocks are published up to the device latency ahead of playback; newest first.
+        for starts_at, levels in reversed(list(self._blocks)):
+            if starts_at <= now:
+                return starts_at, levels
+        return None
+
+    def level(self, now: float | None = None) -> float:
+        """Mouth openness (0..1) of the audio playing at `now`; 0 between utterances."""
+        now = now if now is not None else time.monotonic()
+        block = self._block_at(now)
+        if block is None:
+            return 0.0
+        starts_at, levels = block
+        idx = int((now - starts_at) / self._frame_s)
+        return float(levels[idx]) if idx < len(levels) else 0.0
+
+
+_LIPSYNC: LipSync | None = None
+
+
+def get_lipsync() -> LipSync:
+    global _LIPSYNC
+    if _LIPSYNC is None:
+        _LIPSYNC = LipSync()
+    return _LIPSYNC
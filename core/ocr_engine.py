@@ -0,0 +1,113 @@
+"""Tesseract word recognition on raw grayscale pixels (in-process tesserocr, else pytesseract)."""
+
+import numpy
+
+from core.ocr_preprocess import prepare, preset
+
+try:
+    import tesserocr  # type: ignore
+except ImportError:
+    tesserocr = None
+
+
+TESSERACT_MISSING = "Tesseract OCR not found. Install it and ensure the `tesseract` executable is on PATH."
+
+
+class OcrEngine:
+    def __init__(
+        self,
+        language: str = "eng",
+        min_confidence: int = 65,
+        tesseract_cmd: str | None = None,
+        preset_name: str = "balanced",
+    ) -> None:
+        self._language = language or "eng"
+        self._min_confidence = min_confidence
+        self._settings = preset(preset_name)
+        self._api = None
+        self._pytesseract = None
+        if tesserocr is not None:
+            try:
+                self._api = tesserocr.PyTessBaseAPI(
+                    lang=self._language,
+                    psm=self._settings["psm"],
+                    oem=self._settings["oem"],
+                )
+            except RuntimeError:  # no tessdata for this language: fall back to the CLI
+                self._api = None
+        if self._api is None:
+            import pytesseract  # type: ignore
+
+            if tesseract_cmd:
+                pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+            self._pytesseract = pytesseract
+
+    @property
+    def name(self) -> str:
+        return "tesserocr" if self._api is not None else "pytesseract"
+
+    def recognize(self, pixels: bytes, width: int, height: int) -> list[tuple]:
+        """Confident words of an 8-bit grayscale image as (text, left, top, width, height, conf)."""
+        gray, scale = prepare(numpy.frombuffer(pixels, dtype=numpy.uint8).reshape(height, width), self._settings)
+        height, width = gray.shape
+        if self._api is not None:
+            words = self._recognize_api(gray.tobytes(), width, height)
+        else:
+            words = self._recognize_cli(gray.tobytes(), width, height)
+        if scale == 1.0:
+            return words
+        return [
+            (text, round(x / scale), round(y / scale), round(w / scale), round(h / scale), conf)
+            for text, x, y, w, h, conf in words
+        ]
+
+    def _recognize_api(self, pixels: bytes, width: int, height: int) -> list[tuple]:
+        api = self._api
+        api.SetImageBytes(pixels, width, height, 1, width)
+        api.Recognize()
+        words = []
+        level = tesserocr.RIL.WORD
+        for item in tesserocr.iterate_level(api.GetIterator(), level):
+            text = (item.GetUTF8Text(level) or "").strip()
+            conf = item.Confidence(level)
+            box = item.BoundingBox(level)
+            if not text or conf < self._min_confidence or not box:
+                continue
+            x1, y1, x2, y2 = box
+            words.append((text, x1, y1, x2 - x1, y2 - y1, conf))
+        return words
+
+    def _recognize_cli(self, pixels: bytes, width: int, height: int) -> list[tuple]:
+        from PIL import Image  # type: ignore
+
+        pytesseract = self._pytesseract
+        img = Image.frombytes("L", (width, height), pixels)
+        try:
+            data = pytesseract.image_to_data(
+                img,
+                lang=self._language,
+                config=f"--psm {self._settings['psm']} --oem {self._settings['oem']}",
+                output_type=pytesseract.Output.DICT,
+            )
+        except pytesseract.TesseractNotFoundError:
+            # Its constructor takes no message, so it would not survive the trip back from a worker process.
+            raise RuntimeError(TESSERACT_MISSING) from None
+        words = []
+        for word, conf, x, y, w, h in zip(
+            data.get("text", []),
+            data.get("conf", []),
+            data.get("left", []),
+            data.get("top", []),
+            data.get("width", []),
+            data.get("height", []),
+        ):
+            try:
+                conf_val = float(conf)
+            except (TypeError, ValueError):
+                continue
+            if conf_val < self._min_confidence:
+                continue
+            word = (word or "").strip()
+            if word:
+                words.append((word, int(x), int(y), int(w), int(h), conf_val))
+        return words
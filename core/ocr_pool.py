@@ -0,0 +1,305 @@
+"""Screen OCR pipeline: a latest-wins hand-over from capture, then batched recognition on a process pool."""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.ocr_engine import OcrEngine
+from core.screen_capture import GrayConverter
+from core.screen_tiles import Box, TileGrid, TileTextCache, Word
+from core.text_regions import TextRegionDetector
+
+
+class LatestQueue:
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item) -> None:
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None):
+        """Newest item, or None on timeout/close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._item is not None or self._closed, timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+_ENGINE = None  # per worker process
+_MAX_POOL_RESTARTS = 3
+
+
+def _init_worker(language: str, min_confidence: int, tesseract_cmd: str | None, preset_name: str) -> None:
+    global _ENGINE
+    _ENGINE = OcrEngine(language, min_confidence, tesseract_cmd, preset_name)
+
+
+def ocr_regions(regions: list[tuple]) -> tuple[list[list[tuple]], float]:
+    """Worker: OCR a batch of raw 8-bit grayscale regions given as (pixels, width, height, left, top).
+
+    Returns each region's (text, left, top, width, height, conf) words in
+    frame coordinates, and the seconds the worker spent on the batch.
+    """
+    started = time.perf_counter()
+    results = []
+    for pixels, width, height, left, top in regions:
+        words = _ENGINE.recognize(pixels, width, height)
+        results.append([(text, left + x, top + y, w, h, conf) for text, x, y, w, h, conf in words])
+    return results, time.perf_counter() - started
+
+
+class _Frame:
+    def __init__(
+        self, seq: int, captured_at: float, shape: tuple, boxes: list, batches: list, futures: list, pool
+    ) -> None:
+        self.seq = seq
+        self.shape = shape
+        self.captured_at = captured_at
+        self.boxes = boxes  # dirty boxes whose cached words are replaced
+        self.batches = batches  # per future: the crops it recognizes
+        self.futures = futures
+        self.pool = pool  # the pool the futures run on
+        self.remaining = len(futures)
+
+
+class OcrPipeline:
+    def __init__(
+        self,
+        on_lines,
+        on_error,
+        language: str = "eng",
+        min_confidence: int = 65,
+        workers: int | None = None,
+        max_inflight: int = 2,
+        tile: int = 128,
+        margin: int = 24,
+        band_rows: int = 2,
+        tesseract_cmd: str | None = None,
+        downscale: int = 1,
+        preset: str = "balanced",
+        detect_text: bool = True,
+    ) -> None:
+        # on_lines(lines, captured_at) / on_error(exc) run on a pool thread
+        self._on_lines = on_lines
+        self._on_error = on_error
+        self._language = language
+        self._min_confidence = min_confidence
+        self._workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._margin = margin
+        self._band_rows = band_rows
+        self._tesseract_cmd = tesseract_cmd
+        self._preset = preset
+        self._frames = LatestQueue()
+        self._converter = GrayConverter(downscale)
+        self._detector = TextRegionDetector() if detect_text else None
+        self._slots = threading.Semaphore(max(1, max_inflight))
+        self._grid = TileGrid(tile)
+        self._cache = TileTextCache(tile)
+        self._shape: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._emitted_seq = -1
+        self._pool: ProcessPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._resync = False  # tiles were lost with a failed frame: rescan the next one in full
+        self._crashes = 0  # pools broken in a row; a worker that can't start breaks every new pool too
+        self.stale_results = 0
+        self.last_lag = 0.0
+        self.ocr_seconds = 0.0
+        self.busy_seconds = 0.0  # summed worker time, for CPU budgeting
+        self.frames_done = 0
+        self.ocr_fraction = 0.0
+
+    def start(self) -> None:
+        self._pool = self._new_pool()
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._frames.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=_init_worker,
+            initargs=(self._language, self._min_confidence, self._tesseract_cmd, self._preset),
+        )
+
+    def _recover(self, pool: ProcessPoolExecutor | None, exc: Exception) -> None:
+        """Rescan the tiles of a failed frame; replace `pool` if a worker crash broke it, up to a few times in a row."""
+        self._resync = True
+        if not isinstance(exc, BrokenProcessPool) or self._stopped.is_set():
+            return
+        with self._lock:
+            if pool is not self._pool:
+                return  # already replaced by another failed frame
+            self._crashes += 1
+            if self._crashes <= _MAX_POOL_RESTARTS:
+                self._pool = self._new_pool()
+        if self._crashes > _MAX_POOL_RESTARTS:
+            if self._crashes == _MAX_POOL_RESTARTS + 1:
+                self._on_error(exc)
+            return
+        print(f"[HANA] OCR worker crashed, restarting the pool: {exc}")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def push(self, frame, captured_at: float | None = None) -> None:
+        """Hand over a changed frame (BGRA view that is not written to afterwards); replaces one still waiting."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self._frames.put((seq, captured_at if captured_at is not None else time.monotonic(), frame))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "dropped_frames": self._frames.dropped,
+            "stale_results": self.stale_results,
+            "lag_ms": round(self.last_lag * 1000.0),
+        }
+
+    def _dispatch(self) -> None:
+        while not self._stopped.is_set():
+            # Wait for a free slot first, so the frame taken afterwards is the newest one.
+            if not self._slots.acquire(timeout=0.2):
+                continue
+            item = self._frames.get(timeout=0.2)
+            if item is None:
+                self._slots.release()
+                continue
+            pool = self._pool
+            try:
+                submitted = self._submit(pool, *item)
+            except Exception as exc:  # BrokenProcessPool after a worker crash, or a bad frame
+                submitted = False
+                if not isinstance(exc, BrokenProcessPool):
+                    print(f"[HANA] OCR dispatch failed: {exc}")
+                self._recover(pool, exc)
+            if not submitted:
+                self._slots.release()
+
+    def _submit(self, pool: ProcessPoolExecutor, seq: int, captured_at: float, frame) -> bool:
+        """Queue OCR of a frame's dirty tiles; False when nothing was queued (the slot is still held)."""
+        # Grayscale goes into the converter's reused buffer; crops are copied out below.
+        gray = self._converter.convert(frame)
+        height, width = gray.shape
+        if gray.shape != self._shape:
+            # New target size (window resized, target switched): old words are in other coordinates.
+            self._shape = gray.shape
+            with self._lock:
+                self._cache.clear()
+        if self._resync:
+            self._resync = False
+            self._grid.reset()
+        boxes = self._grid.split(self._grid.update(gray), self._band_rows)
+        if not boxes:
+            return False
+        crops = [(idx, crop) for idx, box in enumerate(boxes) for crop in self._crops(gray, box)]
+        self.ocr_fraction = sum(crop.area for _, crop in crops) / float(width * height)
+        started = time.perf_counter()
+        batches = self._batch(crops)
+        futures = []
+        for batch in batches:
+            regions = [
+                (
+                    gray[crop.top : crop.bottom, crop.left : crop.right].tobytes(),
+                    crop.right - crop.left,
+                    crop.bottom - crop.top,
+                    crop.left,
+                    crop.top,
+                )
+                for _, crop in batch
+            ]
+            futures.append(pool.submit(ocr_regions, regions))
+        frame = _Frame(seq, captured_at, gray.shape, boxes, batches, futures, pool)
+        if not futures:  # nothing text-like changed: the boxes are now empty
+            self._done(frame, started)
+        for future in futures:
+            future.add_done_callback(lambda _future, frame=frame, started=started: self._done(frame, started))
+        return True
+
+    def _crops(self, gray, box: Box) -> list[Box]:
+        """Regions of a dirty box to OCR: its likely text (with margin for context), or the whole padded box."""
+        height, width = gray.shape
+        area = box.padded(self._margin, width, height)
+        if self._detector is None:
+            return [area]
+        regions = self._detector.detect(gray[area.top : area.bottom, area.left : area.right])
+        return [
+            Box(area.left + region.left, area.top + region.top, area.left + region.right, area.top + region.bottom)
+            for region in regions
+        ]
+
+    def _batch(self, crops: list[tuple[int, Box]]) -> list[list[tuple[int, Box]]]:
+        """Spread (box index, crop) pairs over at most `workers` batches of similar pixel count (largest first)."""
+        batches = [[] for _ in range(min(self._workers, len(crops)))]
+        loads = [0] * len(batches)
+        for item in sorted(crops, key=lambda item: item[1].area, reverse=True):
+            idx = loads.index(min(loads))
+            batches[idx].append(item)
+            loads[idx] += item[1].area
+        return batches
+
+    def _done(self, frame: _Frame, started: float) -> None:
+        with self._lock:
+            frame.remaining -= 1
+            if frame.remaining > 0:
+                return
+        try:
+            results = [future.result() for future in frame.futures]
+        except BrokenProcessPool as exc:
+            self._slots.release()
+            self._recover(frame.pool, exc)
+            return
+        except Exception as exc:
+            self._slots.release()
+            if not self._stopped.is_set():
+                self._on_error(exc)
+            return
+        with self._lock:
+            self._crashes = 0
+            self.ocr_seconds += time.perf_counter() - started
+            self.busy_seconds += sum(seconds for _, seconds in results)
+            self.frames_done += 1
+            if frame.shape != self._shape:
+                # Captured before the target changed size; its words belong to the old layout.
+                self.stale_results += 1
+                self._slots.release()
+                return
+            # Words only replace the box their crop came from; margins overlap neighbouring boxes.
+            words = [[] for _ in frame.boxes]
+            for batch, (regions, _) in zip(frame.batches, results):
+                for (idx, crop), found in zip(batch, regions):
+                    words[idx].extend(Word(*word, block=(crop.left, crop.top)) for word in found)
+            for box, found in zip(frame.boxes, words):
+                self._cache.replace(box, found, frame.seq)
+            if frame.seq < self._emitted_seq:
+                # A newer frame finished first: only tiles it did not touch took these words.
+                self.stale_results += 1
+            else:
+                self._emitted_seq = frame.seq
+                self.last_lag = time.monotonic() - frame.captured_at
+            lines = self._cache.lines()
+        self._slots.release()
+        if not self._stopped.is_set():
+            self._on_lines(lines, frame.captured_at)
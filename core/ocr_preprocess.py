@@ -0,0 +1,96 @@
+"""
+OCR preprocessing for screen crops: rescale to the preset's text line height, fold inversion, contrast
+and Otsu threshold into lookup tables, and pick Tesseract's page segmentation / engine modes.
+"""
+
+import numpy
+
+try:
+    from PIL import Image  # type: ignore
+except ImportError:
+    Image = None
+
+PRESETS = {
+    "fast": {"line_height": 20, "stretch": False, "binarize": True, "psm": 6, "oem": 1},
+    "balanced": {"line_height": 28, "stretch": True, "binarize": True, "psm": 11, "oem": 1},
+    "accurate": {"line_height": 36, "stretch": True, "binarize": False, "psm": 3, "oem": 1},
+}
+
+_MIN_SCALE = 0.5
+_MAX_SCALE = 3.0
+
+
+def preset(name: str | None) -> dict:
+    return PRESETS.get((name or "balanced").lower(), PRESETS["balanced"])
+
+
+def otsu_threshold(hist: numpy.ndarray) -> int:
+    """Otsu threshold of a 256-bin histogram."""
+    levels = numpy.arange(256, dtype=numpy.float64)
+    weight = numpy.cumsum(hist, dtype=numpy.float64)
+    total = weight[-1]
+    if total <= 0:
+        return 128
+    mass = numpy.cumsum(hist * levels)
+    background = weight
+    foreground = total - weight
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        between = (mass[-1] * background / total - mass) ** 2 / (background * foreground)
+    between[~numpy.isfinite(between)] = 0.0
+    return int(numpy.argmax(between))
+
+
+def _percentile(hist: numpy.ndarray, fraction: float) -> int:
+    cumulative = numpy.cumsum(hist)
+    return int(numpy.searchsorted(cumulative, fraction * cumulative[-1]))
+
+
+def text_height(gray: numpy.ndarray, threshold: int, dark_text: bool) -> float | None:
+    """Median height (px) of the ink row runs, i.e. the text line height; None when there is no text."""
+    ink = gray <= threshold if dark_text else gray > threshold  # Otsu's dark class is <= t, as in prepare
+    rows = numpy.count_nonzero(ink, axis=1) > max(1, gray.shape[1] // 500)
+    if not rows.any():
+        return None
+    edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(([0], rows.view(numpy.int8), [0]))))
+    runs = edges[1::2] - edges[::2]
+    runs = runs[runs >= 4]  # underlines, separators and speckles are not text lines
+    if not runs.size:
+        return None
+    return float(numpy.median(runs))
+
+
+def prepare(gray: numpy.ndarray, settings: dict) -> tuple[numpy.ndarray, float]:
+    """Preprocessed copy of a 2-D uint8 crop and the scale applied to it (divide word boxes by it)."""
+    hist = numpy.bincount(gray.ravel(), minlength=256)
+    threshold = otsu_threshold(hist)
+    # More pixels above the threshold than below means a light background with dark text.
+    dark_text = hist[threshold + 1 :].sum() >= hist[: threshold + 1].sum()
+
+    lut = numpy.arange(256, dtype=numpy.float32)
+    if not dark_text:
+        lut = 255.0 - lut
+    if settings.get("stretch"):
+        mapped = numpy.bincount(lut.astype(numpy.uint8), weights=hist, minlength=256)
+        low, high = _percentile(mapped, 0.01), _percentile(mapped, 0.99)
+        if high > low:
+            lut = (lut - low) * (255.0 / (high - low))
+    lut = numpy.clip(lut, 0, 255).astype(numpy.uint8)
+
+    scale = 1.0
+    height = text_height(gray, threshold, dark_text)
+    if height:
+        scale = min(_MAX_SCALE, max(_MIN_SCALE, settings["line_height"] / height))
+        if abs(scale - 1.0) < 0.15:
+            scale = 1.0
+
+    out = lut[gray]
+    if scale != 1.0 and Image is not None:
+        size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+        resample = Image.BILINEAR if scale > 1.0 else Image.BOX
+        out = numpy.asarray(Image.fromarray(out).resize(size, resample))
+    elif scale != 1.0:
+        scale = 1.0  # no resampler available; keep the original size
+    if settings.get("binarize"):
+        cut = otsu_threshold(numpy.bincount(out.ravel(), minlength=256))
+        out = numpy.where(out > cut, numpy.uint8(255), numpy.uint8(0))
+    return numpy.ascontiguousarray(out), scale
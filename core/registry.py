@@ -0,0 +1,250 @@
+"""
+Action registry: one declaration per tool (arguments, confirmation, safety checks, implementation).
+Implementations are imported on first use; the agent prompt is generated from the same table.
+"""
+
+import importlib
+import threading
+
+from core.safety import normalize_path
+
+
+class ToolSpec:
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        func: str,
+        description: str,
+        params: dict,
+        checks: tuple = (),
+        risky: bool = False,
+        aliases: tuple = (),
+        config_params: dict | None = None,
+        warmup: str | None = None,
+        cancellable: bool = False,
+    ) -> None:
+        self.name = name
+        self.module = module
+        self.func = func
+        self.description = description
+        # param name -> {"type": "str"|"path"|"int"|"bool"|"list", "required": bool, "hint": str}
+        self.params = params
+        # (check name, arg names...) tuples understood by core.safety
+        self.checks = checks
+        self.risky = risky
+        self.aliases = aliases
+        # implementation kwarg -> Config attribute, e.g. {"trash_dir": "trash_dir"}
+        self.config_params = config_params or {}
+        # "module:function" started in the background at startup (e.g. to build an index)
+        self.warmup = warmup
+        # implementation accepts progress(fraction, message) and a cancel threading.Event
+        self.cancellable = cancellable
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self._impl = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()  # record() runs on pool workers
+
+    def load(self):
+        if self._impl is None:
+            with self._lock:
+                if self._impl is None:
+                    module = importlib.import_module(self.module)
+                    self._impl = getattr(module, self.func)
+        return self._impl
+
+    def bind(self, args: dict, config) -> dict:
+        """Map raw action args onto implementation kwargs (unknown args are dropped)."""
+        kwargs = {}
+        for key, spec in self.params.items():
+            if key not in args or args[key] is None:
+                continue
+            value = args[key]
+            kind = spec.get("type")
+            if kind == "path":
+                value = normalize_path(str(value))
+            elif kind == "int":
+                value = int(value)
+            elif kind == "bool":
+                value = bool(value)
+            elif kind == "list" and not isinstance(value, list):
+                value = [value]
+            kwargs[key] = value
+        for key, attr in self.config_params.items():
+            kwargs[key] = getattr(config, attr)
+        return kwargs
+
+    def record(self, duration_ms: float, ok: bool) -> None:
+        with self._stats_lock:
+            self.calls += 1
+            self.total_ms += duration_ms
+            if not ok:
+                self.errors += 1
+
+    def usage(self) -> str:
+        parts = []
+        for key, spec in self.params.items():
+            hint = spec.get("hint") or spec.get("type", "str")
+            optional = "" if spec.get("required") else "?"
+            parts.append(f"\"{key}\"{optional}:{hint}")
+        return f"{self.name} {{{', '.join(parts)}}} - {self.description}"
+
+
+TOOLS = [
+    ToolSpec(
+        "file.open",
+        "tools.file_tools",
+        "open_file",
+        "open a file with its default app",
+        {"path": {"type": "path", "required": True}},
+        checks=(("not_protected", "path"), ("exists", "path")),
+        aliases=("open_file", "openfile"),
+    ),
+    ToolSpec(
+        "file.rename",
+        "tools.file_tools",
+        "rename_file",
+        "rename a file or folder",
+        {"src": {"type": "path", "required": True}, "dst": {"type": "path", "required": True}},
+        checks=(("not_protected", "src", "dst"), ("exists", "src")),
+        risky=True,
+    ),
+    ToolSpec(
+        "file.move",
+        "tools.file_tools",
+        "move_file",
+        "move a file or folder",
+        {"src": {"type": "path", "required": True}, "dst": {"type": "path", "required": True}},
+        checks=(("not_protected", "src", "dst"), ("exists", "src")),
+        risky=True,
+        cancellable=True,
+    ),
+    ToolSpec(
+        "file.delete",
+        "tools.file_tools",
+        "delete_file",
+        "move a file to HANA's trash folder",
+        {"path": {"type": "path", "required": True}},
+        checks=(("not_protected", "path"), ("exists", "path")),
+        risky=True,
+        cancellable=True,
+        config_params={"trash_dir": "trash_dir"},
+    ),
+    ToolSpec(
+        "file.create_folder",
+        "tools.file_tools",
+        "create_folder",
+        "create a folder (and parents)",
+        {"path": {"type": "path", "required": True}},
+        checks=(("not_protected", "path"),),
+    ),
+    ToolSpec(
+        "file.find",
+        "tools.file_index",
+        "find_files",
+        "locate files by name when the user describes a file instead of giving a path",
+        {
+            "query": {"type": "str", "required": True, "hint": "name words"},
+            "ext": {"type": "str", "hint": "pdf"},
+            "after": {"type": "str", "hint": "YYYY-MM-DD"},
+            "before": {"type": "str", "hint": "YYYY-MM-DD"},
+            "limit": {"type": "int"},
+        },
+        aliases=("find_file", "search_files", "locate"),
+        warmup="tools.file_index:get_index",
+    ),
+    ToolSpec(
+        "screen.search",
+        "tools.screen_history",
+        "search_screen",
+        "search text that was on the user's screen earlier (e.g. an error message from 10 minutes ago)",
+        {
+            "query": {"type": "str", "hint": "words"},
+            "minutes": {"type": "int", "hint": "how far back"},
+            "limit": {"type": "int"},
+        },
+        aliases=("screen_search", "search_screen", "screen.history"),
+    ),
+    ToolSpec(
+        "system.launch",
+        "tools.system_tools",
+        "launch_app",
+        "open an installed app (Telegram, Explorer, etc.)",
+        {"target": {"type": "str", "required": True, "hint": "app_name"}, "args": {"type": "list"}},
+        checks=(("not_protected_if_exists", "target"),),
+        aliases=("launch", "launch_app", "start_app"),
+        warmup="tools.app_index:get_index",
+    ),
+    ToolSpec(
+        "system.open_path",
+        "tools.system_tools",
+        "open_path",
+        "open a folder or file in the file manager",
+        {"path": {"type": "path", "required": True}},
+        checks=(("not_protected", "path"), ("exists", "path")),
+        aliases=("open_path", "openpath"),
+    ),
+    ToolSpec(
+        "system.open_url",
+        "tools.system_tools",
+        "open_url",
+        "open a website, search the web, or play the first YouTube result",
+        {
+            "url": {"type": "str", "hint": "https://..."},
+            "query": {"type": "str"},
+            "provider": {"type": "str", "hint": "youtube"},
+            "play": {"type": "bool"},
+            "play_first": {"type": "bool"},
+        },
+        checks=(("any_of", "url", "query"),),
+        aliases=("open_url", "openurl", "open-web", "open_web", "browser.open"),
+        cancellable=True,
+    ),
+]
+
+_REGISTRY = {tool.name: tool for tool in TOOLS}
+_ALIASES = {alias: tool.name for tool in TOOLS for alias in tool.aliases}
+
+
+def get_tool(name: str) -> ToolSpec | None:
+    return _REGISTRY.get(name)
+
+
+def resolve_alias(name: str) -> str | None:
+    return _ALIASES.get(name)
+
+
+def action_names() -> list[str]:
+    return [tool.name for tool in TOOLS]
+
+
+def prompt_section() -> str:
+    """Action list with argument schemas for the system prompt."""
+    lines = "; ".join(tool.usage() for tool in TOOLS)
+    return f"Allowed actions (args with ? are optional): {lines}. "
+
+
+def stats() -> dict:
+    return {
+        tool.name: {"calls": tool.calls, "errors": tool.errors, "total_ms": round(tool.total_ms, 1)}
+        for tool in TOOLS
+        if tool.calls
+    }
+
+
+def warm_up() -> None:
+    """Import tools that keep background state (indexes) off the calling thread."""
+
+    def _run() -> None:
+        for tool in TOOLS:
+            if not tool.warmup:
+                continue
+            module_name, func_name = tool.warmup.split(":", 1)
+            try:
+                getattr(importlib.import_module(module_name), func_name)()
+            except Exception:
+                continue
+
+    threading.Thread(target=_run, daemon=True).start()
@@ -40,44 +40,58 @@ def validate_path_exists(path: str) -> bool:
     return os.path.exists(normalize_path(path))
 
 
+def _check_not_protected(args: dict, *keys: str) -> str | None:
+    if any(is_within_protected(args[key]) for key in keys):
+        if len(keys) > 1:
+            return "Source or destination is in a protected directory."
+        return "Target is in a protected directory."
+    return None
+
+
+def _check_not_protected_if_exists(args: dict, key: str) -> str | None:
+    target = args[key]
+    if os.path.exists(target) and is_within_protected(target):
+        return "Target is in a protected directory."
+    return None
+
+
+def _check_exists(args: dict, key: str) -> str | None:
+    if not validate_path_exists(args[key]):
+        return "Source path does not exist." if key == "src" else "Target path does not exist."
+    return None
+
+
+def _check_any_of(args: dict, *keys: str) -> str | None:
+    if not any(args.get(key) for key in keys):
+        return f"Missing {' or '.join(keys)} argument."
+    return None
+
+
+CHECKS = {
+    "not_protected": _check_not_protected,
+    "not_protected_if_exists": _check_not_protected_if_exists,
+    "exists": _check_exists,
+    "any_of": _check_any_of,
+}
+
+
 def assess_action(action: str, args: dict) -> tuple[bool, bool, str]:
-    risky = action in {"file.delete", "file.rename", "file.move"}
-
-    if action in {"file.open", "file.delete", "system.open_path", "file.create_folder"}:
-        path = args.get("path")
-        if not path:
-            return False, False, "Missing path argument."
-        if is_within_protected(path):
-            return False, False, "Target is in a protected directory."
-        if not validate_path_exists(path):
-            if action == "file.create_folder":
-                return True, False, "OK"
-            return False, False, "Target path does not exist."
-        return True, risky, "Confirmation required for risky action." if risky else "OK"
-
-    if action in {"file.rename", "file.move"}:
-        src = args.get("src")
-        dst = args.get("dst")
-        if not src or not dst:
-            return False, False, "Missing src or dst argument."
-        if is_within_protected(src) or is_within_protected(dst):
-            return False, False, "Source or destination is in a protected directory."
-        if not validate_path_exists(src):
-            return False, False, "Source path does not exist."
-        return True, risky, "Confirmation required for risky action."
-
-    if action == "system.launch":
-        target = args.get("target")
-        if not target:
-            return False, False, "Missing target argument."
-        if os.path.exists(target) and is_within_protected(target):
-            return False, False, "Target is in a protected directory."
-        return True, False, "OK"
-
-    if action == "system.open_url":
-        url = args.get("url") or args.get("query")
-        if not url:
-            return False, False, "Missing url or query argument."
-        return True, False, "OK"
-
-    return False, False, f"Unknown action: {action}"
+    from core.registry import get_tool  # local import: the registry imports this module
+
+    tool = get_tool(action)
+    if tool is None:
+        return False, False, f"Unknown action: {action}"
+
+    missing = [key for key, spec in tool.params.items() if spec.get("required") and not str(args.get(key) or "").strip()]
+    if missing:
+        return False, False, f"Missing {' or '.join(missing)} argument."
+
+    for check in tool.checks:
+        name, keys = check[0], check[1:]
+        reason = CHECKS[name](args, *keys)
+        if reason:
+            return False, False, reason
+
+    if tool.risky:
+        return True, True, "Confirmation required for risky action."
+    return True, False, "OK"
@@ -0,0 +1,205 @@
+"""Zero-copy grayscale conversion of mss captures and capture targets (monitor, region, window, focused window)."""
+
+import abc
+import ctypes
+import os
+import sys
+
+import numpy
+
+from core.screen_diff import bgra_view
+
+
+class GrayConverter:
+    _BAND = 32  # rows per pass
+
+    def __init__(self, downscale: int = 1) -> None:
+        self._step = max(1, int(downscale))
+        self._gray: numpy.ndarray | None = None
+        self._acc: numpy.ndarray | None = None
+        self._tmp: numpy.ndarray | None = None
+
+    @property
+    def downscale(self) -> int:
+        return self._step
+
+    def convert(self, frame: numpy.ndarray) -> numpy.ndarray:
+        """Grayscale (BT.601, integer weights) of a BGRA view; returns the reused output buffer."""
+        if self._step > 1:
+            frame = frame[:: self._step, :: self._step]
+        height, width = frame.shape[:2]
+        if self._gray is None or self._gray.shape != (height, width):
+            self._gray = numpy.empty((height, width), dtype=numpy.uint8)
+            self._acc = numpy.empty((self._BAND, width), dtype=numpy.uint16)
+            self._tmp = numpy.empty((self._BAND, width), dtype=numpy.uint16)
+        for top in range(0, height, self._BAND):
+            block = frame[top : top + self._BAND]
+            rows = block.shape[0]
+            acc = self._acc[:rows]
+            tmp = self._tmp[:rows]
+            numpy.multiply(block[..., 0], 29, out=acc, dtype=numpy.uint16)
+            numpy.multiply(block[..., 1], 150, out=tmp, dtype=numpy.uint16)
+            numpy.add(acc, tmp, out=acc)
+            numpy.multiply(block[..., 2], 77, out=tmp, dtype=numpy.uint16)
+            numpy.add(acc, tmp, out=acc)
+            numpy.right_shift(acc, 8, out=acc)
+            numpy.copyto(self._gray[top : top + rows], acc, casting="unsafe")
+        return self._gray
+
+    def convert_bytes(self, buffer, width: int, height: int) -> numpy.ndarray:
+        return self.convert(bgra_view(buffer, width, height))
+
+
+class _WinRect(ctypes.Structure):
+    _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long), ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+
+def _clip(left: int, top: int, right: int, bottom: int, desktop: dict) -> dict | None:
+    left = max(left, desktop["left"])
+    top = max(top, desktop["top"])
+    right = min(right, desktop["left"] + desktop["width"])
+    bottom = min(bottom, desktop["top"] + desktop["height"])
+    if right - left < 16 or bottom - top < 16:
+        return None
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def _window_rect(hwnd: int) -> tuple[int, int, int, int] | None:
+    """Visible frame of a window in screen pixels, or None when it is minimized, hidden or gone."""
+    user32 = ctypes.windll.user32
+    if not user32.IsWindow(hwnd) or not user32.IsWindowVisible(hwnd) or user32.IsIconic(hwnd):
+        return None
+    rect = _WinRect()
+    # DWMWA_EXTENDED_FRAME_BOUNDS excludes the invisible resize borders GetWindowRect includes.
+    if ctypes.windll.dwmapi.DwmGetWindowAttribute(hwnd, 9, ctypes.byref(rect), ctypes.sizeof(rect)) != 0:
+        if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+    return rect.left, rect.top, rect.right, rect.bottom
+
+
+def _window_pid(hwnd: int) -> int:
+    pid = ctypes.c_ulong()
+    ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value
+
+
+def _require_windows() -> None:
+    if sys.platform != "win32":
+        raise RuntimeError("Window capture is only supported on Windows; use a monitor or region target.")
+
+
+class CaptureTarget(abc.ABC):
+    @abc.abstractmethod
+    def bounds(self, monitors: list[dict]) -> dict | None:
+        """mss monitor dict to grab (monitors[0] is the whole desktop), or None to skip this frame."""
+
+    @abc.abstractmethod
+    def describe(self) -> str:
+        """Short label of the target, e.g. "monitor:1"."""
+
+
+class MonitorTarget(CaptureTarget):
+    def __init__(self, index: int = 1) -> None:
+        self._index = max(1, int(index))
+
+    def bounds(self, monitors: list[dict]) -> dict | None:
+        if self._index >= len(monitors):
+            raise RuntimeError(f"Monitor {self._index} not found ({len(monitors) - 1} connected).")
+        monitor = monitors[self._index]
+        return {key: monitor[key] for key in ("left", "top", "width", "height")}
+
+    def describe(self) -> str:
+        return f"monitor:{self._index}"
+
+
+class RegionTarget(CaptureTarget):
+    """Fixed rectangle in desktop coordinates (physical pixels), e.g. drawn with `ui.region_picker`."""
+
+    def __init__(self, left: int, top: int, width: int, height: int) -> None:
+        self._rect = (int(left), int(top), int(left) + int(width), int(top) + int(height))
+
+    def bounds(self, monitors: list[dict]) -> dict | None:
+        return _clip(*self._rect, monitors[0])
+
+    def describe(self) -> str:
+        left, top, right, bottom = self._rect
+        return f"region:{left},{top},{right - left},{bottom - top}"
+
+
+class WindowTarget(CaptureTarget):
+    """One window, found by handle or title substring, followed as it moves or resizes."""
+
+    def __init__(self, hwnd: int | None = None, title: str | None = None) -> None:
+        _require_windows()
+        self._hwnd = hwnd
+        self._title = (title or "").lower()
+
+    def bounds(self, monitors: list[dict]) -> dict | None:
+        if self._hwnd is None or not ctypes.windll.user32.IsWindow(self._hwnd):
+            self._hwnd = self._find() if self._title else None
+            if self._hwnd is None:
+                return None
+        rect = _window_rect(self._hwnd)
+        return _clip(*rect, monitors[0]) if rect else None
+
+    def describe(self) -> str:
+        return f"window:{self._title or self._hwnd}"
+
+    def _find(self) -> int | None:
+        user32 = ctypes.windll.user32
+        found = []
+
+        @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+        def visit(hwnd, _param):
+            length = user32.GetWindowTextLengthW(hwnd)
+            if length and user32.IsWindowVisible(hwnd):
+                buffer = ctypes.create_unicode_buffer(length + 1)
+                user32.GetWindowTextW(hwnd, buffer, length + 1)
+                if self._title in buffer.value.lower():
+                    found.append(hwnd)
+                    return False
+            return True
+
+        user32.EnumWindows(visit, 0)
+        return found[0] if found else None
+
+
+class FocusedWindowTarget(CaptureTarget):
+    """Whatever window has focus; our own windows (overlay, avatar) keep the previous one."""
+
+    def __init__(self) -> None:
+        _require_windows()
+        self._hwnd: int | None = None
+        self._pid = os.getpid()
+
+    def bounds(self, monitors: list[dict]) -> dict | None:
+        hwnd = ctypes.windll.user32.GetForegroundWindow()
+        if hwnd and _window_pid(hwnd) != self._pid:
+            self._hwnd = hwnd
+        if not self._hwnd:
+            return None
+        rect = _window_rect(self._hwnd)
+        return _clip(*rect, monitors[0]) if rect else None
+
+    def describe(self) -> str:
+        return "focused"
+
+
+def parse_target(spec: str | None) -> CaptureTarget:
+    """Target from a string: "monitor:N", "region:left,top,width,height", "window:<title or hwnd>", "focused"."""
+    spec = (spec or "").strip()
+    kind, _, value = spec.partition(":")
+    kind = kind.lower()
+    if not spec or kind == "monitor":
+        return MonitorTarget(int(value) if value.strip() else 1)
+    if kind == "region":
+        parts = [int(part) for part in value.split(",")]
+        if len(parts) != 4:
+            raise ValueError(f"Region needs left,top,width,height: {spec!r}")
+        return RegionTarget(*parts)
+    if kind == "window":
+        value = value.strip()
+        return WindowTarget(hwnd=int(value, 0)) if value.isdigit() or value.startswith("0x") else WindowTarget(title=value)
+    if kind == "focused":
+        return FocusedWindowTarget()
+    raise ValueError(f"Unknown capture target: {spec!r}")
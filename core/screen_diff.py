@@ -0,0 +1,44 @@
+"""Cheap change detection for screen captures: compare a downsampled grayscale thumbnail against the last OCRed frame."""
+
+import numpy
+
+
+def bgra_view(buffer, width: int, height: int) -> numpy.ndarray:
+    """(height, width, 4) uint8 view of a BGRA buffer, without copying it."""
+    return numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(height, width, 4)
+
+
+def thumbnail(frame: numpy.ndarray, step: int) -> numpy.ndarray:
+    """Grayscale thumbnail of a BGRA frame, sampling every `step`-th pixel (integer BT.601 weights)."""
+    sample = frame[::step, ::step]
+    gray = sample[..., 0].astype(numpy.uint16) * 29
+    gray += sample[..., 1].astype(numpy.uint16) * 150
+    gray += sample[..., 2].astype(numpy.uint16) * 77
+    return (gray >> 8).astype(numpy.uint8)
+
+
+class ChangeDetector:
+    def __init__(self, threshold: float = 0.004, step: int = 8, pixel_delta: int = 12) -> None:
+        # fraction of thumbnail pixels that must differ by more than `pixel_delta` levels
+        self._threshold = threshold
+        self._step = max(1, step)
+        self._pixel_delta = pixel_delta
+        self._reference: numpy.ndarray | None = None
+        self.last_difference = 0.0
+
+    def reset(self) -> None:
+        self._reference = None
+
+    def changed(self, frame: numpy.ndarray) -> bool:
+        """True when `frame` (BGRA view) differs enough from the last accepted frame; it then becomes the reference."""
+        thumb = thumbnail(frame, self._step)
+        if self._reference is None or self._reference.shape != thumb.shape:
+            self._reference = thumb
+            self.last_difference = 1.0
+            return True
+        delta = numpy.abs(thumb.astype(numpy.int16) - self._reference)
+        self.last_difference = float(numpy.count_nonzero(delta > self._pixel_delta)) / delta.size
+        if self.last_difference < self._threshold:
+            return False
+        self._reference = thumb
+        return True
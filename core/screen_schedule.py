@@ -0,0 +1,81 @@
+"""
+Adaptive capture rate for screen OCR: back off while the screen is static, speed up while it keeps
+changing, and never exceed the OCR CPU budget.
+"""
+
+import os
+
+
+class CaptureScheduler:
+    def __init__(
+        self,
+        interval: float = 2.0,
+        min_interval: float = 0.25,
+        max_interval: float = 8.0,
+        backoff: float = 1.5,
+        cpu_budget: float = 0.25,
+        smoothing: float = 0.3,
+    ) -> None:
+        self._min = max(0.05, min_interval)
+        self._max = max(self._min, max_interval)
+        self._base = min(self._max, max(self._min, interval))
+        self._backoff = max(1.0, backoff)
+        self._budget = max(0.01, cpu_budget)
+        self._smoothing = smoothing
+        self._cores = os.cpu_count() or 1
+        self._interval = self._base
+        self._changing = False  # the last frame changed
+        self._busy = 0.0
+        self._frames = 0
+        self._cost: float | None = None  # worker seconds per OCRed frame (EWMA)
+        self._share = 0.0  # measured OCR share of all cores (EWMA)
+        self.reason = "base"
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def observe(self, busy_seconds: float, frames_done: int, elapsed: float) -> None:
+        """Feed the pipeline's running totals of worker busy time and OCRed frames, and the wall time since the last call."""
+        busy = busy_seconds - self._busy
+        frames = frames_done - self._frames
+        self._busy, self._frames = busy_seconds, frames_done
+        if frames > 0:
+            cost = busy / frames
+            self._cost = cost if self._cost is None else self._cost + self._smoothing * (cost - self._cost)
+        if elapsed > 0:
+            share = busy / (elapsed * self._cores)
+            self._share += self._smoothing * (share - self._share)
+
+    def next_delay(self, changed: bool) -> float:
+        """Seconds to wait before the next capture, given whether the last one changed."""
+        if changed and self._changing:
+            self._interval = max(self._min, min(self._interval, self._base) / self._backoff)
+            self.reason = "changing"
+        elif changed:  # first change after a static period: back to the base pace
+            self._interval = self._base
+            self.reason = "changed"
+        else:
+            self._interval = min(self._max, self._interval * self._backoff)
+            self.reason = "static"
+        self._changing = changed
+        floor = self.budget_floor()
+        if floor > self._interval:
+            self._interval = min(self._max, floor)
+            self.reason = "cpu_budget"
+        return self._interval
+
+    def budget_floor(self) -> float:
+        """Shortest interval at which OCR stays within the CPU budget."""
+        if not self._cost:
+            return 0.0
+        return self._cost / (self._cores * self._budget)
+
+    def stats(self) -> dict:
+        return {
+            "interval_ms": round(self._interval * 1000.0),
+            "schedule": self.reason,
+            "ocr_cost_ms": round((self._cost or 0.0) * 1000.0),
+            "ocr_cpu_share": round(self._share, 3),
+            "cpu_budget": self._budget,
+        }
@@ -0,0 +1,101 @@
+"""Line-level de-duplication of screen OCR output, tolerant of case, whitespace and small misreads."""
+
+import difflib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_NOISE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(line: str) -> str:
+    return _NOISE.sub(" ", line.lower()).strip()
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[idx : idx + 3] for idx in range(len(padded) - 2)}
+
+
+class LineDeduper:
+    _CANDIDATES = 4  # best trigram matches checked with difflib
+
+    def __init__(self, window: float = 120.0, similarity: float = 0.85, max_lines: int = 400, min_chars: int = 3) -> None:
+        self._window = window
+        self._similarity = similarity
+        self._max_lines = max_lines
+        self._min_chars = min_chars
+        self._seen: OrderedDict[str, float] = OrderedDict()  # normalized line -> last seen, oldest first
+        self._index: dict[str, set[str]] = {}  # trigram -> seen lines containing it
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.suppressed = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
+            self._index.clear()
+
+    def fresh(self, lines: list[str], now: float | None = None) -> list[str]:
+        """Lines (original text, in order) not seen within the window; all given lines are marked as seen."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            fresh = []
+            for line in lines:
+                key = normalize(line)
+                if len(key) < self._min_chars:
+                    continue
+                match = key if key in self._seen else self._similar(key)
+                if match is not None:
+                    # Still on screen: keep it suppressed, and remember this reading as well.
+                    self._touch(match, now)
+                    self.suppressed += 1
+                else:
+                    fresh.append(line)
+                    self.emitted += 1
+                self._touch(key, now)
+            while len(self._seen) > self._max_lines:
+                self._forget(next(iter(self._seen)))
+            return fresh
+
+    def _touch(self, key: str, now: float) -> None:
+        if key not in self._seen:
+            for gram in _trigrams(key):
+                self._index.setdefault(gram, set()).add(key)
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+
+    def _forget(self, key: str) -> None:
+        del self._seen[key]
+        for gram in _trigrams(key):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def _expire(self, now: float) -> None:
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at <= self._window:
+                break
+            self._forget(key)
+
+    def _similar(self, key: str) -> str | None:
+        grams = _trigrams(key)
+        hits: dict[str, int] = {}
+        for gram in grams:
+            for other in self._index.get(gram, ()):
+                hits[other] = hits.get(other, 0) + 1
+        # A misread character breaks at most 3 trigrams, so real matches share most of them.
+        needed = len(grams) * (2.0 * self._similarity - 1.0)
+        candidates = sorted((count, other) for other, count in hits.items() if count >= needed)
+        matcher = difflib.SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(key)  # seq2 is the side SequenceMatcher caches
+        for _, other in candidates[-self._CANDIDATES :]:
+            matcher.set_seq1(other)
+            if matcher.quick_ratio() >= self._similarity and matcher.ratio() >= self._similarity:
+                return other
+        return None
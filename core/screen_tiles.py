@@ -0,0 +1,238 @@
+"""
+Dirty-tile bookkeeping for incremental screen OCR: hashed tiles, changed boxes, and per-tile text
+stitched back in reading order (recursive XY-cut over text blocks).
+"""
+
+import hashlib
+
+import numpy
+
+
+class Word:
+    __slots__ = ("text", "left", "top", "width", "height", "conf", "block")
+
+    def __init__(
+        self, text: str, left: int, top: int, width: int, height: int, conf: float, block: tuple | None = None
+    ) -> None:
+        self.text = text
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.conf = conf
+        self.block = block  # key of the text region the word was read from
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return self.left + self.width / 2.0, self.top + self.height / 2.0
+
+
+class Box:
+    """Pixel rectangle (left, top, right, bottom), right/bottom exclusive."""
+
+    __slots__ = ("left", "top", "right", "bottom")
+
+    def __init__(self, left: int, top: int, right: int, bottom: int) -> None:
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    @property
+    def area(self) -> int:
+        return max(0, self.right - self.left) * max(0, self.bottom - self.top)
+
+    def contains(self, x: float, y: float) -> bool:
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def padded(self, margin: int, width: int, height: int) -> "Box":
+        return Box(
+            max(0, self.left - margin),
+            max(0, self.top - margin),
+            min(width, self.right + margin),
+            min(height, self.bottom + margin),
+        )
+
+    def __repr__(self) -> str:
+        return f"Box({self.left}, {self.top}, {self.right}, {self.bottom})"
+
+
+def connected_groups(mask: numpy.ndarray) -> list[tuple[int, int, int, int, int]]:
+    """(top, left, bottom, right, cells) of each 8-connected group of a 2-D bool grid; bottom/right inclusive."""
+    rows, cols = mask.shape
+    seen = numpy.zeros_like(mask)
+    groups = []
+    for row, col in zip(*numpy.nonzero(mask)):
+        if seen[row, col]:
+            continue
+        stack = [(row, col)]
+        seen[row, col] = True
+        top, left, bottom, right = row, col, row, col
+        cells = 0
+        while stack:
+            r, c = stack.pop()
+            cells += 1
+            top, bottom = min(top, r), max(bottom, r)
+            left, right = min(left, c), max(right, c)
+            for nr in (r - 1, r, r + 1):
+                for nc in (c - 1, c, c + 1):
+                    if 0 <= nr < rows and 0 <= nc < cols and mask[nr, nc] and not seen[nr, nc]:
+                        seen[nr, nc] = True
+                        stack.append((nr, nc))
+        groups.append((int(top), int(left), int(bottom), int(right), cells))
+    return groups
+
+
+def reading_order(boxes: list[Box]) -> list[int]:
+    """Indices of `boxes` in reading order (recursive XY-cut: split at horizontal gaps first, then vertical ones)."""
+
+    def cut(indices: list[int]) -> list[int]:
+        if len(indices) < 2:
+            return indices
+        for start, end in (("top", "bottom"), ("left", "right")):
+            ordered = sorted(indices, key=lambda idx: getattr(boxes[idx], start))
+            groups, reach = [[ordered[0]]], getattr(boxes[ordered[0]], end)
+            for idx in ordered[1:]:
+                if getattr(boxes[idx], start) >= reach:
+                    groups.append([])
+                groups[-1].append(idx)
+                reach = max(reach, getattr(boxes[idx], end))
+            if len(groups) > 1:
+                return [idx for group in groups for idx in cut(group)]
+        return sorted(indices, key=lambda idx: (boxes[idx].top, boxes[idx].left))
+
+    return cut(list(range(len(boxes))))
+
+
+class TileGrid:
+    def __init__(self, tile: int = 128, expand: int = 1) -> None:
+        self._tile = tile
+        # extra tiles added left/right of a dirty region so words crossing its edge are read whole
+        self._expand = expand
+        self._shape: tuple[int, int] | None = None
+        self._hashes: dict[tuple[int, int], bytes] = {}
+
+    def reset(self) -> None:
+        self._shape = None
+        self._hashes.clear()
+
+    def tile_box(self, row: int, col: int) -> Box:
+        height, width = self._shape
+        return Box(
+            col * self._tile,
+            row * self._tile,
+            min(width, (col + 1) * self._tile),
+            min(height, (row + 1) * self._tile),
+        )
+
+    def update(self, gray: numpy.ndarray) -> list[Box]:
+        """Hash every tile of `gray` (2-D uint8) and return merged boxes of the tiles that changed."""
+        if self._shape != gray.shape:
+            self.reset()
+            self._shape = gray.shape
+        height, width = gray.shape
+        rows = -(-height // self._tile)
+        cols = -(-width // self._tile)
+        dirty = numpy.zeros((rows, cols), dtype=bool)
+        for row in range(rows):
+            band = gray[row * self._tile : (row + 1) * self._tile]
+            for col in range(cols):
+                tile = band[:, col * self._tile : (col + 1) * self._tile]
+                digest = hashlib.blake2b(tile.tobytes(), digest_size=8).digest()
+                if self._hashes.get((row, col)) != digest:
+                    self._hashes[(row, col)] = digest
+                    dirty[row, col] = True
+        return self._merge(dirty)
+
+    def split(self, boxes: list[Box], max_rows: int) -> list[Box]:
+        """Cut boxes taller than `max_rows` tiles into bands, so several OCR workers can share them."""
+        band = max(1, max_rows) * self._tile
+        parts = []
+        for box in boxes:
+            for top in range(box.top, box.bottom, band):
+                parts.append(Box(box.left, top, box.right, min(box.bottom, top + band)))
+        return parts
+
+    def _merge(self, dirty: numpy.ndarray) -> list[Box]:
+        """Bounding boxes of 8-connected groups of dirty tiles, widened by `expand` tiles."""
+        if self._expand and dirty.any():
+            widened = dirty.copy()
+            for shift in range(1, self._expand + 1):
+                widened[:, shift:] |= dirty[:, :-shift]
+                widened[:, :-shift] |= dirty[:, shift:]
+            dirty = widened
+        boxes = []
+        for top, left, bottom, right, _ in connected_groups(dirty):
+            first = self.tile_box(top, left)
+            last = self.tile_box(bottom, right)
+            boxes.append(Box(first.left, first.top, last.right, last.bottom))
+        return boxes
+
+
+class TileTextCache:
+    def __init__(self, tile: int = 128) -> None:
+        self._tile = tile
+        self._words: list[Word] = []
+        self._applied: dict[tuple[int, int], int] = {}  # tile -> newest frame sequence applied
+
+    def clear(self) -> None:
+        self._words = []
+        self._applied.clear()
+
+    def replace(self, box: Box, words: list[Word], seq: int = 0) -> None:
+        """Drop cached words centered inside `box` and add the new ones that are (margins belong to other tiles).
+
+        `seq` is the frame sequence the words were read from; tiles already
+        updated from a newer frame keep their words, so results may arrive out
+        of order.
+        """
+
+        def owned(word: Word) -> bool:
+            x, y = word.center
+            tile = (int(y) // self._tile, int(x) // self._tile)
+            return box.contains(x, y) and self._applied.get(tile, -1) <= seq
+
+        kept = [word for word in self._words if not owned(word)]
+        kept.extend(word for word in words if owned(word))
+        self._words = kept
+        for row in range(box.top // self._tile, -(-box.bottom // self._tile)):
+            for col in range(box.left // self._tile, -(-box.right // self._tile)):
+                if self._applied.get((row, col), -1) < seq:
+                    self._applied[(row, col)] = seq
+
+    def lines(self) -> list[str]:
+        """Cached words grouped into lines, block by block in reading order."""
+        blocks: dict[tuple | None, list[Word]] = {}
+        for word in self._words:
+            blocks.setdefault(word.block, []).append(word)
+        keys = list(blocks)
+        bounds = [
+            Box(
+                min(word.left for word in blocks[key]),
+                min(word.top for word in blocks[key]),
+                max(word.left + word.width for word in blocks[key]),
+                max(word.top + word.height for word in blocks[key]),
+            )
+            for key in keys
+        ]
+        lines = []
+        for idx in reading_order(bounds):
+            lines.extend(self._block_lines(blocks[keys[idx]]))
+        return lines
+
+    @staticmethod
+    def _block_lines(words: list[Word]) -> list[str]:
+        lines: list[tuple[float, float, list[Word]]] = []  # (top, bottom, words)
+        for word in sorted(words, key=lambda item: item.top):
+            center_y = word.center[1]
+            # words arrive sorted by top, so only the most recent lines can still match
+            for idx in range(len(lines) - 1, max(-1, len(lines) - 9), -1):
+                top, bottom, members = lines[idx]
+                if top <= center_y <= bottom:
+                    members.append(word)
+                    lines[idx] = (min(top, word.top), max(bottom, word.top + word.height), members)
+                    break
+            else:
+                lines.append((word.top, word.top + word.height, [word]))
+        lines.sort(key=lambda line: line[0])
+        return [" ".join(word.text for word in sorted(members, key=lambda item: item.left)) for _, _, members in lines]
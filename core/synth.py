@@ -0,0 +1,186 @@
+"""Speech synthesizer backends (Edge online voices, local espeak-ng) and the chain that falls back between them."""
+
+import abc
+import asyncio
+import shutil
+import time
+
+try:
+    import edge_tts
+except ImportError:
+    edge_tts = None
+
+from core.audio import decode_audio_stream
+
+
+# style -> (rate change in %, pitch change in %); unknown styles sound calm
+MOODS = {
+    "calm": (-3, -2),
+    "teasing": (6, 6),
+    "sleepy": (-12, -8),
+    "excited": (10, 10),
+}
+
+
+def mood_prosody(style: str | None) -> tuple[int, int]:
+    if not style:
+        return 0, 0
+    return MOODS.get(style.strip().lower(), MOODS["calm"])
+
+
+class Synthesizer(abc.ABC):
+    name = "base"
+    file_suffix = ".wav"
+    # seconds to wait for the first chunk before falling back (None waits forever)
+    first_chunk_timeout: float | None = None
+
+    def available(self) -> bool:
+        return True
+
+    def voice_for(self, voice: str) -> str:
+        """Map HANA's configured (Edge) voice name to this backend's voice."""
+        return voice
+
+    @abc.abstractmethod
+    def prosody(self, style: str | None) -> tuple[str, str]:
+        """(rate, pitch) for `style`, in this backend's units."""
+
+    @abc.abstractmethod
+    def stream(self, text: str, voice: str, rate: str, pitch: str):
+        """Async iterator of PCM chunks."""
+
+    @abc.abstractmethod
+    async def save(self, text: str, path: str, voice: str, rate: str, pitch: str) -> None:
+        """Write the audio of `text` to `path` (a `file_suffix` file)."""
+
+
+class EdgeSynthesizer(Synthesizer):
+    name = "edge"
+    file_suffix = ".mp3"
+    first_chunk_timeout = 3.0
+
+    def available(self) -> bool:
+        return edge_tts is not None
+
+    def prosody(self, style: str | None) -> tuple[str, str]:
+        rate, pitch = mood_prosody(style)
+        # edge-tts takes pitch in Hz; about 2 Hz per percent for its ~200 Hz voices.
+        return f"{rate:+d}%", f"{pitch * 2:+d}Hz"
+
+    async def stream(self, text: str, voice: str, rate: str, pitch: str):
+        communicate = edge_tts.Communicate(text, voice=voice, rate=rate, pitch=pitch)
+
+        async def _mp3_chunks():
+            async for chunk in communicate.stream():
+                if chunk.get("type") == "audio" and chunk.get("data"):
+                    yield chunk["data"]
+
+        async for pcm in decode_audio_stream(_mp3_chunks(), "mp3"):
+            yield pcm
+
+    async def save(self, text: str, path: str, voice: str, rate: str, pitch: str) -> None:
+        communicate = edge_tts.Communicate(text, voice=voice, rate=rate, pitch=pitch)
+        await communicate.save(path)
+
+
+class EspeakSynthesizer(Synthesizer):
+    name = "espeak"
+    _BASE_WPM = 175
+    _BASE_PITCH = 50  # espeak pitch is 0..99
+
+    def __init__(self, executable: str | None = None) -> None:
+        self._executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self._executable is not None
+
+    def voice_for(self, voice: str) -> str:
+        # "en-US-JennyNeural" -> "en-us+f3", "ru-RU-SvetlanaNeural" -> "ru+f3"
+        parts = (voice or "en").split("-")
+        language = parts[0].lower()
+        if language == "en" and len(parts) > 1:
+            language = f"en-{parts[1].lower()}"
+        return f"{language}+f3"
+
+    def prosody(self, style: str | None) -> tuple[str, str]:
+        rate, pitch = mood_prosody(style)
+        wpm = round(self._BASE_WPM * (100 + rate) / 100)
+        return str(wpm), str(max(0, min(99, self._BASE_PITCH + pitch * 2)))
+
+    async def _run(self, text: str, voice: str, rate: str, pitch: str, *output: str):
+        proc = await asyncio.create_subprocess_exec(
+            self._executable,
+            "-b",
+            "1",  # UTF-8 input
+            "-v",
+            voice,
+            "-s",
+            rate,
+            "-p",
+            pitch,
+            *output,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        proc.stdin.write(text.encode("utf-8"))
+        proc.stdin.close()
+        return proc
+
+    async def stream(self, text: str, voice: str, rate: str, pitch: str):
+        # espeak-ng has no framed stdin mode, so each sentence is its own (short-lived) process.
+        proc = await self._run(text, voice, rate, pitch, "--stdout")
+
+        async def _wav_chunks():
+            while True:
+                data = await proc.stdout.read(4096)
+                if not data:
+                    break
+                yield data
+
+        try:
+            async for pcm in decode_audio_stream(_wav_chunks(), "wav"):
+                yield pcm
+        finally:
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+            await proc.wait()
+
+    async def save(self, text: str, path: str, voice: str, rate: str, pitch: str) -> None:
+        proc = await self._run(text, voice, rate, pitch, "-w", path)
+        if await proc.wait() != 0:
+            raise RuntimeError("espeak-ng failed")
+
+
+class SynthesizerChain:
+    """Backends in preference order; a failing or slow backend sits out `cooldown` seconds."""
+
+    def __init__(self, backends: list[Synthesizer], cooldown: float = 60.0) -> None:
+        self.backends = [backend for backend in backends if backend.available()]
+        self._cooldown = cooldown
+        self._down_until: dict[str, float] = {}
+
+    def candidates(self) -> list[Synthesizer]:
+        now = time.monotonic()
+        healthy = [backend for backend in self.backends if self._down_until.get(backend.name, 0.0) <= now]
+        # With every backend down, keep trying them rather than going silent.
+        return healthy or list(self.backends)
+
+    def mark_down(self, backend: Synthesizer) -> None:
+        self._down_until[backend.name] = time.monotonic() + self._cooldown
+
+    def mark_up(self, backend: Synthesizer) -> None:
+        self._down_until.pop(backend.name, None)
+
+
+def build_chain(mode: str = "auto") -> SynthesizerChain:
+    """`auto`: Edge with espeak-ng fallback; `edge` / `local`: only that backend."""
+    mode = (mode or "auto").strip().lower()
+    if mode == "edge":
+        return SynthesizerChain([EdgeSynthesizer()])
+    if mode == "local":
+        return SynthesizerChain([EspeakSynthesizer()])
+    return SynthesizerChain([EdgeSynthesizer(), EspeakSynthesizer()])
@@ -0,0 +1,89 @@
+"""Fast text-likelihood detection (edge-density cells linked into lines) to crop screen frames before OCR."""
+
+import numpy
+
+from core.screen_tiles import Box, connected_groups
+
+
+class TextRegionDetector:
+    def __init__(
+        self,
+        cell: int = 16,
+        edge_delta: int = 48,
+        min_density: float = 0.04,
+        max_density: float = 0.4,
+        gap: int = 2,
+        min_cells: int = 2,
+        pad: int = 6,
+    ) -> None:
+        self._cell = max(4, cell - cell % 2)  # frame pixels; cells are counted on the 2x-downsampled frame
+        self._edge_delta = edge_delta
+        self._min_density = min_density
+        self._max_density = max_density
+        self._gap = gap  # empty cells bridged between words of one line
+        self._min_cells = min_cells
+        self._pad = pad
+
+    def cells(self, gray: numpy.ndarray) -> numpy.ndarray:
+        """Bool grid (rows, cols) of text-like cells of a 2-D uint8 frame."""
+        small = gray[::2, ::2].astype(numpy.int16)
+        size = self._cell // 2
+        # one extra pixel per axis so every cell has a neighbour to diff against
+        rows, cols = (small.shape[0] - 1) // size, (small.shape[1] - 1) // size
+        if rows <= 0 or cols <= 0:
+            return numpy.zeros((max(0, rows), max(0, cols)), dtype=bool)
+        small = small[: rows * size + 1, : cols * size + 1]
+        steps_x = numpy.abs(numpy.diff(small[:-1], axis=1)) > self._edge_delta
+        steps_y = numpy.abs(numpy.diff(small[:, :-1], axis=0)) > self._edge_delta
+        area = float(size * size)
+        density_x = steps_x.reshape(rows, size, cols, size).sum(axis=(1, 3)) / area
+        density_y = steps_y.reshape(rows, size, cols, size).sum(axis=(1, 3)) / area
+        return (
+            (density_x >= self._min_density)
+            & (density_y >= self._min_density / 2)
+            & (density_x + density_y <= self._max_density * 2)
+        )
+
+    def detect(self, gray: numpy.ndarray) -> list[Box]:
+        """Padded boxes (frame pixels) likely to contain text, in reading order."""
+        text = self.cells(gray)
+        if not text.any():
+            return []
+        linked = text.copy()
+        for shift in range(1, self._gap + 1):
+            # bridge gaps between words: a cell is linked if text lies within `gap` cells on both sides
+            left = numpy.zeros_like(text)
+            right = numpy.zeros_like(text)
+            left[:, shift:] = text[:, :-shift]
+            right[:, :-shift] = text[:, shift:]
+            linked |= left & right
+        height, width = gray.shape
+        boxes = []
+        for top, left, bottom, right, count in connected_groups(linked):
+            if count < self._min_cells:
+                continue
+            boxes.append(Box(left * self._cell, top * self._cell, (right + 1) * self._cell, (bottom + 1) * self._cell))
+        boxes = [box.padded(self._pad, width, height) for box in self._join_lines(boxes)]
+        boxes.sort(key=lambda box: (box.top, box.left))
+        return boxes
+
+    def _join_lines(self, boxes: list[Box]) -> list[Box]:
+        """Merge boxes side by side on the same line whose gap is under about three line heights (large fonts)."""
+        boxes = sorted(boxes, key=lambda box: box.left)
+        merged = True
+        while merged:
+            merged = False
+            for idx, box in enumerate(boxes):
+                for other in boxes[idx + 1 :]:
+                    overlap = min(box.bottom, other.bottom) - max(box.top, other.top)
+                    line = min(box.bottom - box.top, other.bottom - other.top)
+                    gap = max(box.left, other.left) - min(box.right, other.right)
+                    if overlap >= line * 0.6 and gap <= max(self._cell, line) * 3:
+                        box.left, box.top = min(box.left, other.left), min(box.top, other.top)
+                        box.right, box.bottom = max(box.right, other.right), max(box.bottom, other.bottom)
+                        boxes.remove(other)
+                        merged = True
+                        break
+                if merged:
+                    break
+        return boxes
@@ -1,58 +1,400 @@
 import asyncio
+import heapq
+import os
+import re
 import tempfile
 import threading
+import time
 
-import edge_tts
 from playsound import playsound
 
+from core.audio import SAMPLE_RATE, SAMPLE_WIDTH, PcmOutput, streaming_available
+from core.synth import SynthesizerChain, build_chain
+from core.tts_cache import AudioCache, cache_key
+
+
+# Sentence end: . ! ? … (also Russian/Uzbek text, which use the same marks) followed by
+# whitespace, optionally after closing quotes/brackets. "3.5" or "file.txt" never match.
+_SENTENCE_END_RE = re.compile(r"[.!?\u2026]+[\"'\u00bb\u201d)\]]*(?=\s)")
+_CLAUSE_END_RE = re.compile(r"(?<=[;:,\u2014])\s+")
+_CACHE_MAX_CHARS = 160  # longer sentences rarely repeat; keep them out of the cache
+_CACHED_CHUNK = SAMPLE_RATE * SAMPLE_WIDTH // 10  # replay cached audio in 100 ms chunks
+_ABBREVIATIONS = {
+    "mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.",
+    "т.е.", "т.д.", "т.п.", "г.", "ул.", "др.", "напр.",
+}
+
+
+def split_sentences(text: str, max_len: int = 220) -> list[str]:
+    """Split a reply into sentences; clauses of overlong sentences are split on , ; : and dashes."""
+    pieces = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(line):
+            candidate = line[start : match.end()].strip()
+            last_word = candidate.rsplit(" ", 1)[-1].lower()
+            if last_word in _ABBREVIATIONS:
+                continue
+            pieces.append(candidate)
+            start = match.end()
+        pieces.append(line[start:].strip())
+
+    sentences = []
+    for piece in pieces:
+        if not piece:
+            continue
+        if len(piece) <= max_len:
+            sentences.append(piece)
+            continue
+        current = ""
+        for clause in _CLAUSE_END_RE.split(piece):
+            if current and len(current) + len(clause) + 1 > max_len:
+                sentences.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        if current:
+            sentences.append(current)
+    return sentences
+
+
+# Speech priorities: lower plays first.
+PRIORITY_REPLY = 0
+PRIORITY_ACTION = 1
+PRIORITY_PROACTIVE = 2
+
+
+class _Utterance:
+    def __init__(self, seq: int, text: str, style: str | None, priority: int, key, deadline, on_done, on_start, on_end):
+        self.seq = seq
+        self.text = text
+        self.style = style
+        self.priority = priority
+        self.key = key
+        self.deadline = deadline
+        self.on_done = on_done
+        self.on_start = on_start
+        self.on_end = on_end
+        self.interrupted = False
+
+    def __lt__(self, other: "_Utterance") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
 
 class TTSPlayer:
-    def __init__(self, voice: str) -> None:
+    def __init__(
+        self,
+        voice: str,
+        synthesizers: SynthesizerChain | None = None,
+        output: PcmOutput | None = None,
+        lookahead: int = 1,
+        cache: AudioCache | None = None,
+        lipsync=None,
+    ) -> None:
         self._voice = voice
-        self._lock = threading.Lock()
+        # number of sentences synthesized ahead of the one currently playing
+        self._lookahead = max(0, lookahead)
+        self._cache = cache
+        self._synths = synthesizers or build_chain()
+        if output is None and streaming_available():
+            output = PcmOutput(lipsync=lipsync)
+        self._output = output
+        self.last_time_to_first_audio: float | None = None
+        # One speech thread with its own event loop plays queued utterances in priority order.
+        self._cond = threading.Condition()
+        self._queue: list[_Utterance] = []
+        self._discarded: list[_Utterance] = []
+        self._seq = 0
+        self._current: _Utterance | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
 
     def set_voice(self, voice: str) -> None:
         if voice:
             self._voice = voice
 
-    def speak(self, text: str, style: str | None = None, on_done=None) -> None:
+    def speak(
+        self,
+        text: str,
+        style: str | None = None,
+        on_done=None,
+        on_sentence_start=None,
+        on_sentence_end=None,
+        priority: int = PRIORITY_REPLY,
+        key: str | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """Queue `text` to be spoken sentence by sentence.
+
+        Utterances play one at a time, lowest `priority` first. A new utterance
+        replaces queued ones with the same `key`, and one still queued after
+        `max_wait` seconds is dropped. `on_done` runs exactly once per utterance
+        (played, replaced, dropped or interrupted), always from the speech thread
+        and in the order utterances leave the queue.
+
+        `on_sentence_start(index, sentence)` / `on_sentence_end(index, sentence)`
+        fire from the audio thread when playback reaches each sentence.
+        """
         if not text or not text.strip():
             return
-        thread = threading.Thread(target=self._run, args=(text, style, on_done), daemon=True)
-        thread.start()
+        deadline = time.monotonic() + max_wait if max_wait is not None else None
+        with self._cond:
+            self._seq += 1
+            item = _Utterance(
+                self._seq, text, style, priority, key, deadline, on_done, on_sentence_start, on_sentence_end
+            )
+            if key is not None:
+                stale = [queued for queued in self._queue if queued.key == key]
+                if stale:
+                    self._queue = [queued for queued in self._queue if queued.key != key]
+                    heapq.heapify(self._queue)
+                    self._discarded.extend(sorted(stale, key=lambda queued: queued.seq))
+            heapq.heappush(self._queue, item)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify()
 
-    def _run(self, text: str, style: str | None, on_done) -> None:
-        if not self._lock.acquire(blocking=False):
+    def interrupt(self, clear_queue: bool = True) -> None:
+        """Barge-in: stop the current utterance now and (by default) drop everything queued."""
+        with self._cond:
+            if clear_queue:
+                self._discarded.extend(sorted(self._queue, key=lambda queued: queued.seq))
+                self._queue = []
+            current = self._current
+            task = self._task
+            if current is not None:
+                current.interrupted = True
+            self._cond.notify()
+        if current is None:
             return
-        try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                path = f"{tmp_dir}\\tts.mp3"
-                asyncio.run(self._synthesize(text, path, style))
+        if task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+        if self._output is not None:
+            self._output.flush()
+
+    def _worker(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._discarded)
+                finished, self._discarded = self._discarded, []
+                item = None
+                if not finished:
+                    item = heapq.heappop(self._queue)
+                    if item.deadline is not None and time.monotonic() > item.deadline:
+                        finished, item = [item], None
+                self._current = item
+            for old in finished:
+                _safe_call(old.on_done)
+            if item is None:
+                continue
+            try:
+                self._run(item)
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self._current = None
+                    self._task = None
+                _safe_call(item.on_done)
+
+    def _run(self, item: _Utterance) -> None:
+        sentences = _spoken_sentences(item.text)
+
+        def on_start(idx: int, sentence: str) -> None:
+            if not item.interrupted:
+                _safe_call(item.on_start, idx, sentence)
+
+        def on_end(idx: int, sentence: str) -> None:
+            if not item.interrupted:
+                _safe_call(item.on_end, idx, sentence)
+
+        if self._output is not None:
+            task = self._loop.create_task(self._stream_sentences(sentences, item.style, on_start, on_end))
+            with self._cond:
+                self._task = task
+                if item.interrupted:
+                    task.cancel()
+            try:
+                self._loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                self._output.flush()
+            self._output.drain()
+            return
+
+        # No ffmpeg/sounddevice: synthesize each sentence to a file, then play it.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for idx, sentence in enumerate(sentences):
+                if item.interrupted:
+                    return
+                path = self._cached_path(sentence, item.style)
+                if not path:
+                    path, backend = self._loop.run_until_complete(self._save(sentence, item.style, tmp_dir))
+                    if self._cache is not None and len(sentence) <= _CACHE_MAX_CHARS:
+                        self._cache.put_wav(self._key(backend, sentence, item.style), path)
+                on_start(idx, sentence)
                 playsound(path)
-        finally:
-            self._lock.release()
-            if callable(on_done):
+                on_end(idx, sentence)
+
+    async def _stream_sentences(self, sentences: list[str], style: str | None, on_start, on_end) -> None:
+        """Synthesize sentence N+1 while sentence N plays, at most `lookahead` sentences ahead."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self._lookahead + 1)
+
+        def _release() -> None:
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:  # loop closed
+                pass
+
+        for idx, sentence in enumerate(sentences):
+            await slots.acquire()
+            await self._stream(sentence, style, before_audio=lambda i=idx, s=sentence: _safe_call(on_start, i, s))
+            self._output.mark(lambda i=idx, s=sentence: (_safe_call(on_end, i, s), _release()))
+
+    async def _stream(self, text: str, style: str | None, before_audio=None) -> None:
+        """Feed PCM to the output as soon as the first chunk is decoded.
+
+        Cached audio from any backend wins; otherwise backends are tried in
+        order, and one that fails or misses its first-chunk deadline is put on
+        cooldown while the next one speaks the sentence.
+        """
+        started = time.perf_counter()
+        cacheable = self._cache is not None and len(text) <= _CACHE_MAX_CHARS
+        if cacheable and self._synths.backends:
+            cached = self._cache.get(self._cached_key(text, style))
+            if cached is not None:
+                self.last_time_to_first_audio = time.perf_counter() - started
+                if before_audio is not None:
+                    self._output.mark(before_audio)
+                for offset in range(0, len(cached), _CACHED_CHUNK):
+                    self._output.write(cached[offset : offset + _CACHED_CHUNK])
+                return
+
+        error = None
+        for backend in self._synths.candidates():
+            rate, pitch = backend.prosody(style)
+            chunks = backend.stream(text, backend.voice_for(self._voice), rate, pitch)
+            try:
+                try:
+                    pcm = await asyncio.wait_for(chunks.__anext__(), backend.first_chunk_timeout)
+                except StopAsyncIteration:
+                    return
+                except Exception as exc:  # network down, timeout, missing executable...
+                    error = exc
+                    self._synths.mark_down(backend)
+                    continue
+                self._synths.mark_up(backend)
+                self.last_time_to_first_audio = time.perf_counter() - started
+                if before_audio is not None:
+                    self._output.mark(before_audio)
+                collected = bytearray() if cacheable else None
                 try:
-                    on_done()
-                except Exception:
+                    while True:
+                        self._output.write(pcm)
+                        if collected is not None:
+                            collected.extend(pcm)
+                        pcm = await chunks.__anext__()
+                except StopAsyncIteration:
                     pass
+                if collected:
+                    self._cache.put(self._key(backend, text, style), bytes(collected))
+                return
+            finally:
+                await _close(chunks)
+        if error is not None:
+            raise error
+
+    async def _save(self, text: str, style: str | None, tmp_dir: str) -> tuple[str, object]:
+        """Synthesize `text` to a file with the first backend that works; returns (path, backend)."""
+        error = None
+        for backend in self._synths.candidates():
+            rate, pitch = backend.prosody(style)
+            path = os.path.join(tmp_dir, f"tts{backend.file_suffix}")
+            try:
+                await backend.save(text, path, backend.voice_for(self._voice), rate, pitch)
+            except Exception as exc:
+                error = exc
+                self._synths.mark_down(backend)
+                continue
+            self._synths.mark_up(backend)
+            return path, backend
+        raise error or RuntimeError("No speech backend available.")
+
+    def _key(self, backend, text: str, style: str | None) -> str:
+        rate, pitch = backend.prosody(style)
+        return cache_key(text, backend.voice_for(self._voice), rate, pitch)
+
+    def _cached_key(self, text: str, style: str | None) -> str:
+        """Key of the best cached rendering of `text` (any backend), else the preferred backend's key."""
+        keys = [self._key(backend, text, style) for backend in self._synths.backends]
+        return next((key for key in keys if key in self._cache), keys[0])
+
+    def _cached_path(self, text: str, style: str | None) -> str | None:
+        if self._cache is None or not self._synths.backends:
+            return None
+        return self._cache.path_if_cached(self._cached_key(text, style))
+
+    def warm_up(self, lines) -> None:
+        """Pre-synthesize (text, style) pairs, exactly as `speak` would get them, into the cache in the background.
 
-    async def _synthesize(self, text: str, path: str, style: str | None) -> None:
-        payload, rate, pitch = self._build_payload(text, style)
-        communicate = edge_tts.Communicate(payload, voice=self._voice, rate=rate, pitch=pitch)
-        await communicate.save(path)
-
-    def _build_payload(self, text: str, style: str | None) -> tuple[str, str, str]:
-        if not style:
-            return text, "+0%", "+0Hz"
-        style = style.strip().lower()
-        mapping = {
-            "calm": {"rate": "-3%", "pitch": "-2%"},
-            "teasing": {"rate": "+6%", "pitch": "+6%"},
-            "sleepy": {"rate": "-12%", "pitch": "-8%"},
-            "excited": {"rate": "+10%", "pitch": "+10%"},
-        }
-        rates = mapping.get(style, mapping["calm"])
-        rate = rates["rate"]
-        pitch = rates["pitch"]
-        return text, rate, pitch
+        Without ffmpeg only backends that write WAV (espeak) can be warmed; Edge's MP3 can't be decoded.
+        """
+        if self._cache is None or not self._synths.backends:
+            return
+        lines = list(lines)
+        threading.Thread(target=lambda: asyncio.run(self._warm(lines)), daemon=True).start()
+
+    async def _warm(self, lines: list[tuple[str, str | None]]) -> None:
+        backend = self._synths.backends[0]
+        if self._output is None and backend.file_suffix != ".wav":
+            return
+        voice = backend.voice_for(self._voice)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for text, style in lines:
+                rate, pitch = backend.prosody(style)
+                for sentence in _spoken_sentences(text):
+                    key = cache_key(sentence, voice, rate, pitch)
+                    if len(sentence) > _CACHE_MAX_CHARS or key in self._cache:
+                        continue
+                    try:
+                        if self._output is None:
+                            path = os.path.join(tmp_dir, f"warm{backend.file_suffix}")
+                            await backend.save(sentence, path, voice, rate, pitch)
+                            self._cache.put_wav(key, path)
+                            continue
+                        collected = bytearray()
+                        async for pcm in backend.stream(sentence, voice, rate, pitch):
+                            collected.extend(pcm)
+                    except Exception:
+                        return  # offline: nothing to warm now
+                    self._cache.put(key, bytes(collected))
+
+    def cache_metrics(self) -> dict:
+        return self._cache.metrics() if self._cache is not None else {}
+
+
+def _spoken_sentences(text: str) -> list[str]:
+    """The sentences an utterance is synthesized (and cached) as."""
+    return split_sentences(text) or [text.strip()]
+
+
+async def _close(chunks) -> None:
+    try:
+        await chunks.aclose()
+    except Exception:
+        pass
+
+
+def _safe_call(callback, *args) -> None:
+    if callable(callback):
+        try:
+            callback(*args)
+        except Exception:
+            pass
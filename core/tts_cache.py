@@ -0,0 +1,185 @@
+"""On-disk LRU cache of synthesized speech: mono s16le WAV files keyed by a hash of (text, voice, rate, pitch)."""
+
+import array
+import hashlib
+import os
+import sys
+import threading
+import time
+import wave
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+def cache_key(text: str, voice: str, rate: str, pitch: str) -> str:
+    raw = "\x1f".join((normalize_text(text), voice or "", rate or "", pitch or ""))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def resample(pcm: bytes, src_rate: int, dst_rate: int) -> bytes:
+    """Linear resampling of mono s16le PCM (espeak writes 22.05 kHz, the cache holds the output rate)."""
+    if src_rate == dst_rate or len(pcm) < 2:
+        return pcm
+    samples = array.array("h")
+    samples.frombytes(pcm[: len(pcm) // 2 * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    last = len(samples) - 1
+    step = src_rate / dst_rate
+    out = array.array("h", bytes(2 * (len(samples) * dst_rate // src_rate)))
+    for idx in range(len(out)):
+        pos = idx * step
+        base = int(pos)
+        nxt = samples[base + 1] if base < last else samples[last]
+        out[idx] = int(samples[base] + (nxt - samples[base]) * (pos - base))
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out.tobytes()
+
+
+class AudioCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024, sample_rate: int = 24000) -> None:
+        self._dir = cache_dir
+        self._max_bytes = max_bytes
+        self._sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[int, float]] = {}  # key -> (size, last used)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self._dir, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        with os.scandir(self._dir) as it:
+            for entry in it:
+                if entry.name.endswith(".tmp"):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                if not entry.name.endswith(".wav"):
+                    continue
+                stat = entry.stat()
+                self._entries[entry.name[:-4]] = (stat.st_size, stat.st_mtime)
+                self._bytes += stat.st_size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, key + ".wav")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def path_if_cached(self, key: str) -> str | None:
+        """File path of a cached entry (counts as a hit), for players that need a file."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            now = time.time()
+            self._entries[key] = (self._entries[key][0], now)
+            self.hits += 1
+        path = self._path(key)
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return path
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+        path = self._path(key)
+        try:
+            with wave.open(path, "rb") as handle:
+                pcm = handle.readframes(handle.getnframes())
+        except (OSError, EOFError, wave.Error):
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (self._entries[key][0], now)
+            self.hits += 1
+        return pcm
+
+    def put(self, key: str, pcm: bytes) -> None:
+        if not pcm:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with wave.open(tmp_path, "wb") as handle:
+                handle.setnchannels(1)
+                handle.setsampwidth(2)
+                handle.setframerate(self._sample_rate)
+                handle.writeframes(pcm)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            old = self._entries.get(key)
+            if old:
+                self._bytes -= old[0]
+            self._entries[key] = (size, time.time())
+            self._bytes += size
+            self._evict()
+
+    def put_wav(self, key: str, path: str) -> bool:
+        """Store a synthesized mono 16-bit WAV file at the cache's rate; False when its format doesn't fit."""
+        try:
+            with wave.open(path, "rb") as handle:
+                if handle.getnchannels() != 1 or handle.getsampwidth() != 2:
+                    return False
+                rate = handle.getframerate()
+                pcm = handle.readframes(handle.getnframes())
+        except (OSError, EOFError, wave.Error):
+            return False
+        self.put(key, resample(pcm, rate, self._sample_rate))
+        return True
+
+    def _evict(self) -> None:
+        if self._bytes <= self._max_bytes:
+            return
+        for key, _ in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._bytes <= self._max_bytes:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        size, _ = self._entries.pop(key, (0, 0.0))
+        self._bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
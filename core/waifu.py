@@ -48,6 +48,13 @@ class MoodEngine:
 
 
 class ProactiveEngine:
+    LATE = "You still awake? Come curl up and rest~"
+    EARLY = "Morning already... want me to nudge you up?"
+    GAMING = "Game time? I?ll cheer quietly, promise."
+    FOCUS = "You?re deep in focus, huh? I?m here when you need me."
+    QUIET = "It?s quiet? need a hand or just vibes?"
+    LINES = (LATE, EARLY, GAMING, FOCUS, QUIET)
+
     def __init__(self) -> None:
         self._last = 0.0
         self._cooldown = 8 * 60  # seconds
@@ -60,14 +67,14 @@ class ProactiveEngine:
         self._last = now
         hour = datetime.fromtimestamp(now).hour
         if hour >= 23 or hour < 3:
-            return "You still awake? Come curl up and rest~"
+            return self.LATE
         if 5 <= hour < 7:
-            return "Morning already... want me to nudge you up?"
+            return self.EARLY
         if 19 <= hour <= 22 and mood == "playful":
-            return "Game time? I?ll cheer quietly, promise."
+            return self.GAMING
         if silence_sec > 3600:
-            return "You?re deep in focus, huh? I?m here when you need me."
-        return "It?s quiet? need a hand or just vibes?"
+            return self.FOCUS
+        return self.QUIET
 
 
 class MemoryLogger:
@@ -181,6 +188,20 @@ class WaifuLayer:
     def style_tag(self) -> str:
         return PersonaStyler.style_tag(self._mood.current())
 
+    def speech_variants(self, text: str, styled: bool = True) -> list[tuple[str, str]]:
+        """(spoken text, TTS style) of `text` in every mood, the current one first; `styled` as with filter_reply."""
+        current = self._mood.current()
+        variants = []
+        for mood in (current,) + tuple(m for m in MoodEngine._MOODS if m != current):
+            line = PersonaStyler.style(text, mood, self._config.persona) if styled else text
+            variant = (line, PersonaStyler.style_tag(mood))
+            if variant not in variants:
+                variants.append(variant)
+        return variants
+
+    def common_lines(self) -> tuple[str, ...]:
+        return ProactiveEngine.LINES
+
     def idle_state(self) -> str:
         return "idle"
 
@@ -0,0 +1,403 @@
+"""Installed application index for system.launch, cached on disk and rebuilt when a source directory changes."""
+
+import difflib
+import json
+import os
+import re
+import shlex
+import threading
+import time
+
+from core.config import Config
+
+
+ALIASES = {
+    "telegram": ("tg", "telegram desktop", "телеграм", "телега", "тг"),
+    "explorer": ("file explorer", "проводник"),
+    "chrome": ("google chrome", "google-chrome", "хром"),
+    "firefox": ("mozilla firefox", "файрфокс"),
+    "code": ("vscode", "vs code", "visual studio code"),
+    "notepad": ("блокнот",),
+    "calc": ("calculator", "калькулятор", "kalkulyator"),
+    "discord": ("дискорд",),
+    "spotify": ("спотифай",),
+    "steam": ("стим",),
+}
+
+_CACHE_VERSION = 1
+_RECHECK_SEC = 30.0
+_EXEC_FIELD_RE = re.compile(r"%[fFuUdDnNickvm]")
+
+
+def normalize_name(name: str) -> str:
+    lowered = (name or "").strip().strip('"').lower()
+    for suffix in (".exe", ".lnk", ".url", ".desktop", ".appref-ms"):
+        if lowered.endswith(suffix):
+            lowered = lowered[: -len(suffix)]
+            break
+    return " ".join(lowered.replace("_", " ").split())
+
+
+def _linux_desktop_dirs() -> list[str]:
+    home = os.path.expanduser("~")
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(os.pathsep)
+    dirs = [os.path.join(data_home, "applications")]
+    dirs += [os.path.join(d, "applications") for d in data_dirs if d]
+    dirs += [
+        "/var/lib/flatpak/exports/share/applications",
+        os.path.join(data_home, "flatpak", "exports", "share", "applications"),
+        "/var/lib/snapd/desktop/applications",
+    ]
+    return dirs
+
+
+def _windows_start_menu_dirs() -> list[str]:
+    dirs = []
+    for env in ("APPDATA", "ProgramData"):
+        base = os.environ.get(env)
+        if base:
+            dirs.append(os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"))
+    return dirs
+
+
+def _path_dirs() -> list[str]:
+    seen = []
+    for entry in (os.environ.get("PATH") or "").split(os.pathsep):
+        entry = entry.strip().strip('"')
+        if entry and entry not in seen:
+            seen.append(entry)
+    return seen
+
+
+def _dir_mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _app_paths_stamp() -> int:
+    try:
+        import winreg
+    except ImportError:
+        return 0
+    stamp = 0
+    key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, key_path) as key:
+                stamp = max(stamp, winreg.QueryInfoKey(key)[2])
+        except OSError:
+            continue
+    return stamp
+
+
+def source_signature() -> dict:
+    """Mtimes of every directory the index is built from."""
+    if os.name == "nt":
+        watched = _windows_start_menu_dirs() + _path_dirs()
+    else:
+        watched = _linux_desktop_dirs() + _path_dirs()
+    signature = {path: _dir_mtime(path) for path in watched}
+    if os.name == "nt":
+        signature["registry:App Paths"] = _app_paths_stamp()
+    return signature
+
+
+def _scan_path_executables() -> list[dict]:
+    entries = []
+    pathext = {".exe", ".bat", ".cmd", ".com"}
+    if os.name == "nt":
+        pathext = {ext.lower() for ext in (os.environ.get("PATHEXT") or ".EXE;.BAT;.CMD;.COM").split(";") if ext}
+    for directory in _path_dirs():
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if os.name == "nt":
+                        if os.path.splitext(entry.name)[1].lower() not in pathext:
+                            continue
+                    elif not os.access(entry.path, os.X_OK):
+                        continue
+                    entries.append({"name": entry.name, "kind": "exe", "target": entry.path, "gui": False})
+        except OSError:
+            continue
+    return entries
+
+
+def _parse_desktop_file(path: str) -> dict | None:
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+            for line in handle:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if not in_entry or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application":
+        return None
+    if fields.get("NoDisplay", "").lower() == "true" or fields.get("Hidden", "").lower() == "true":
+        return None
+    exec_line = _EXEC_FIELD_RE.sub("", fields.get("Exec", "")).replace("%%", "%").strip()
+    if not exec_line or not fields.get("Name"):
+        return None
+    try:
+        command = shlex.split(exec_line)
+    except ValueError:
+        return None
+    if not command:
+        return None
+    return {"name": fields["Name"], "kind": "desktop", "target": command, "gui": True, "file": path}
+
+
+def _scan_desktop_entries() -> list[dict]:
+    entries = []
+    for directory in _linux_desktop_dirs():
+        if not os.path.isdir(directory):
+            continue
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                if not name.endswith(".desktop"):
+                    continue
+                parsed = _parse_desktop_file(os.path.join(root, name))
+                if parsed:
+                    entries.append(parsed)
+                    stem = name[: -len(".desktop")]
+                    entries.append(dict(parsed, name=stem, alias=True))
+    return entries
+
+
+def _scan_start_menu() -> list[dict]:
+    entries = []
+    for directory in _windows_start_menu_dirs():
+        if not os.path.isdir(directory):
+            continue
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                if os.path.splitext(name)[1].lower() not in (".lnk", ".appref-ms", ".url"):
+                    continue
+                lowered = name.lower()
+                if "uninstall" in lowered or "readme" in lowered:
+                    continue
+                entries.append({"name": name, "kind": "shortcut", "target": os.path.join(root, name), "gui": True})
+    return entries
+
+
+def _scan_app_paths() -> list[dict]:
+    try:
+        import winreg
+    except ImportError:
+        return []
+    entries = []
+    key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            key = winreg.OpenKey(hive, key_path)
+        except OSError:
+            continue
+        with key:
+            count = winreg.QueryInfoKey(key)[0]
+            for idx in range(count):
+                try:
+                    sub_name = winreg.EnumKey(key, idx)
+                    with winreg.OpenKey(key, sub_name) as sub:
+                        value, _ = winreg.QueryValueEx(sub, "")
+                except OSError:
+                    continue
+                value = os.path.expandvars(str(value or "").strip().strip('"'))
+                if value and os.path.exists(value):
+                    entries.append({"name": sub_name, "kind": "exe", "target": value, "gui": True})
+    return entries
+
+
+def scan_applications() -> list[dict]:
+    if os.name == "nt":
+        # Start Menu first so shortcuts win over bare PATH executables.
+        return _scan_start_menu() + _scan_app_paths() + _scan_path_executables()
+    return _scan_desktop_entries() + _scan_path_executables()
+
+
+class AppIndex:
+    """Name -> launch target map, built in the background and cached on disk."""
+
+    def __init__(self, cache_path: str | None = None) -> None:
+        if cache_path is None:
+            cache_path = os.path.join(Config().cache_dir, "app_index.json")
+        self._cache_path = cache_path
+        self._entries: dict[str, dict] = {}
+        self._signature: dict = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._building = False
+        self._checked_at = 0.0
+        self._alias_map = {}
+        for canonical, aliases in ALIASES.items():
+            for alias in aliases:
+                self._alias_map[normalize_name(alias)] = canonical
+
+    def start(self) -> None:
+        """Load the on-disk cache and refresh it in the background if stale."""
+        if self._load_cache():
+            self._ready.set()
+            self._checked_at = time.monotonic()
+            if self._signature != source_signature():
+                self.rebuild_async()
+            return
+        self.rebuild_async()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def rebuild_async(self) -> None:
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        thread = threading.Thread(target=self._rebuild, daemon=True)
+        thread.start()
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._building = True
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        try:
+            signature = source_signature()
+            entries: dict[str, dict] = {}
+            for entry in scan_applications():
+                key = normalize_name(entry["name"])
+                if key and key not in entries:
+                    entries[key] = entry
+            self._link_aliases(entries)
+            with self._lock:
+                self._entries = entries
+                self._signature = signature
+            self._checked_at = time.monotonic()
+            self._save_cache()
+        except Exception as exc:
+            print(f"[HANA] App index rebuild failed: {exc}")
+        finally:
+            with self._lock:
+                self._building = False
+            self._ready.set()
+
+    def _link_aliases(self, entries: dict[str, dict]) -> None:
+        """Store alias keys directly so "tg" resolves with a single dict hit."""
+        for canonical, aliases in ALIASES.items():
+            entry = entries.get(canonical) or self._match_partial(canonical, entries)
+            if not entry:
+                continue
+            for name in (canonical,) + aliases:
+                entries.setdefault(normalize_name(name), dict(entry, alias=True))
+
+    @staticmethod
+    def _match_partial(key: str, entries: dict[str, dict]) -> dict | None:
+        for candidate, entry in entries.items():
+            if entry.get("gui") and (candidate.startswith(key + " ") or candidate.endswith(" " + key)):
+                return entry
+        return None
+
+    def _load_cache(self) -> bool:
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != _CACHE_VERSION or data.get("os") != os.name:
+            return False
+        with self._lock:
+            self._entries = data.get("entries", {})
+            self._signature = data.get("signature", {})
+        return True
+
+    def _save_cache(self) -> None:
+        with self._lock:
+            data = {
+                "version": _CACHE_VERSION,
+                "os": os.name,
+                "signature": self._signature,
+                "entries": self._entries,
+            }
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            tmp_path = self._cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            pass
+
+    def _maybe_refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < _RECHECK_SEC:
+            return
+        self._checked_at = now
+        if self._signature != source_signature():
+            self.rebuild_async()
+
+    def lookup(self, name: str) -> dict | None:
+        """Resolve a user-facing name ("tg", "телеграм", "chrome") to an index entry."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        entries = self._entries
+        entry = entries.get(key)
+        if entry:
+            return entry
+        canonical = self._alias_map.get(key)
+        if canonical and canonical in entries:
+            return entries[canonical]
+
+        # Slow path: the target is not a known name, so the index may be stale.
+        self._maybe_refresh()
+        return self._match_partial(canonical or key, entries)
+
+    def suggest(self, name: str, limit: int = 3) -> list[str]:
+        """Names close to a misspelled `name`, for the user to confirm (never launched directly)."""
+        key = normalize_name(name)
+        if not key:
+            return []
+        close = difflib.get_close_matches(key, list(self._entries.keys()), n=limit, cutoff=0.75)
+        return list(dict.fromkeys(self._entries[match]["name"] for match in close))
+
+    def names(self, limit: int = 40, gui_only: bool = True) -> list[str]:
+        """Display names of installed apps, e.g. for the LLM prompt."""
+        seen = []
+        for entry in self._entries.values():
+            if entry.get("alias") or (gui_only and not entry.get("gui")):
+                continue
+            name = os.path.splitext(entry["name"])[0] if entry.get("kind") == "shortcut" else entry["name"]
+            if name not in seen:
+                seen.append(name)
+            if len(seen) >= limit:
+                break
+        return sorted(seen, key=str.lower)
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> AppIndex:
+    """Shared index; the first call starts loading/building it in the background."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = AppIndex()
+            _INDEX.start()
+        return _INDEX
@@ -0,0 +1,104 @@
+"""
+Per-frame cost of turning a screen capture into OCR-ready grayscale: Pillow convert vs GrayConverter.
+Usage: python tools/bench_capture.py --width 3840 --height 2160 --frames 30 [--live] [--downscale 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy
+
+try:
+    from core.screen_capture import GrayConverter
+    from core.screen_diff import bgra_view
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from core.screen_capture import GrayConverter
+    from core.screen_diff import bgra_view
+
+
+def _synthetic_frames(width: int, height: int, count: int) -> list[bytearray]:
+    rng = numpy.random.default_rng(7)
+    frames = []
+    for _ in range(min(count, 3)):
+        frame = numpy.full((height, width, 4), 235, dtype=numpy.uint8)
+        rows = rng.integers(0, height - 12, size=200)
+        for row in rows:
+            col = int(rng.integers(0, width - 400))
+            frame[row : row + 10, col : col + 400, :3] = rng.integers(0, 80, size=(10, 400, 3), dtype=numpy.uint8)
+        frames.append(bytearray(frame.tobytes()))
+    return [frames[idx % len(frames)] for idx in range(count)]
+
+
+def _live_frames(count: int):
+    import mss  # type: ignore
+
+    with mss.mss() as sct:
+        monitor = sct.monitors[1]
+        grabs = [sct.grab(monitor) for _ in range(count)]
+    return [grab.raw for grab in grabs], grabs[0].width, grabs[0].height
+
+
+def _pil_path(raw: bytearray, width: int, height: int, downscale: int) -> numpy.ndarray:
+    from PIL import Image  # type: ignore
+
+    img = Image.frombytes("RGB", (width, height), bytes(raw), "raw", "BGRX").convert("L")
+    if downscale > 1:
+        img = img.resize((width // downscale, height // downscale), Image.NEAREST)
+    return numpy.asarray(img)
+
+
+def _measure(label: str, frames: list, convert, pil_bytes: int = 0) -> None:
+    convert(frames[0])  # warm up (first call allocates reusable buffers)
+    started = time.perf_counter()
+    for raw in frames:
+        convert(raw)
+    per_frame_ms = (time.perf_counter() - started) / len(frames) * 1000
+    # Separate pass: tracemalloc slows allocation-heavy code down.
+    tracemalloc.start()
+    for raw in frames[:5]:
+        convert(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"[{label:5}] {per_frame_ms:6.1f} ms/frame | traced peak {peak / 1e6:6.1f} MB"
+        f" + untraced Pillow buffers {pil_bytes / 1e6:5.1f} MB per frame"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Screen capture to grayscale benchmark.")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--downscale", type=int, default=1)
+    parser.add_argument("--live", action="store_true", help="Grab real frames with mss")
+    args = parser.parse_args()
+
+    if args.live:
+        frames, width, height = _live_frames(args.frames)
+    else:
+        width, height = args.width, args.height
+        frames = _synthetic_frames(width, height, args.frames)
+    print(f"{len(frames)} frames of {width}x{height}, downscale={args.downscale}")
+
+    try:
+        # RGB decode buffer + L image (+ resized copy)
+        pil_bytes = width * height * 4 + width * height
+        if args.downscale > 1:
+            pil_bytes += (width // args.downscale) * (height // args.downscale)
+        _measure("pil", frames, lambda raw: _pil_path(raw, width, height, args.downscale), pil_bytes)
+    except ImportError:
+        print("[pil  ] Pillow not installed, skipped")
+
+    converter = GrayConverter(args.downscale)
+    _measure("numpy", frames, lambda raw: converter.convert(bgra_view(raw, width, height)))
+
+
+if __name__ == "__main__":
+    main()
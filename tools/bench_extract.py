@@ -0,0 +1,88 @@
+"""
+PDF extraction benchmark: process_path on reading threads vs the extraction process pool (pages/s, chunks/s).
+Usage: python tools/bench_extract.py --pdfs 64 --pages 20 [--procs 1,2,4,8 --threads 8]; needs pypdf.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from tools.bench_ocr import WORDS
+    from tools.extract_pool import ExtractPool
+    from tools.full_index import process_path
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from tools.bench_ocr import WORDS
+    from tools.extract_pool import ExtractPool
+    from tools.full_index import process_path
+
+
+def make_pdf(lines_per_page: list[list[str]]) -> bytes:
+    """Minimal PDF with one Helvetica text page per entry."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in lines_per_page:
+        ops = ["BT /F1 10 Tf 12 TL 40 800 Td"]
+        ops += ["(" + line.replace("\\", "").replace("(", "").replace(")", "") + ") '" for line in lines]
+        stream = "\n".join(ops + ["ET"]).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for idx, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (idx, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare thread and process-pool PDF extraction.")
+    parser.add_argument("--pdfs", type=int, default=48)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=max(os.cpu_count() or 4, 4))
+    parser.add_argument("--procs", default=",".join(str(n) for n in sorted({0, 1, 2, os.cpu_count() or 2})))
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    root = Path(tempfile.mkdtemp(prefix="hana_pdf_bench_"))
+    try:
+        for idx in range(args.pdfs):
+            pages = [[" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(60)] for _ in range(args.pages)]
+            (root / f"doc{idx:03d}.pdf").write_bytes(make_pdf(pages))
+        paths = sorted(root.glob("*.pdf"))
+        pages = args.pdfs * args.pages
+        for procs in [int(n) for n in args.procs.split(",") if n.strip()]:
+            extractor = ExtractPool(procs) if procs else None
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                results = list(pool.map(lambda p: process_path(p, 64, 6000, 200, extractor=extractor), paths))
+            elapsed = time.perf_counter() - started
+            if extractor is not None:
+                extractor.close()
+            chunks = sum(len(result.docs) for result in results)
+            label = f"{procs} procs" if procs else "threads"
+            print(f"[{label:9}] {elapsed:6.2f} s  {pages / elapsed:7.1f} pages/s  {chunks / elapsed:7.1f} chunks/s")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Speed/accuracy benchmark (chars/s, character error rate) for the OCR presets on synthetic screenshots.
+Usage: python tools/bench_ocr.py --presets fast,balanced,accurate --images 6 [--font path.ttf --sizes 11,13,16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from core.ocr_engine import OcrEngine
+    from core.ocr_preprocess import PRESETS, prepare
+    from core.screen_tiles import Box, TileTextCache, Word
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from core.ocr_engine import OcrEngine
+    from core.ocr_preprocess import PRESETS, prepare
+    from core.screen_tiles import Box, TileTextCache, Word
+
+
+WORDS = (
+    "file edit view window help settings search open save project build run debug terminal "
+    "message reply meeting tomorrow invoice total amount status running stopped error warning "
+    "download folder desktop documents update version release notes python screen reader voice"
+).split()
+
+FONTS = ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf", "Segoe UI.ttf", "segoeui.ttf")
+
+
+def _font(path: str | None, size: int):
+    for name in ([path] if path else []) + list(FONTS):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def _render(rng: random.Random, font, dark: bool, width: int = 900, lines: int = 12) -> tuple[numpy.ndarray, str]:
+    size = font.size
+    height = int(lines * size * 1.6) + 20
+    background, ink = ((30, 31, 34), (220, 221, 222)) if dark else ((250, 250, 250), (32, 33, 36))
+    img = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(img)
+    reference = []
+    for idx in range(lines):
+        text = ""
+        while True:
+            candidate = (text + " " + rng.choice(WORDS)).strip()
+            if draw.textlength(candidate, font=font) > width - 40:
+                break
+            text = candidate
+        draw.text((20, 10 + idx * size * 1.6), text, fill=ink, font=font)
+        reference.append(text)
+    return numpy.asarray(img.convert("L")), "\n".join(reference)
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _text(words: list[tuple], width: int, height: int) -> str:
+    cache = TileTextCache(tile=max(width, height))
+    cache.replace(Box(0, 0, width, height), [Word(*word) for word in words])
+    return "\n".join(cache.lines())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OCR preset benchmark on synthetic screenshots.")
+    parser.add_argument("--presets", default=",".join(PRESETS))
+    parser.add_argument("--sizes", default="11,13,16,22", help="Font sizes in px")
+    parser.add_argument("--images", type=int, default=2, help="Images per size and theme")
+    parser.add_argument("--font", default=None, help="TrueType font path (default: a common system font)")
+    parser.add_argument("--language", default="eng")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    samples = []
+    for size in [int(size) for size in args.sizes.split(",") if size.strip()]:
+        font = _font(args.font, size)
+        for dark in (False, True):
+            for _ in range(args.images):
+                samples.append(_render(rng, font, dark))
+    chars = sum(len(reference) for _, reference in samples)
+    print(f"{len(samples)} images, {chars} characters")
+
+    for name in [name.strip() for name in args.presets.split(",") if name.strip()]:
+        started = time.perf_counter()
+        for gray, _ in samples:
+            prepare(gray, PRESETS[name])
+        prep_ms = (time.perf_counter() - started) / len(samples) * 1000
+        try:
+            engine = OcrEngine(args.language, min_confidence=0, preset_name=name)
+            errors = 0
+            started = time.perf_counter()
+            for gray, reference in samples:
+                height, width = gray.shape
+                words = engine.recognize(gray.tobytes(), width, height)
+                errors += _edit_distance(reference, _text(words, width, height))
+            elapsed = time.perf_counter() - started
+        except (ImportError, RuntimeError) as exc:
+            print(f"[{name:8}] preprocess {prep_ms:5.1f} ms/image | OCR unavailable: {exc}")
+            continue
+        print(
+            f"[{name:8}] preprocess {prep_ms:5.1f} ms/image | {chars / elapsed:7.0f} chars/s"
+            f" | CER {errors / chars * 100:5.1f}% | engine {engine.name}"
+        )
+
+
+if __name__ == "__main__":
+    main()
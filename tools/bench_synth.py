@@ -0,0 +1,86 @@
+"""
+Latency benchmark for the speech backends: time to first PCM chunk, total time and real-time factor.
+Usage: python tools/bench_synth.py --backends edge,espeak --runs 3 (needs ffmpeg; Edge needs the network).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+try:
+    from core.audio import SAMPLE_RATE, SAMPLE_WIDTH
+    from core.synth import EdgeSynthesizer, EspeakSynthesizer
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from core.audio import SAMPLE_RATE, SAMPLE_WIDTH
+    from core.synth import EdgeSynthesizer, EspeakSynthesizer
+
+
+PHRASES = (
+    "Action completed.",
+    "Opening YouTube.",
+    "I found three files that match your description.",
+    "It's getting late, maybe we should wrap up soon?",
+    "The download finished, and I moved the installer to your desktop folder.",
+)
+
+BACKENDS = {
+    "edge": EdgeSynthesizer,
+    "espeak": EspeakSynthesizer,
+}
+
+
+async def _measure(backend, phrase: str, voice: str, style: str | None) -> tuple[float, float, float]:
+    rate, pitch = backend.prosody(style)
+    started = time.perf_counter()
+    first = None
+    size = 0
+    async for pcm in backend.stream(phrase, backend.voice_for(voice), rate, pitch):
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(pcm)
+    total = time.perf_counter() - started
+    return first or total, total, size / (SAMPLE_RATE * SAMPLE_WIDTH)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare speech backend latency.")
+    parser.add_argument("--backends", default="edge,espeak", help="Comma-separated: " + ",".join(BACKENDS))
+    parser.add_argument("--voice", default="en-US-JennyNeural", help="Edge voice name (mapped per backend)")
+    parser.add_argument("--style", default=None, help="Mood style, e.g. calm, excited")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for name in [part.strip() for part in args.backends.split(",") if part.strip()]:
+        backend = BACKENDS[name]()
+        if not backend.available():
+            print(f"[{name:6}] not available")
+            continue
+        firsts = []
+        totals = []
+        factors = []
+        try:
+            for _ in range(args.runs):
+                for phrase in PHRASES:
+                    first, total, seconds = asyncio.run(_measure(backend, phrase, args.voice, args.style))
+                    firsts.append(first)
+                    totals.append(total)
+                    if seconds:
+                        factors.append(total / seconds)
+        except Exception as exc:
+            print(f"[{name:6}] failed: {exc}")
+            continue
+        print(
+            f"[{name:6}] first-chunk p50={statistics.median(firsts) * 1000:.0f} ms "
+            f"max={max(firsts) * 1000:.0f} ms | total p50={statistics.median(totals) * 1000:.0f} ms | "
+            f"RTF avg={statistics.mean(factors) if factors else 0.0:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
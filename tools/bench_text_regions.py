@@ -0,0 +1,81 @@
+"""
+Text-region detection on a synthetic desktop frame: detection time, share of the frame sent to OCR, ink coverage.
+Usage: python tools/bench_text_regions.py --width 3840 --height 2160 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy
+from PIL import Image, ImageFilter
+
+try:
+    from core.text_regions import TextRegionDetector
+    from tools.bench_ocr import _font, _render
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from core.text_regions import TextRegionDetector
+    from tools.bench_ocr import _font, _render
+
+
+def _desktop(width: int, height: int) -> tuple[numpy.ndarray, list[tuple[int, int, int, int]]]:
+    rng = random.Random(3)
+    frame = numpy.full((height, width), 238, dtype=numpy.uint8)
+    panels = []
+    x, y = 40, 80
+    for size, dark in ((11, False), (13, True), (16, False), (22, False), (13, False), (14, True)):
+        gray, _ = _render(rng, _font(None, size), dark, width=min(900, width // 3), lines=8)
+        rows, cols = gray.shape
+        if y + rows > height:
+            x, y = x + cols + 100, 80
+        if x + cols > width // 2:
+            break
+        frame[y : y + rows, x : x + cols] = gray
+        panels.append((x, y, cols, rows))
+        y += rows + 60
+    noise = numpy.random.default_rng(0)
+    photo_w, photo_h = width // 3, height // 3
+    photo = Image.fromarray(noise.integers(0, 255, (photo_h // 3, photo_w // 3), dtype=numpy.uint8))
+    photo = photo.resize((photo_w, photo_h), Image.BICUBIC).filter(ImageFilter.GaussianBlur(3))
+    frame[80 : 80 + photo_h, width // 2 + 100 : width // 2 + 100 + photo_w] = numpy.asarray(photo)
+    frame[height // 2 : height // 2 + height // 5, width // 2 + 100 : width // 2 + 100 + width // 5] = noise.integers(
+        0, 255, (height // 5, width // 5), dtype=numpy.uint8
+    )
+    frame[height - 120 : height - 118, :] = 100
+    frame[:, width // 2 : width // 2 + 2] = 120
+    return frame, panels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Text-region detector benchmark.")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    frame, panels = _desktop(args.width, args.height)
+    detector = TextRegionDetector()
+    boxes = detector.detect(frame)
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        detector.detect(frame)
+    detect_ms = (time.perf_counter() - started) / args.runs * 1000
+
+    covered = numpy.zeros(frame.shape, dtype=bool)
+    for box in boxes:
+        covered[box.top : box.bottom, box.left : box.right] = True
+    ink = numpy.zeros(frame.shape, dtype=bool)
+    for x, y, cols, rows in panels:
+        panel = frame[y : y + rows, x : x + cols].astype(numpy.int16)
+        ink[y : y + rows, x : x + cols] = numpy.abs(panel - int(numpy.median(panel))) > 60
+    print(f"{args.width}x{args.height}: {len(boxes)} boxes in {detect_ms:.1f} ms")
+    print(f"OCR area {covered.mean() * 100:.1f}% of the frame | text ink covered {covered[ink].mean() * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Time-to-first-audio benchmark, buffered vs streaming TTS playback, with a fake synthesizer and device.
+Usage: python tools/bench_tts.py --first-chunk-ms 300 --chunk-ms 60 --seconds 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import struct
+import sys
+import time
+import wave
+
+try:
+    from core.audio import SAMPLE_RATE, SAMPLE_WIDTH, PcmOutput
+    from core.synth import Synthesizer, SynthesizerChain
+    from core.tts import TTSPlayer
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from core.audio import SAMPLE_RATE, SAMPLE_WIDTH, PcmOutput
+    from core.synth import Synthesizer, SynthesizerChain
+    from core.tts import TTSPlayer
+
+
+class FakeSynthesizer(Synthesizer):
+    """Yields a sine tone in chunks with network-like latency."""
+
+    name = "fake"
+
+    def __init__(self, first_chunk_ms: float, chunk_ms: float, seconds: float, audio_per_chunk_ms: float = 250.0) -> None:
+        self._first = first_chunk_ms / 1000.0
+        self._interval = chunk_ms / 1000.0
+        frames = int(SAMPLE_RATE * audio_per_chunk_ms / 1000.0)
+        self._chunk = b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE))) for i in range(frames)
+        )
+        self._count = max(1, int(seconds * 1000.0 / audio_per_chunk_ms))
+
+    def prosody(self, style: str | None) -> tuple[str, str]:
+        return "+0%", "+0Hz"
+
+    async def stream(self, text: str, voice: str, rate: str, pitch: str):
+        await asyncio.sleep(self._first)
+        for idx in range(self._count):
+            if idx:
+                await asyncio.sleep(self._interval)
+            yield self._chunk
+
+    async def save(self, text: str, path: str, voice: str, rate: str, pitch: str) -> None:
+        with wave.open(path, "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(SAMPLE_WIDTH)
+            handle.setframerate(SAMPLE_RATE)
+            handle.writeframes(self._chunk * self._count)
+
+
+class _RealtimeStream:
+    latency = 0.0
+
+    def __init__(self) -> None:
+        self.first_write_at: float | None = None
+
+    def write(self, pcm: bytes) -> None:
+        if self.first_write_at is None:
+            self.first_write_at = time.perf_counter()
+        time.sleep(len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH))
+
+
+class FakeOutput(PcmOutput):
+    def _open_stream(self):
+        return _RealtimeStream()
+
+
+async def _buffered(synth: FakeSynthesizer) -> float:
+    started = time.perf_counter()
+    audio = bytearray()
+    async for pcm in synth.stream("bench", "fake", "+0%", "+0Hz"):
+        audio.extend(pcm)
+    return time.perf_counter() - started
+
+
+def _streaming(synth: FakeSynthesizer) -> tuple[float, float]:
+    output = FakeOutput()
+    player = TTSPlayer("fake", synthesizers=SynthesizerChain([synth]), output=output)
+    started = time.perf_counter()
+    asyncio.run(player._stream("bench", None))
+    output.drain()
+    first = output._stream.first_write_at - started
+    return first, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TTS time-to-first-audio benchmark (fake synthesizer).")
+    parser.add_argument("--first-chunk-ms", type=float, default=300.0)
+    parser.add_argument("--chunk-ms", type=float, default=60.0)
+    parser.add_argument("--seconds", type=float, default=6.0, help="Length of the synthesized utterance")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    buffered = []
+    streamed = []
+    for _ in range(args.runs):
+        synth = FakeSynthesizer(args.first_chunk_ms, args.chunk_ms, args.seconds)
+        buffered.append(asyncio.run(_buffered(synth)))
+        streamed.append(_streaming(synth)[0])
+
+    print(f"utterance={args.seconds:.1f}s first_chunk={args.first_chunk_ms:.0f}ms chunk_every={args.chunk_ms:.0f}ms")
+    print(f"[buffered ] time-to-first-audio avg={sum(buffered) / len(buffered) * 1000:.0f} ms")
+    print(f"[streaming] time-to-first-audio avg={sum(streamed) / len(streamed) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Walker benchmark on a synthetic tree: the old rglob crawl vs tools/fs_walk.walk_files.
+Usage: python tools/bench_walk.py --files 500000 [--root D:\\walk_bench --keep] [--workers 1,4,8,16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from tools.full_index import DEFAULT_EXT_ALLOW
+    from tools.fs_walk import walk_files
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from tools.full_index import DEFAULT_EXT_ALLOW
+    from tools.fs_walk import walk_files
+
+
+EXTENSIONS = (".txt", ".md", ".py", ".json", ".png", ".jpg", ".bin", ".dll", ".pdf", ".csv")
+NOISE_DIRS = (".git/objects", "node_modules/pkg", ".venv/lib", "build")
+
+
+def build_tree(root: Path, files: int, per_dir: int = 50, seed: int = 3) -> None:
+    rng = random.Random(seed)
+    made = 0
+    project = 0
+    while made < files:
+        base = root / f"project{project:04d}"
+        project += 1
+        (base).mkdir(parents=True, exist_ok=True)
+        (base / ".gitignore").write_text("build/\n*.tmp\n")
+        dirs = [base / f"src/mod{i}/sub{j}" for i in range(4) for j in range(3)]
+        dirs += [base / noise / f"d{i}" for noise in NOISE_DIRS for i in range(2)]
+        for folder in dirs:
+            folder.mkdir(parents=True, exist_ok=True)
+            for idx in range(per_dir):
+                if made >= files:
+                    return
+                ext = rng.choice(EXTENSIONS)
+                (folder / f"f{idx}{ext}").write_bytes(b"x" * rng.randint(0, 64))
+                made += 1
+
+
+def old_walk(root: Path) -> int:
+    kept = 0
+    for path in root.rglob("*"):
+        if path.is_file():
+            path.stat()
+            if path.suffix.lower() in DEFAULT_EXT_ALLOW:
+                kept += 1
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the rglob crawl with the parallel scandir walker.")
+    parser.add_argument("--files", type=int, default=500_000)
+    parser.add_argument("--root", default=None, help="Tree location (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="Keep the tree for the next run")
+    parser.add_argument("--workers", default="1,4,8,16")
+    args = parser.parse_args()
+
+    root = Path(args.root) if args.root else Path(tempfile.gettempdir()) / "hana_walk_bench"
+    if not root.exists():
+        started = time.perf_counter()
+        build_tree(root, args.files)
+        print(f"built {args.files} files in {time.perf_counter() - started:.1f} s under {root}")
+    try:
+        started = time.perf_counter()
+        kept = old_walk(root)
+        print(f"[rglob     ] {time.perf_counter() - started:6.2f} s  {kept} indexable files")
+        accept = lambda name: os.path.splitext(name)[1].lower() in DEFAULT_EXT_ALLOW
+        for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            started = time.perf_counter()
+            kept = sum(1 for _ in walk_files([str(root)], accept=accept, workers=workers))
+            print(f"[walk x{workers:<3}] {time.perf_counter() - started:6.2f} s  {kept} indexable files (pruned)")
+        started = time.perf_counter()
+        total = sum(1 for _ in walk_files([str(root)], excludes=frozenset(), ignore_files=(), workers=8))
+        print(f"[walk-all  ] {time.perf_counter() - started:6.2f} s  {total} files (no pruning, x8)")
+    finally:
+        if not args.keep and not args.root:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
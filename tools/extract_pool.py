@@ -0,0 +1,205 @@
+"""
+Process pool for PDF text extraction used by tools/full_index.py: chunks stream back per page,
+with a per-file deadline and a per-worker memory cap.
+"""
+
+import ctypes
+import io
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+
+class ChunkStream:
+    """Incremental `chunk_text`: feed text pieces, get the same chunks as chunking the joined text."""
+
+    def __init__(self, max_len: int, overlap: int) -> None:
+        if max_len <= overlap:
+            raise ValueError("max_len must be greater than overlap")
+        self._max_len = max_len
+        self._step = max_len - overlap
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        chunks = []
+        while len(self._buffer) >= self._max_len:
+            chunks.append(self._buffer[: self._max_len])
+            self._buffer = self._buffer[self._step :]
+        return chunks
+
+    def flush(self) -> list[str]:
+        chunks = []
+        while self._buffer:
+            chunks.append(self._buffer[: self._max_len])
+            self._buffer = self._buffer[self._step :] if len(self._buffer) > self._step else ""
+        return chunks
+
+
+def _pdf_pages(data: bytes):
+    import pypdf
+
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    for idx, page in enumerate(reader.pages):
+        yield ("\n" if idx else "") + (page.extract_text() or "")
+
+
+EXTRACTORS = {".pdf": _pdf_pages}
+
+
+class _JobLimits(ctypes.Structure):
+    # JOBOBJECT_EXTENDED_LIMIT_INFORMATION (basic limits, IO counters, memory limits)
+    _fields_ = [
+        ("per_process_user_time", ctypes.c_int64),
+        ("per_job_user_time", ctypes.c_int64),
+        ("limit_flags", ctypes.c_uint32),
+        ("min_working_set", ctypes.c_size_t),
+        ("max_working_set", ctypes.c_size_t),
+        ("active_process_limit", ctypes.c_uint32),
+        ("affinity", ctypes.c_size_t),
+        ("priority_class", ctypes.c_uint32),
+        ("scheduling_class", ctypes.c_uint32),
+        ("io_counters", ctypes.c_uint64 * 6),
+        ("process_memory_limit", ctypes.c_size_t),
+        ("job_memory_limit", ctypes.c_size_t),
+        ("peak_process_memory", ctypes.c_size_t),
+        ("peak_job_memory", ctypes.c_size_t),
+    ]
+
+
+def _limit_memory(limit_mb: int) -> None:
+    """Cap this process's memory; allocations beyond it raise MemoryError."""
+    if limit_mb <= 0:
+        return
+    limit = limit_mb * 1024 * 1024
+    if sys.platform == "win32":
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateJobObjectW.restype = ctypes.c_void_p
+        job = kernel32.CreateJobObjectW(None, None)
+        info = _JobLimits()
+        info.limit_flags = 0x100  # JOB_OBJECT_LIMIT_PROCESS_MEMORY
+        info.process_memory_limit = limit
+        # JobObjectExtendedLimitInformation = 9
+        if job and kernel32.SetInformationJobObject(ctypes.c_void_p(job), 9, ctypes.byref(info), ctypes.sizeof(info)):
+            kernel32.AssignProcessToJobObject(ctypes.c_void_p(job), ctypes.c_void_p(kernel32.GetCurrentProcess()))
+        return
+    try:
+        import resource
+
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ImportError, ValueError, OSError):
+        pass  # no limit on this platform
+
+
+def _worker_main(conn, memory_mb: int, max_len: int, overlap: int) -> None:
+    try:
+        import pypdf  # noqa: F401  (loaded while the worker is idle, not on its first file)
+    except ImportError:
+        pass
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, MemoryError):
+            return  # a MemoryError here means the file alone is over the cap; the pool replaces this worker
+        if task is None:
+            return
+        suffix, data = task
+        stream = ChunkStream(max_len, overlap)
+        try:
+            for text in EXTRACTORS[suffix](data):
+                chunks = stream.feed(text)
+                if chunks:
+                    conn.send(("chunks", chunks))
+            conn.send(("chunks", stream.flush()))
+            conn.send(("done", None))
+        except MemoryError:
+            conn.send(("error", f"over the {memory_mb} MB memory limit"))
+        except Exception as exc:
+            conn.send(("error", str(exc) or type(exc).__name__))
+
+
+class _Worker:
+    def __init__(self, context, memory_mb: int, max_len: int, overlap: int) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child, memory_mb, max_len, overlap), name="hana-extract", daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractPool:
+    def __init__(
+        self, workers: int | None = None, timeout: float = 120.0, memory_mb: int = 1024, max_len: int = 6000, overlap: int = 200
+    ) -> None:
+        # spawn, not fork: workers are replaced while the indexer's threads are running
+        self._context = multiprocessing.get_context("spawn")
+        self._args = (memory_mb, max_len, overlap)
+        self._timeout = timeout
+        self._idle: queue.Queue = queue.Queue()
+        self._workers = max(1, workers or os.cpu_count() or 2)
+        for _ in range(self._workers):
+            self._idle.put(_Worker(self._context, *self._args))
+        self.timeouts = 0
+        self.failures = 0
+
+    @staticmethod
+    def handles(suffix: str) -> bool:
+        return suffix.lower() in EXTRACTORS
+
+    def extract(self, path: str, data: bytes) -> list[str] | None:
+        """Chunks of `data` (the bytes of `path`), or None when extraction failed or timed out. Thread-safe."""
+        worker = self._idle.get()
+        chunks: list[str] = []
+        try:
+            worker.conn.send((os.path.splitext(path)[1].lower(), data))
+            deadline = time.monotonic() + self._timeout
+            while True:
+                if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                    self.timeouts += 1
+                    print(f"[warn] extract timed out after {self._timeout:g}s {path}")
+                    worker = self._replace(worker)
+                    return None
+                kind, payload = worker.conn.recv()
+                if kind == "chunks":
+                    chunks.extend(payload)
+                elif kind == "done":
+                    return chunks
+                else:
+                    self.failures += 1
+                    print(f"[warn] extract failed {path}: {payload}")
+                    if "memory" in payload:
+                        worker = self._replace(worker)  # the heap may be fragmented past the cap
+                    return None
+        except (EOFError, OSError) as exc:  # the worker died (native crash, OOM kill)
+            self.failures += 1
+            print(f"[warn] extract worker died on {path}: {exc or type(exc).__name__}")
+            worker = self._replace(worker)
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.stop(kill=True)
+        return _Worker(self._context, *self._args)
+
+    def close(self) -> None:
+        for _ in range(self._workers):
+            self._idle.get().stop()
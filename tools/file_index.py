@@ -0,0 +1,393 @@
+"""
+Locate-style filename index behind file.find.
+Parallel scandir crawl, trigram postings, pickled and refreshed by directory mtime.
+"""
+
+import os
+import pickle
+import threading
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from core.config import Config
+from tools import fs_walk
+
+
+# The walker's defaults plus per-user app data that is noise for name search.
+DEFAULT_EXCLUDES = set(fs_walk.DEFAULT_EXCLUDES) | {"AppData", "Library"}
+
+_CACHE_VERSION = 1
+_REFRESH_SEC = 60.0
+_COMPACT_RATIO = 0.3
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _scan_dir(path: str) -> tuple[int, list[tuple[str, int]], list[str]]:
+    """List one directory; returns (dir mtime ns, [(file name, mtime s)], [subdir paths])."""
+    files = []
+    subdirs = []
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not name.startswith(".") and name not in DEFAULT_EXCLUDES:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((name, int(entry.stat(follow_symlinks=False).st_mtime)))
+                except OSError:
+                    continue
+    except OSError:
+        return -1, [], []
+    return mtime, files, subdirs
+
+
+class FileIndex:
+    def __init__(self, roots: list[str] | None = None, cache_path: str | None = None, max_workers: int = 16) -> None:
+        config = Config()
+        self._roots = [os.path.abspath(r) for r in (roots or config.find_roots)]
+        self._cache_path = cache_path or os.path.join(config.cache_dir, "file_index.pickle")
+        self._max_workers = max_workers
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._busy = False
+        self._refreshed_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._dirs: list[str] = []
+        self._dir_ids: dict[str, int] = {}
+        self._dir_mtimes = array("q")
+        self._dir_files: dict[int, array] = {}
+        self._children: dict[int, list[int]] = {}
+        self._file_dir = array("I")
+        self._file_mtime = array("q")
+        self._names: list[str] = []
+        self._alive = bytearray()
+        self._dead = 0
+        self._postings: dict[str, array] = {}
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        if self._load_cache():
+            self._ready.set()
+            self._run_async(self.refresh)
+        else:
+            self._run_async(self.rebuild)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def _run_async(self, func) -> None:
+        with self._lock:
+            if self._busy:
+                return
+            self._busy = True
+
+        def _target() -> None:
+            try:
+                func()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._busy = False
+                self._ready.set()
+
+        threading.Thread(target=_target, daemon=True).start()
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._reset()
+        self._crawl([r for r in self._roots if os.path.isdir(r)])
+        self._refreshed_at = time.monotonic()
+        self._save_cache()
+
+    def refresh(self) -> None:
+        """Rescan only directories whose mtime changed since the last crawl."""
+        with self._lock:
+            known = list(enumerate(self._dirs))
+            mtimes = self._dir_mtimes
+        changed = []
+        for dir_id, path in known:
+            if mtimes[dir_id] < 0:
+                continue
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = -1
+            if current != mtimes[dir_id]:
+                changed.append(path)
+        for root in self._roots:
+            if root not in self._dir_ids and os.path.isdir(root):
+                changed.append(root)
+        if changed:
+            self._crawl(changed)
+            with self._lock:
+                if self._dead > _COMPACT_RATIO * max(len(self._names), 1):
+                    self._compact()
+            self._save_cache()
+        self._refreshed_at = time.monotonic()
+
+    # ---------- crawling ----------
+    def _crawl(self, start_dirs: list[str]) -> None:
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            pending = {pool.submit(_scan_dir, path): path for path in start_dirs}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    mtime, files, subdirs = future.result()
+                    with self._lock:
+                        new_subdirs = self._apply_dir(path, mtime, files, subdirs)
+                    for sub in new_subdirs:
+                        pending[pool.submit(_scan_dir, sub)] = sub
+
+    def _apply_dir(self, path: str, mtime: int, files: list, subdirs: list[str]) -> list[str]:
+        """Replace the file list of one directory; returns subdirectories that need a scan."""
+        dir_id = self._dir_ids.get(path)
+        if dir_id is None:
+            dir_id = self._add_dir(path, mtime)
+        else:
+            self._dir_mtimes[dir_id] = mtime
+            for file_id in self._dir_files.pop(dir_id, ()):
+                self._kill(file_id)
+            if mtime >= 0:
+                present = set(subdirs)
+                for child_id in self._children.get(dir_id, ()):
+                    if self._dir_mtimes[child_id] >= 0 and self._dirs[child_id] not in present:
+                        self._drop_subtree(self._dirs[child_id])
+
+        if mtime < 0:
+            self._drop_subtree(path)
+            return []
+        self._add_files(dir_id, files)
+        # Known, unchanged subdirectories are picked up by refresh() through their own mtimes.
+        return [sub for sub in subdirs if sub not in self._dir_ids or self._dir_mtimes[self._dir_ids[sub]] < 0]
+
+    def _add_dir(self, path: str, mtime: int) -> int:
+        dir_id = len(self._dirs)
+        self._dirs.append(path)
+        self._dir_ids[path] = dir_id
+        self._dir_mtimes.append(mtime)
+        self._link_parent(dir_id)
+        return dir_id
+
+    def _link_parent(self, dir_id: int) -> None:
+        parent_id = self._dir_ids.get(os.path.dirname(self._dirs[dir_id]))
+        if parent_id is not None and parent_id != dir_id:
+            self._children.setdefault(parent_id, []).append(dir_id)
+
+    def _add_files(self, dir_id: int, files: list) -> None:
+        ids = array("I")
+        for name, file_mtime in files:
+            file_id = len(self._names)
+            self._names.append(name)
+            self._file_dir.append(dir_id)
+            self._file_mtime.append(file_mtime)
+            self._alive.append(1)
+            for gram in _trigrams(name.lower()):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(file_id)
+            ids.append(file_id)
+        self._dir_files[dir_id] = ids
+
+    def _drop_subtree(self, path: str) -> None:
+        stack = [self._dir_ids[path]] if path in self._dir_ids else []
+        while stack:
+            dir_id = stack.pop()
+            self._dir_mtimes[dir_id] = -1
+            for file_id in self._dir_files.pop(dir_id, ()):
+                self._kill(file_id)
+            stack.extend(self._children.get(dir_id, ()))
+
+    def _kill(self, file_id: int) -> None:
+        if self._alive[file_id]:
+            self._alive[file_id] = 0
+            self._dead += 1
+
+    def _compact(self) -> None:
+        dirs, names, mtimes = self._dirs, self._names, self._file_mtime
+        file_dir, alive = self._file_dir, self._alive
+        dir_mtimes = self._dir_mtimes
+        grouped: dict[int, list] = {}
+        for file_id, name in enumerate(names):
+            if alive[file_id]:
+                grouped.setdefault(file_dir[file_id], []).append((name, mtimes[file_id]))
+        self._reset()
+        for old_dir_id, path in enumerate(dirs):
+            if dir_mtimes[old_dir_id] < 0:
+                continue
+            dir_id = self._add_dir(path, dir_mtimes[old_dir_id])
+            self._add_files(dir_id, grouped.get(old_dir_id, []))
+
+    # ---------- persistence ----------
+    def _load_cache(self) -> bool:
+        try:
+            with open(self._cache_path, "rb") as handle:
+                data = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return False
+        if data.get("version") != _CACHE_VERSION or data.get("roots") != self._roots:
+            return False
+        with self._lock:
+            self._dirs = data["dirs"]
+            self._dir_ids = {path: idx for idx, path in enumerate(self._dirs)}
+            self._dir_mtimes = data["dir_mtimes"]
+            self._dir_files = data["dir_files"]
+            self._file_dir = data["file_dir"]
+            self._file_mtime = data["file_mtime"]
+            self._names = data["names"]
+            self._alive = data["alive"]
+            self._dead = data["dead"]
+            self._postings = data["postings"]
+            self._children = {}
+            for dir_id in range(len(self._dirs)):
+                self._link_parent(dir_id)
+        return True
+
+    def _save_cache(self) -> None:
+        with self._lock:
+            data = {
+                "version": _CACHE_VERSION,
+                "roots": self._roots,
+                "dirs": self._dirs,
+                "dir_mtimes": self._dir_mtimes,
+                "dir_files": self._dir_files,
+                "file_dir": self._file_dir,
+                "file_mtime": self._file_mtime,
+                "names": self._names,
+                "alive": self._alive,
+                "dead": self._dead,
+                "postings": self._postings,
+            }
+            try:
+                os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+                tmp_path = self._cache_path + ".tmp"
+                with open(tmp_path, "wb") as handle:
+                    pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._cache_path)
+            except OSError:
+                pass
+
+    # ---------- queries ----------
+    def find(
+        self,
+        query: str,
+        limit: int = 20,
+        ext: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> list[dict]:
+        """Ranked matches for `query`; every whitespace-separated token must match the file name."""
+        if time.monotonic() - self._refreshed_at > _REFRESH_SEC and self._ready.is_set():
+            self._run_async(self.refresh)
+        tokens = [t for t in (query or "").lower().split() if t]
+        if ext:
+            ext = "." + ext.lower().lstrip(".")
+        after_ts = _parse_date(after)
+        before_ts = _parse_date(before, end_of_day=True)
+
+        with self._lock:
+            candidates, fuzzy = self._candidates(tokens)
+            names, alive, file_mtime = self._names, self._alive, self._file_mtime
+            scored = []
+            for file_id in candidates:
+                if not alive[file_id]:
+                    continue
+                lowered = names[file_id].lower()
+                if ext and not lowered.endswith(ext):
+                    continue
+                if not fuzzy and any(token not in lowered for token in tokens):
+                    continue
+                mtime = file_mtime[file_id]
+                if (after_ts is not None and mtime < after_ts) or (before_ts is not None and mtime > before_ts):
+                    continue
+                scored.append((self._score(lowered, tokens, fuzzy), -mtime, file_id))
+            scored.sort()
+            return [
+                {
+                    "path": os.path.join(self._dirs[self._file_dir[file_id]], names[file_id]),
+                    "modified": datetime.fromtimestamp(file_mtime[file_id]).isoformat(timespec="seconds"),
+                }
+                for _score, _mtime, file_id in scored[: max(1, int(limit))]
+            ]
+
+    def _candidates(self, tokens: list[str]) -> tuple[object, bool]:
+        grams = [_trigrams(token) for token in tokens if len(token) >= 3]
+        if not grams:
+            return range(len(self._names)), False
+        postings = sorted(
+            (self._postings.get(gram, ()) for token_grams in grams for gram in token_grams),
+            key=len,
+        )
+        if postings and postings[0]:
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result.intersection_update(posting)
+                if not result:
+                    break
+            if result:
+                return result, False
+        # Nothing contains every trigram: fall back to files sharing most of them (typos, OCR-ish input).
+        counts = Counter()
+        for posting in postings:
+            counts.update(posting)
+        need = max(1, int(len(postings) * 0.5))
+        return [file_id for file_id, hits in counts.items() if hits >= need], True
+
+    @staticmethod
+    def _score(name: str, tokens: list[str], fuzzy: bool) -> tuple:
+        stem = os.path.splitext(name)[0]
+        joined = " ".join(tokens)
+        if stem == joined or name == joined:
+            rank = 0
+        elif all(stem.startswith(t) or f" {t}" in stem or f"_{t}" in stem or f"-{t}" in stem for t in tokens):
+            rank = 1
+        else:
+            rank = 2
+        return (rank + (3 if fuzzy else 0), len(name))
+
+
+def _parse_date(value: str | None, end_of_day: bool = False) -> int | None:
+    """Epoch seconds of an ISO date/time; a bare date with `end_of_day` means its last second."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if end_of_day and len(str(value).strip()) <= 10:
+        return int((moment + timedelta(days=1)).timestamp()) - 1
+    return int(moment.timestamp())
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> FileIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = FileIndex()
+            _INDEX.start()
+        return _INDEX
+
+
+def find_files(query: str, limit: int = 20, ext: str | None = None, after: str | None = None, before: str | None = None) -> dict:
+    index = get_index()
+    ready = index.wait_ready(timeout=2.0)
+    matches = index.find(query, limit=limit, ext=ext, after=after, before=before)
+    # On the first run the crawl takes a while; an empty answer then only means "not found yet".
+    return {"query": query, "matches": matches, "building": not ready}
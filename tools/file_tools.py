@@ -1,7 +1,13 @@
+import errno
 import os
 import shutil
 import time
 
+from core.errors import ActionCancelled
+
+
+_COPY_CHUNK = 4 * 1024 * 1024
+
 
 def open_file(path: str) -> dict:
     os.startfile(path)
@@ -13,17 +19,94 @@ def rename_file(src: str, dst: str) -> dict:
     return {"renamed": src, "to": dst}
 
 
-def move_file(src: str, dst: str) -> dict:
-    shutil.move(src, dst)
+def _check_cancel(cancel) -> None:
+    if cancel is not None and cancel.is_set():
+        raise ActionCancelled("Action cancelled.")
+
+
+def _copy_file_chunked(src: str, dst: str, done: list, total: int, progress, cancel) -> None:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while True:
+            _check_cancel(cancel)
+            chunk = fsrc.read(_COPY_CHUNK)
+            if not chunk:
+                break
+            fdst.write(chunk)
+            done[0] += len(chunk)
+            if progress and total:
+                progress(done[0] / total, f"Copying {os.path.basename(src)}")
+    shutil.copystat(src, dst)
+
+
+def _move_across_devices(src: str, dst: str, progress, cancel) -> None:
+    """Copy in chunks (reporting progress, honoring cancel) to a temporary sibling, swap it in, then remove the source."""
+    if os.path.isdir(src) and os.path.exists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination already exists", dst)
+    if os.path.isdir(src):
+        files = []
+        total = 0
+        for root, _dirs, names in os.walk(src):
+            for name in names:
+                path = os.path.join(root, name)
+                files.append(path)
+                total += os.path.getsize(path)
+    else:
+        files = [src]
+        total = os.path.getsize(src)
+
+    done = [0]
+    # Nothing at `dst` is touched until the copy is complete.
+    partial = f"{dst}.partial-{os.getpid()}"
+    try:
+        if os.path.isdir(src):
+            for root, dirs, _names in os.walk(src):
+                target_root = os.path.join(partial, os.path.relpath(root, src))
+                os.makedirs(target_root, exist_ok=True)
+                for name in dirs:
+                    os.makedirs(os.path.join(target_root, name), exist_ok=True)
+            for path in files:
+                target = os.path.join(partial, os.path.relpath(path, src))
+                _copy_file_chunked(path, target, done, total, progress, cancel)
+        else:
+            _copy_file_chunked(src, partial, done, total, progress, cancel)
+        os.replace(partial, dst)
+    except BaseException:
+        # Leave the source untouched and drop only the partial copy.
+        if os.path.isdir(partial):
+            shutil.rmtree(partial, ignore_errors=True)
+        elif os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+    if os.path.isdir(src):
+        shutil.rmtree(src)
+    else:
+        os.remove(src)
+
+
+def move_file(src: str, dst: str, progress=None, cancel=None) -> dict:
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src.rstrip("\\/")))
+    _check_cancel(cancel)
+    try:
+        if os.path.isdir(src):
+            os.rename(src, dst)
+        else:
+            os.replace(src, dst)  # overwrite an existing file, like shutil.move
+    except OSError as exc:
+        # EXDEV (POSIX) / ERROR_NOT_SAME_DEVICE (Windows): fall back to a cancellable copy.
+        if exc.errno != errno.EXDEV and getattr(exc, "winerror", None) != 17:
+            raise
+        _move_across_devices(src, dst, progress, cancel)
     return {"moved": src, "to": dst}
 
 
-def delete_file(path: str, trash_dir: str) -> dict:
+def delete_file(path: str, trash_dir: str, progress=None, cancel=None) -> dict:
     os.makedirs(trash_dir, exist_ok=True)
     base = os.path.basename(path)
     timestamp = time.strftime("%Y%m%d%H%M%S")
     target = os.path.join(trash_dir, f"{base}.{timestamp}")
-    shutil.move(path, target)
+    move_file(path, target, progress=progress, cancel=cancel)
     return {"deleted": path, "trashed": target}
 
 
@@ -0,0 +1,249 @@
+"""
+Parallel directory walker (os.scandir on a thread pool) with gitignore-style exclusions,
+default excludes, same-device pruning and link-loop protection.
+"""
+
+import os
+import queue
+import re
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+
+DEFAULT_EXCLUDES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "bower_components",
+        "__pycache__",
+        ".venv",
+        "venv",
+        "site-packages",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".gradle",
+        ".cache",
+        ".hana_cache",
+        ".hana_trash",
+        "$Recycle.Bin",
+        "System Volume Information",
+        "$WinREAgent",
+    }
+)
+# Absolute system paths that are never useful to index.
+SYSTEM_PATHS = frozenset(
+    {"/proc", "/sys", "/dev", "/run", "/tmp", "/var/lib/docker", "/System/Volumes"}
+    if sys.platform != "win32"
+    else {"C:\\Windows", "C:\\$Recycle.Bin", "C:\\ProgramData\\Microsoft"}
+)
+IGNORE_FILES = (".hanaignore", ".gitignore")
+
+_REPARSE_POINT = getattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT", 0x400)
+
+
+def _translate(pattern: str) -> str:
+    """gitignore glob -> regex over '/'-separated paths relative to the ignore file's directory."""
+    out = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if pattern.startswith("**/", idx):
+            out.append("(?:.*/)?")
+            idx += 3
+            continue
+        if pattern.startswith("**", idx):
+            out.append(".*")
+            idx += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", idx + 1)
+            if end < 0:
+                out.append(re.escape(char))
+            else:
+                body = pattern[idx + 1 : end].replace("\\", "\\\\")
+                out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+                idx = end
+        else:
+            out.append(re.escape(char))
+        idx += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """Patterns of one exclusion file (or a list), matched against paths relative to `base`."""
+
+    def __init__(self, patterns: list[str], base: str = "") -> None:
+        self.base = base.rstrip("/\\")  # "/" or "C:\\" as a root
+        self._rules: list[tuple[re.Pattern, bool, bool]] = []  # (regex, negate, dir_only)
+        for line in patterns:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            line = line.replace("\\", "/") if os.sep == "\\" else line
+            dir_only = line.endswith("/")
+            line = line.rstrip("/") if dir_only else line
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = _translate(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self._rules.append((re.compile(regex + "$"), negate, dir_only))
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, relative: str, is_dir: bool) -> bool | None:
+        """True (excluded), False (re-included) or None (no rule matched)."""
+        result = None
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative):
+                result = not negate
+        return result
+
+    @classmethod
+    def from_file(cls, path: str, base: str) -> "IgnoreRules | None":
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+                rules = cls(handle.readlines(), base)
+        except OSError:
+            return None
+        return rules or None
+
+
+def _excluded(path: str, is_dir: bool, rules: tuple) -> bool:
+    # Deeper files come last and win, like nested .gitignore files.
+    verdict = None
+    for rule in rules:
+        relative = path[len(rule.base) + 1 :]  # paths are built under the rule's directory
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+        matched = rule.match(relative, is_dir)
+        if matched is not None:
+            verdict = matched
+    return bool(verdict)
+
+
+def _is_link(entry: os.DirEntry) -> bool:
+    if entry.is_symlink():
+        return True
+    if sys.platform == "win32":  # junctions and mount points are reparse points, not symlinks
+        try:
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & _REPARSE_POINT)
+        except OSError:
+            return True
+    return False
+
+
+def scan_dir(
+    path: str,
+    rules: tuple,
+    device: int | None,
+    accept: Callable[[str], bool] | None,
+    excludes: frozenset,
+    ignore_files: tuple,
+    follow_links: bool,
+) -> tuple[list[tuple[str, os.stat_result]], list[str], tuple]:
+    """List one directory: ([(file path, stat)], [subdirectories to walk], rules for them)."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return files, subdirs, rules
+    names = {entry.name for entry in entries}
+    for name in ignore_files:
+        if name in names:
+            found = IgnoreRules.from_file(os.path.join(path, name), path)
+            if found is not None:
+                rules = rules + (found,)
+    for entry in entries:
+        name = entry.name
+        try:
+            if not follow_links and _is_link(entry):
+                continue
+            if entry.is_dir(follow_symlinks=follow_links):
+                if name in excludes or entry.path in SYSTEM_PATHS:
+                    continue
+                if rules and _excluded(entry.path, True, rules):
+                    continue
+                if device is not None:
+                    st = entry.stat(follow_symlinks=follow_links)
+                    if st.st_dev and st.st_dev != device:
+                        continue  # another filesystem is mounted here
+                subdirs.append(entry.path)
+            elif entry.is_file(follow_symlinks=follow_links):
+                if accept is not None and not accept(name):
+                    continue
+                if rules and _excluded(entry.path, False, rules):
+                    continue
+                files.append((entry.path, entry.stat(follow_symlinks=follow_links)))
+        except OSError:
+            continue
+    return files, subdirs, rules
+
+
+def walk_files(
+    roots: list[str],
+    accept: Callable[[str], bool] | None = None,
+    excludes: frozenset = DEFAULT_EXCLUDES,
+    extra_patterns: list[str] | None = None,
+    ignore_files: tuple = IGNORE_FILES,
+    same_device: bool = True,
+    follow_links: bool = False,
+    workers: int = 8,
+) -> Iterator[tuple[str, os.stat_result]]:
+    """Yield (path, stat) of the files under `roots`, as directories finish (not in tree order)."""
+    # Finished directories come back through a queue: waiting on thousands of pending futures is quadratic.
+    done: queue.SimpleQueue = queue.SimpleQueue()
+    visited: set[tuple[int, int]] = set()
+    outstanding = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fs-walk") as pool:
+
+        def submit(path: str, rules: tuple, device: int | None) -> None:
+            nonlocal outstanding
+            if follow_links:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    return
+                key = (st.st_dev, st.st_ino) if st.st_ino else (0, hash(os.path.realpath(path)))
+                if key in visited:
+                    return  # reached again through a link
+                visited.add(key)
+            future = pool.submit(scan_dir, path, rules, device, accept, excludes, ignore_files, follow_links)
+            future.add_done_callback(lambda fut: done.put((fut, device)))
+            outstanding += 1
+
+        for root in roots:
+            root = os.path.abspath(root)
+            try:
+                st = os.stat(root)
+            except OSError:
+                print(f"[skip] missing root {root}")
+                continue
+            rules = (IgnoreRules(extra_patterns, root),) if extra_patterns else ()
+            submit(root, rules, st.st_dev if same_device and st.st_dev else None)
+        while outstanding:
+            future, device = done.get()
+            outstanding -= 1
+            files, subdirs, rules = future.result()
+            for sub in subdirs:
+                submit(sub, rules, device)
+            yield from files
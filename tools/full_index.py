@@ -5,9 +5,25 @@ Usage example:
     python tools/full_index.py --roots "C:\\" --persist "C:\\Users\\world\\Desktop\\hana_index"
 
 What it does:
-  * Recursively walks given roots.
-  * Reads text-like files (UTF-8 best-effort, PDF via pypdf).
-  * Chunks content and stores in a Chroma DB collection with sentence-transformer embeddings.
+  * Walks the given roots with the parallel scandir walker (tools/fs_walk.py),
+    which prunes VCS/dependency/cache/system folders, honors .hanaignore and
+    .gitignore files plus `--exclude` patterns, and stays on the roots'
+    filesystems; file sizes and mtimes come from the walk, not extra stats.
+  * Reads text-like files on threads (UTF-8 best-effort); PDFs are extracted
+    with pypdf in worker processes (tools/extract_pool.py) so they use every
+    core, with a per-file timeout and memory cap (`--extract-*` flags).
+  * Runs as a staged pipeline with bounded queues between the stages, so a
+    slow stage holds back the ones before it instead of piling up work:
+    walker -> read/extract/chunk threads (files complete in any order) ->
+    batcher packing chunks of many files into embedding batches of
+    `--embed-batch` chunks or `--embed-tokens` estimated tokens -> embedding
+    thread -> writer thread upserting into a Chroma collection and reporting
+    chunks/s. Files enter the manifest once all their chunks are written.
+  * Keeps a manifest (path, size, mtime, content hash, chunk count) in
+    <persist>/index_manifest.sqlite3, so reruns only touch what changed:
+    files with the same size and mtime are skipped without being read, files
+    whose content hash is unchanged are not re-embedded, and chunks of
+    removed or shrunk files are deleted. `--reindex` ignores the manifest.
 
 Notes:
   * Binary files are skipped by size/extension heuristics.
@@ -19,23 +35,30 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import mimetypes
 import os
+import queue
+import sqlite3
 import sys
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
-try:  # Delay hard failure until main() so we can emit a helpful message.
-    import chromadb
-    from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
-    _IMPORT_ERROR = None
-except ModuleNotFoundError as exc:
-    chromadb = None  # type: ignore
-    SentenceTransformerEmbeddingFunction = None  # type: ignore
-    _IMPORT_ERROR = exc
+try:
+    from tools.extract_pool import ExtractPool
+    from tools.fs_walk import DEFAULT_EXCLUDES, walk_files
+except ModuleNotFoundError:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from tools.extract_pool import ExtractPool
+    from tools.fs_walk import DEFAULT_EXCLUDES, walk_files
 
 
+MODEL_NAME = "all-MiniLM-L6-v2"
+MODEL_MAX_TOKENS = 256  # the model truncates longer inputs
+
 DEFAULT_EXT_ALLOW = {
     ".txt",
     ".md",
@@ -68,20 +91,29 @@ def configure_streams() -> None:
             pass
 
 
-def iter_files(roots: List[Path]) -> Iterable[Path]:
-    for root in roots:
-        if not root.exists():
-            print(f"[skip] missing root {root}")
-            continue
-        for path in root.rglob("*"):
-            if path.is_file():
-                yield path
-
-
-def is_text_like(path: Path, size_limit_mb: int) -> bool:
+def iter_files(
+    roots: List[Path],
+    excludes: Optional[List[str]] = None,
+    default_excludes: bool = True,
+    same_device: bool = True,
+    workers: int = 8,
+) -> Iterable[Tuple[Path, os.stat_result]]:
+    """(path, stat) of every file with an indexable extension under `roots`."""
+    for path, st in walk_files(
+        [str(root) for root in roots],
+        accept=lambda name: os.path.splitext(name)[1].lower() in DEFAULT_EXT_ALLOW,
+        excludes=DEFAULT_EXCLUDES if default_excludes else frozenset(),
+        extra_patterns=excludes,
+        same_device=same_device,
+        workers=workers,
+    ):
+        yield Path(path), st
+
+
+def is_text_like(path: Path, size: int, size_limit_mb: int) -> bool:
     if path.suffix.lower() not in DEFAULT_EXT_ALLOW:
         return False
-    if path.stat().st_size > size_limit_mb * 1024 * 1024:
+    if size > size_limit_mb * 1024 * 1024:
         return False
     # Quick mime check for obvious binaries
     mime, _ = mimetypes.guess_type(str(path))
@@ -90,22 +122,17 @@ def is_text_like(path: Path, size_limit_mb: int) -> bool:
     return True
 
 
-def read_text(path: Path) -> Optional[str]:
+def read_text(path: Path, data: bytes) -> Optional[str]:
     if path.suffix.lower() == ".pdf":
         try:
             import pypdf
 
-            reader = pypdf.PdfReader(str(path))
+            reader = pypdf.PdfReader(io.BytesIO(data))
             return "\n".join(page.extract_text() or "" for page in reader.pages)
         except Exception as exc:
             print(f"[warn] pdf read failed {path}: {exc}")
             return None
-    try:
-        data = path.read_bytes()
-        return data.decode("utf-8", errors="ignore")
-    except Exception as exc:
-        print(f"[warn] read failed {path}: {exc}")
-        return None
+    return data.decode("utf-8", errors="ignore")
 
 
 def chunk_text(text: str, max_len: int, overlap: int) -> Iterable[str]:
@@ -121,28 +148,310 @@ def make_id(path: Path, chunk_idx: int) -> str:
     return f"{h}-{chunk_idx}"
 
 
-def chunk_upserts(col, ids: list[str], docs: list[str], metas: list[dict], batch: int) -> None:
+def chunk_upserts(col, ids: list[str], docs: list[str], metas: list[dict], batch: int, embeddings=None) -> None:
     """Upsert in safe batches to avoid chromadb batch limit errors."""
     for i in range(0, len(docs), batch):
+        extra = {"embeddings": list(embeddings[i : i + batch])} if embeddings is not None else {}
         col.upsert(
             ids=ids[i : i + batch],
             documents=docs[i : i + batch],
             metadatas=metas[i : i + batch],
+            **extra,
         )
 
 
-def process_path(path: Path, size_limit_mb: int, max_len: int, overlap: int):
-    if not is_text_like(path, size_limit_mb):
-        return None
-    text = read_text(path)
-    if not text:
-        return None
-    docs = list(chunk_text(text, max_len=max_len, overlap=overlap))
-    if not docs:
-        return None
-    ids = [make_id(path, i) for i in range(len(docs))]
-    metadatas = [{"path": str(path), "chunk": i} for i in range(len(docs))]
-    return ids, docs, metadatas, path
+def chunk_deletes(col, ids: list[str], batch: int) -> None:
+    for i in range(0, len(ids), batch):
+        col.delete(ids=ids[i : i + batch])
+
+
+class Manifest:
+    """What is indexed: path -> (size, mtime_ns, sha1 of the bytes, chunk count), in SQLite next to the Chroma data."""
+
+    def __init__(self, persist: Path) -> None:
+        # used by the batcher and the writer thread, one call at a time
+        self._conn = sqlite3.connect(str(persist / "index_manifest.sqlite3"), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha1 TEXT, chunks INTEGER)"
+        )
+        self._pending = 0
+
+    def load(self) -> dict[str, Tuple[int, int, str, int]]:
+        rows = self._conn.execute("SELECT path, size, mtime_ns, sha1, chunks FROM files")
+        return {path: (size, mtime_ns, sha1, chunks) for path, size, mtime_ns, sha1, chunks in rows}
+
+    def record(self, path: str, size: int, mtime_ns: int, sha1: str, chunks: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha1, chunks) VALUES (?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, sha1, chunks),
+            )
+            self._touch()
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._touch()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+
+    def _touch(self) -> None:
+        # Chroma writes are already durable; committing in groups keeps the manifest cheap.
+        self._pending += 1
+        if self._pending >= 500:
+            self.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+            self._conn.close()
+
+
+class FileResult:
+    """Outcome of one file: status is "skip" (not indexable), "same" (size/mtime match),
+    "touched" (content hash matches), "changed" (docs to embed) or "failed" (read or extract error)."""
+
+    __slots__ = ("path", "status", "size", "mtime_ns", "sha1", "ids", "docs", "metas", "pending", "failed")
+
+    def __init__(self, path: Path, status: str, size: int = 0, mtime_ns: int = 0, sha1: str = "") -> None:
+        self.path = path
+        self.status = status
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha1 = sha1
+        self.ids: list[str] = []
+        self.docs: list[str] = []
+        self.metas: list[dict] = []
+        self.pending = 0  # embed batches holding this file's chunks that the writer has not finished
+        self.failed = False  # one of those batches failed to embed or upsert
+
+
+def process_path(
+    path: Path,
+    size_limit_mb: int,
+    max_len: int,
+    overlap: int,
+    previous=None,
+    st: Optional[os.stat_result] = None,
+    extractor: Optional[ExtractPool] = None,
+) -> FileResult:
+    """Read and chunk `path` unless the manifest entry `previous` shows it is unchanged.
+
+    `st` is the stat from the walk; it is only fetched here when not given.
+    Formats the `extractor` pool handles are extracted and chunked there.
+    """
+    if st is None:
+        try:
+            st = path.stat()
+        except OSError as exc:
+            print(f"[warn] stat failed {path}: {exc}")
+            return FileResult(path, "failed")
+    if not is_text_like(path, st.st_size, size_limit_mb):
+        return FileResult(path, "skip")
+    if previous is not None and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+        return FileResult(path, "same", st.st_size, st.st_mtime_ns, previous[2])
+    try:
+        data = path.read_bytes()
+    except Exception as exc:
+        print(f"[warn] read failed {path}: {exc}")
+        return FileResult(path, "failed")
+    result = FileResult(path, "changed", st.st_size, st.st_mtime_ns, hashlib.sha1(data).hexdigest())
+    if previous is not None and previous[2] == result.sha1:
+        result.status = "touched"
+        return result
+    if extractor is not None and extractor.handles(path.suffix):
+        docs = extractor.extract(str(path), data)
+        if docs is None:  # failed or timed out: not recorded, so the next run retries it
+            return FileResult(path, "failed")
+        result.docs = docs
+    else:
+        text = read_text(path, data)
+        if text:
+            result.docs = list(chunk_text(text, max_len=max_len, overlap=overlap))
+    result.ids = [make_id(path, i) for i in range(len(result.docs))]
+    result.metas = [{"path": str(path), "chunk": i} for i in range(len(result.docs))]
+    return result
+
+
+def _under(path: str, roots: List[Path]) -> bool:
+    return any(path == str(root) or path.startswith(str(root).rstrip(os.sep) + os.sep) for root in roots)
+
+
+def estimate_tokens(doc: str) -> int:
+    return min(MODEL_MAX_TOKENS, len(doc) // 4 + 1)
+
+
+class EmbedBatch:
+    """Chunks of one or more files to embed together; `files` lists every file with a chunk (or its end) here."""
+
+    __slots__ = ("ids", "docs", "metas", "tokens", "files", "embeddings")
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.docs: list[str] = []
+        self.metas: list[dict] = []
+        self.tokens = 0
+        self.files: list[FileResult] = []
+        self.embeddings = None
+
+    def add_file(self, result: FileResult) -> None:
+        if not self.files or self.files[-1] is not result:
+            self.files.append(result)
+            result.pending += 1
+
+
+class EmbedBatcher:
+    """Packs the chunks of consecutive files into batches of `max_chunks` chunks or `max_tokens` tokens."""
+
+    def __init__(self, max_chunks: int, max_tokens: int) -> None:
+        self._max_chunks = max(1, max_chunks)
+        self._max_tokens = max(MODEL_MAX_TOKENS, max_tokens)
+        self._batch = EmbedBatch()
+
+    def add(self, result: FileResult) -> list[EmbedBatch]:
+        """Take a changed file's chunks; returns the batches it filled."""
+        full = []
+        for chunk_id, doc, meta in zip(result.ids, result.docs, result.metas):
+            tokens = estimate_tokens(doc)
+            batch = self._batch
+            if batch.docs and (len(batch.docs) >= self._max_chunks or batch.tokens + tokens > self._max_tokens):
+                full.append(batch)
+                batch = self._batch = EmbedBatch()
+            batch.add_file(result)
+            batch.ids.append(chunk_id)
+            batch.docs.append(doc)
+            batch.metas.append(meta)
+            batch.tokens += tokens
+        self._batch.add_file(result)  # a file without chunks still passes through the writer
+        return full
+
+    def flush(self) -> Optional[EmbedBatch]:
+        batch, self._batch = self._batch, EmbedBatch()
+        return batch if batch.docs or batch.files else None
+
+
+def _extract_stage(
+    roots: List[Path],
+    out: queue.Queue,
+    known: dict,
+    size_limit_mb: int,
+    max_len: int,
+    overlap: int,
+    max_workers: int,
+    extractor: Optional[ExtractPool],
+    walk_options: tuple,
+    walk_complete: threading.Event,
+) -> None:
+    """Walk and process files on `max_workers` threads; results go to `out` as they finish, then None.
+
+    `walk_complete` is set only when every file under the roots was reached.
+    """
+    slots = threading.BoundedSemaphore(max_workers * 2)  # the walk stays just ahead of the readers
+
+    def task(path: Path, st: os.stat_result) -> None:
+        try:
+            result = process_path(path, size_limit_mb, max_len, overlap, known.get(str(path)), st, extractor)
+        except Exception as exc:
+            print(f"[warn] processing failed {path}: {exc}")
+            result = FileResult(path, "failed")
+        finally:
+            slots.release()
+        out.put(result)  # blocks while the batcher is behind
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="index-read") as pool:
+            for path, st in iter_files(roots, *walk_options):
+                slots.acquire()
+                pool.submit(task, path, st)
+        walk_complete.set()
+    except Exception as exc:
+        print(f"[error] walk stopped early: {exc}")
+    finally:
+        out.put(None)
+
+
+def _embed_stage(embed, inbox: queue.Queue, out: queue.Queue) -> None:
+    while True:
+        batch = inbox.get()
+        if batch is not None and batch.docs:
+            try:
+                batch.embeddings = embed(batch.docs)
+            except Exception as exc:
+                print(f"[error] embedding failed for {len(batch.docs)} chunks: {exc}")
+        out.put(batch)
+        if batch is None:
+            return
+
+
+class _Writer:
+    """Upserts embedded batches; a file enters the manifest once all its batches are written."""
+
+    def __init__(self, col, manifest: Manifest, batch_size: int, backlog) -> None:
+        self._col = col
+        self._manifest = manifest
+        self._batch_size = batch_size
+        self._backlog = backlog
+        self.files = 0
+        self.chunks = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._reported = self.started
+
+    def run(self, inbox: queue.Queue) -> None:
+        # Keeps draining until None whatever fails: a stopped writer would block every stage before it.
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                return
+            try:
+                self._write(batch)
+            except Exception as exc:
+                print(f"[error] write failed for {len(batch.docs)} chunks: {exc}")
+                self.failed += len(batch.files)  # left out of the manifest: retried on the next run
+
+    def _write(self, batch: EmbedBatch) -> None:
+        failed = False
+        if batch.docs:
+            failed = batch.embeddings is None
+            if not failed:
+                try:
+                    chunk_upserts(self._col, batch.ids, batch.docs, batch.metas, self._batch_size, batch.embeddings)
+                    self.chunks += len(batch.docs)
+                except Exception as exc:
+                    print(f"[error] upsert failed for {len(batch.docs)} chunks: {exc}")
+                    failed = True
+        for result in batch.files:
+            result.failed = result.failed or failed
+            result.pending -= 1
+            if result.pending:
+                continue
+            if not result.failed:
+                try:
+                    self._manifest.record(str(result.path), result.size, result.mtime_ns, result.sha1, len(result.docs))
+                    self.files += 1
+                    continue
+                except sqlite3.Error as exc:
+                    print(f"[error] manifest update failed {result.path}: {exc}")
+            self.failed += 1  # not recorded: retried on the next run
+        now = time.monotonic()
+        if now - self._reported >= 5.0:
+            self._reported = now
+            print(
+                f"[progress] files={self.files} chunks={self.chunks}"
+                f" {self.rate():.0f} chunks/s queued={self._backlog()}"
+            )
+
+    def rate(self) -> float:
+        return self.chunks / max(1e-6, time.monotonic() - self.started)
 
 
 def index_paths(
@@ -154,25 +463,109 @@ def index_paths(
     overlap: int,
     batch_size: int,
     max_workers: int,
+    reindex: bool = False,
+    excludes: Optional[List[str]] = None,
+    default_excludes: bool = True,
+    same_device: bool = True,
+    extract_procs: int = 0,
+    extract_timeout: float = 120.0,
+    extract_memory_mb: int = 1024,
+    embed_batch: int = 256,
+    embed_tokens: int = 256 * MODEL_MAX_TOKENS,
 ) -> None:
+    # Imported here, not at module level: extract workers are spawned and re-import this module.
+    import chromadb
+    from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
     client = chromadb.PersistentClient(path=str(persist))
-    embed = SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+    embed = SentenceTransformerEmbeddingFunction(model_name=MODEL_NAME)
     col = client.get_or_create_collection(name=collection, embedding_function=embed)
-
-    total_files = 0
-    total_chunks = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        for result in pool.map(lambda p: process_path(p, size_limit_mb, max_len, overlap), iter_files(roots)):
-            if not result:
-                continue
-            ids, docs, metadatas, path = result
-            chunk_upserts(col, ids=ids, docs=docs, metas=metadatas, batch=batch_size)
-            total_files += 1
-            total_chunks += len(docs)
-            if total_files % 50 == 0:
-                print(f"[progress] files={total_files} chunks={total_chunks} last={path}")
-
-    print(f"[done] indexed files={total_files} chunks={total_chunks} -> {persist} (collection={collection})")
+    manifest = Manifest(persist)
+    known = manifest.load()
+    if reindex:
+        manifest.clear()  # `known` still names the chunks of removed or shrunk files
+
+    counts = {"same": 0, "touched": 0, "removed": 0, "failed": 0}
+    orphans: list[str] = []
+    seen: set[str] = set()
+    walked = [root for root in roots if root.exists()]
+    extractor = ExtractPool(extract_procs, extract_timeout, extract_memory_mb, max_len, overlap) if extract_procs > 0 else None
+
+    # Bounded hand-overs: a full queue blocks the stage feeding it (backpressure).
+    results: queue.Queue = queue.Queue(maxsize=max_workers * 4)
+    to_embed: queue.Queue = queue.Queue(maxsize=2)
+    to_write: queue.Queue = queue.Queue(maxsize=2)
+    walk_complete = threading.Event()
+    writer = _Writer(col, manifest, batch_size, lambda: results.qsize() + to_embed.qsize() + to_write.qsize())
+    stages = [
+        threading.Thread(
+            target=_extract_stage,
+            args=(roots, results, {} if reindex else known, size_limit_mb, max_len, overlap, max_workers, extractor,
+                  (excludes, default_excludes, same_device), walk_complete),
+            name="index-extract",
+            daemon=True,
+        ),
+        threading.Thread(target=_embed_stage, args=(embed, to_embed, to_write), name="index-embed", daemon=True),
+        threading.Thread(target=writer.run, args=(to_write,), name="index-write", daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    batcher = EmbedBatcher(embed_batch, embed_tokens)
+    while True:
+        result = results.get()
+        if result is None:
+            break
+        key = str(result.path)
+        seen.add(key)
+        previous = known.get(key)
+        if result.status == "failed":
+            counts["failed"] += 1
+            continue
+        if result.status == "skip":
+            if previous is not None:  # no longer indexable: drop what it had
+                orphans.extend(make_id(result.path, i) for i in range(previous[3]))
+                manifest.forget(key)
+                counts["removed"] += 1
+            continue
+        if result.status in ("same", "touched"):
+            counts[result.status] += 1
+            if result.status == "touched":
+                manifest.record(key, result.size, result.mtime_ns, result.sha1, previous[3])
+            continue
+        if previous is not None and previous[3] > len(result.docs):
+            # the file shrank (or lost its text): its trailing chunk ids are not overwritten
+            orphans.extend(make_id(result.path, i) for i in range(len(result.docs), previous[3]))
+        for batch in batcher.add(result):
+            to_embed.put(batch)
+    last = batcher.flush()
+    if last is not None:
+        to_embed.put(last)
+    to_embed.put(None)
+    for stage in stages:
+        stage.join()
+
+    if walk_complete.is_set():
+        for key, previous in known.items():
+            if key not in seen and _under(key, walked):
+                orphans.extend(make_id(Path(key), i) for i in range(previous[3]))
+                manifest.forget(key)
+                counts["removed"] += 1
+    else:  # files the walk never reached are not gone; keep their chunks and manifest rows
+        print("[warn] the walk did not finish; removed files are cleaned up on the next complete run")
+    chunk_deletes(col, orphans, batch=batch_size)
+    manifest.close()
+    if extractor is not None:
+        extractor.close()
+        if extractor.timeouts or extractor.failures:
+            print(f"[extract] timeouts={extractor.timeouts} failures={extractor.failures}")
+
+    print(
+        f"[done] indexed files={writer.files} chunks={writer.chunks} ({writer.rate():.0f} chunks/s)"
+        f" | unchanged={counts['same'] + counts['touched']} removed={counts['removed']}"
+        f" orphan_chunks_deleted={len(orphans)} failed={counts['failed'] + writer.failed}"
+        f" -> {persist} (collection={collection})"
+    )
 
 
 def parse_args() -> argparse.Namespace:
@@ -204,6 +597,38 @@ def parse_args() -> argparse.Namespace:
         default=max(os.cpu_count() or 4, 4),
         help="Number of parallel threads for reading/chunking (use more to push CPU).",
     )
+    parser.add_argument(
+        "--extract-procs",
+        type=int,
+        default=os.cpu_count() or 2,
+        help="Worker processes for PDF extraction (0 = extract on the reading threads)",
+    )
+    parser.add_argument("--extract-timeout", type=float, default=120.0, help="Seconds before a PDF is given up on")
+    parser.add_argument("--extract-memory-mb", type=int, default=1024, help="Memory cap per extraction process (MB)")
+    parser.add_argument(
+        "--embed-batch", type=int, default=256, help="Chunks per embedding batch, filled across files"
+    )
+    parser.add_argument(
+        "--embed-tokens",
+        type=int,
+        default=256 * MODEL_MAX_TOKENS,
+        help="Estimated token budget per embedding batch (about 4 characters per token)",
+    )
+    parser.add_argument("--reindex", action="store_true", help="Ignore the manifest and re-embed every file")
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="gitignore-style pattern to skip (repeatable), e.g. --exclude 'build/' --exclude '*.min.js'",
+    )
+    parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help="Also walk .git, node_modules, virtualenvs, caches and system folders",
+    )
+    parser.add_argument(
+        "--cross-devices", action="store_true", help="Descend into other filesystems mounted under the roots"
+    )
     return parser.parse_args()
 
 
@@ -216,11 +641,13 @@ def main() -> None:
             "virtual environment and install requirements.txt, then try again."
         )
         sys.exit(1)
-    if _IMPORT_ERROR:
+    try:
+        from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction  # noqa: F401
+    except ModuleNotFoundError as exc:
         print(
             "[error] chromadb (and dependencies) not installed. "
             "Run: pip install -r requirements.txt   (inside a Python 3.10–3.12 venv)\n"
-            f"Details: {_IMPORT_ERROR}"
+            f"Details: {exc}"
         )
         sys.exit(1)
     args = parse_args()
@@ -236,6 +663,15 @@ def main() -> None:
         overlap=args.overlap,
         batch_size=args.batch_size,
         max_workers=args.max_workers,
+        reindex=args.reindex,
+        excludes=args.exclude,
+        default_excludes=not args.no_default_excludes,
+        same_device=not args.cross_devices,
+        extract_procs=args.extract_procs,
+        extract_timeout=args.extract_timeout,
+        extract_memory_mb=args.extract_memory_mb,
+        embed_batch=args.embed_batch,
+        embed_tokens=args.embed_tokens,
     )
 
 
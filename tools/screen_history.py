@@ -0,0 +1,206 @@
+"""Searchable history of screen OCR text (SQLite + FTS5 prefix search, batched background writes), behind screen.search."""
+
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from core.config import Config
+
+
+_BATCH_ROWS = 200
+_BATCH_SEC = 1.0
+_PRUNE_SEC = 3600.0
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text: str, any_word: bool = False) -> str:
+    """FTS5 query matching the words of `text` as prefixes (all of them, or any with `any_word`)."""
+    tokens = [f'"{token}"*' for token in _TOKEN_RE.findall((text or "").lower())]
+    return (" OR " if any_word else " ").join(tokens)
+
+
+class ScreenHistory:
+    def __init__(self, db_path: str | None = None, retention_days: float = 14.0, max_rows: int = 1_000_000) -> None:
+        self._db_path = db_path or Config().screen_history_path
+        self._retention_sec = retention_days * 86400.0
+        self._max_rows = max_rows
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+        self.written = 0
+        self.failures = 0
+        self.fts = self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=10.0)
+        conn.execute("PRAGMA journal_mode=WAL")  # searches don't wait for the writer
+        return conn
+
+    def _init_db(self) -> bool:
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS screen_history ("
+                "id INTEGER PRIMARY KEY, seen_at REAL NOT NULL, target TEXT, text TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS screen_history_seen ON screen_history (seen_at)")
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS screen_history_fts USING fts5("
+                    "text, content='screen_history', content_rowid='id', tokenize='unicode61', prefix='2 3')"
+                )
+            except sqlite3.OperationalError:  # SQLite built without FTS5
+                return False
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS screen_history_ai AFTER INSERT ON screen_history BEGIN "
+                "INSERT INTO screen_history_fts (rowid, text) VALUES (new.id, new.text); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS screen_history_ad AFTER DELETE ON screen_history BEGIN "
+                "INSERT INTO screen_history_fts (screen_history_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+            )
+        return True
+
+    def add(self, lines: list[str], target: str = "", seen_at: float | None = None) -> None:
+        """Queue lines for the background writer (never blocks on the database)."""
+        seen_at = time.time() if seen_at is None else seen_at
+        for line in lines:
+            line = line.strip()
+            if line:
+                self._queue.put((seen_at, target, line))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._write_loop, name="screen-history", daemon=True)
+                    self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued lines are written."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        while True:
+            rows = [self._queue.get()]
+            deadline = time.monotonic() + _BATCH_SEC
+            while len(rows) < _BATCH_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO screen_history (seen_at, target, text) VALUES (?, ?, ?)", rows)
+                self.written += len(rows)
+                if time.monotonic() - self._pruned_at > _PRUNE_SEC:
+                    self._prune(conn)
+            except sqlite3.Error as exc:  # history is best effort; the reader keeps working
+                self.failures += 1
+                if self.failures == 1:
+                    print(f"[HANA] Screen history write failed: {exc}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        self._pruned_at = time.monotonic()
+        with conn:
+            conn.execute("DELETE FROM screen_history WHERE seen_at < ?", (time.time() - self._retention_sec,))
+            last = conn.execute("SELECT MAX(id) FROM screen_history").fetchone()[0]
+            if last is not None:
+                conn.execute("DELETE FROM screen_history WHERE id <= ?", (last - self._max_rows,))
+        if self.fts:
+            with conn:
+                conn.execute("INSERT INTO screen_history_fts (screen_history_fts) VALUES ('optimize')")
+
+    def _first_id(self, conn: sqlite3.Connection, since: float) -> int:
+        row = conn.execute(
+            "SELECT id FROM screen_history WHERE seen_at >= ? ORDER BY seen_at LIMIT 1", (since,)
+        ).fetchone()
+        return row[0] if row and row[0] is not None else 1 << 62
+
+    def _last_id(self, conn: sqlite3.Connection, until: float) -> int:
+        row = conn.execute(
+            "SELECT id FROM screen_history WHERE seen_at <= ? ORDER BY seen_at DESC LIMIT 1", (until,)
+        ).fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    def search(self, query: str, since: float | None = None, until: float | None = None, limit: int = 20) -> list[dict]:
+        """Lines matching `query` seen between `since` and `until`, newest first."""
+        with self._connect() as conn:
+            low = self._first_id(conn, since) if since is not None else 0
+            high = self._last_id(conn, until) if until is not None else 1 << 62
+            if not self.fts:
+                pattern = "%" + "%".join(_TOKEN_RE.findall(query or "")) + "%"
+                rows = conn.execute(
+                    "SELECT id, seen_at, target, text FROM screen_history "
+                    "WHERE id BETWEEN ? AND ? AND text LIKE ? ORDER BY id DESC LIMIT ?",
+                    (low, high, pattern, limit),
+                ).fetchall()
+                return [self._row(row) for row in rows]
+            rows = []
+            for any_word in (False, True):  # all words first; any word if that finds nothing
+                match = fts_query(query, any_word)
+                if not match:
+                    break
+                rows = conn.execute(
+                    "SELECT h.id, h.seen_at, h.target, h.text FROM screen_history_fts f "
+                    "JOIN screen_history h ON h.id = f.rowid "
+                    "WHERE screen_history_fts MATCH ? AND f.rowid BETWEEN ? AND ? "
+                    "ORDER BY f.rowid DESC LIMIT ?",
+                    (match, low, high, limit),
+                ).fetchall()
+                if rows:
+                    break
+        return [self._row(row) for row in rows]
+
+    def around(self, moment: float, window: float = 120.0, limit: int = 40) -> list[dict]:
+        """Lines seen within `window` seconds of `moment`, in time order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, seen_at, target, text FROM screen_history WHERE seen_at BETWEEN ? AND ? ORDER BY id LIMIT ?",
+                (moment - window, moment + window, limit),
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    @staticmethod
+    def _row(row: tuple) -> dict:
+        _, seen_at, target, text = row
+        return {
+            "time": datetime.fromtimestamp(seen_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "target": target or "",
+            "text": text,
+        }
+
+
+_HISTORY = None
+_HISTORY_LOCK = threading.Lock()
+
+
+def get_history() -> ScreenHistory:
+    global _HISTORY
+    with _HISTORY_LOCK:
+        if _HISTORY is None:
+            config = Config()
+            _HISTORY = ScreenHistory(config.screen_history_path, retention_days=config.screen_history_days)
+        return _HISTORY
+
+
+def search_screen(query: str | None = None, minutes: int | None = None, limit: int = 20) -> dict:
+    """screen.search: find text seen on screen; `minutes` looks back that far (or, without a query, around then)."""
+    history = get_history()
+    now = time.time()
+    if query:
+        since = now - minutes * 60 if minutes else None
+        lines = history.search(query, since=since, limit=limit)
+    else:
+        lines = history.around(now - (minutes or 0) * 60, window=120.0, limit=limit)
+    return {"query": query or "", "lines": lines}
@@ -1,11 +1,12 @@
 import os
-import re
 import shutil
 import subprocess
 import urllib.parse
-import urllib.request
 import webbrowser
 
+from core.errors import ActionCancelled
+from tools import app_index, youtube_resolver
+
 
 def _youtube_search_url(query: str) -> str:
     encoded = urllib.parse.quote_plus(query)
@@ -13,27 +14,10 @@ def _youtube_search_url(query: str) -> str:
 
 
 def _youtube_first_url(query: str) -> str | None:
-    search_url = _youtube_search_url(query)
-    try:
-        req = urllib.request.Request(
-            search_url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            },
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            html = resp.read().decode("utf-8", "ignore")
-    except Exception:
-        return None
-
-    match = re.search(r'"videoId":"([a-zA-Z0-9_-]{11})"', html)
-    if not match:
-        match = re.search(r"watch\\?v=([a-zA-Z0-9_-]{11})", html)
-    if not match:
+    video_id = youtube_resolver.get_resolver().resolve(query)
+    if not video_id:
         return None
-    return f"https://www.youtube.com/watch?v={match.group(1)}&autoplay=1"
+    return youtube_resolver.watch_url(video_id)
 
 
 def _is_url_like(target: str) -> bool:
@@ -92,11 +76,31 @@ def _resolve_windows_target(target: str) -> str | None:
     return None
 
 
-def launch_app(target: str, args: list) -> dict:
+def _launch_indexed(entry: dict, args: list) -> str:
+    target = entry["target"]
+    if entry.get("kind") == "desktop":
+        subprocess.Popen(list(target) + args)
+        return entry["name"]
+    if entry.get("kind") == "shortcut":
+        if args:
+            subprocess.Popen(["cmd", "/c", "start", "", target] + args, shell=False)
+        else:
+            os.startfile(target)
+        return target
+    subprocess.Popen([target] + args)
+    return target
+
+
+def launch_app(target: str, args: list | None = None) -> dict:
     if not target:
         raise ValueError("Missing target argument.")
     args = list(args or [])
 
+    if not os.path.dirname(target.strip().strip('"')) and not _is_url_like(target):
+        entry = app_index.get_index().lookup(target)
+        if entry:
+            return {"launched": _launch_indexed(entry, args)}
+
     if os.name == "nt":
         resolved = _resolve_windows_target(target)
         if resolved:
@@ -108,6 +112,9 @@ def launch_app(target: str, args: list) -> dict:
         if target.lower() in {"telegram", "telegram.exe", "tg"}:
             if webbrowser.open("tg://"):
                 return {"launched": "tg://"}
+        candidates = app_index.get_index().suggest(target)
+        if candidates:
+            return {"launched": None, "candidates": candidates}
         try:
             subprocess.Popen(["cmd", "/c", "start", "", target] + args, shell=False)
             return {"launched": target}
@@ -121,6 +128,9 @@ def launch_app(target: str, args: list) -> dict:
     if _is_url_like(target):
         webbrowser.open(target)
         return {"launched": target}
+    candidates = app_index.get_index().suggest(target)
+    if candidates:
+        return {"launched": None, "candidates": candidates}
     raise ValueError(f"Unable to launch app: {target}")
 
 
@@ -129,15 +139,23 @@ def open_path(path: str) -> dict:
     return {"opened": path}
 
 
-def open_url(args: dict) -> dict:
-    url = args.get("url")
-    query = args.get("query")
-    provider = (args.get("provider") or "").lower()
-    play = bool(args.get("play") or args.get("play_first"))
+def open_url(
+    url: str | None = None,
+    query: str | None = None,
+    provider: str | None = None,
+    play: bool = False,
+    play_first: bool = False,
+    progress=None,
+    cancel=None,
+) -> dict:
+    provider = (provider or "").lower()
+    play = bool(play or play_first)
 
     if provider == "youtube":
         if query:
             if play:
+                if progress:
+                    progress(0.0, "Looking up the first YouTube result")
                 url = _youtube_first_url(query) or _youtube_search_url(query)
             else:
                 url = _youtube_search_url(query)
@@ -149,5 +167,7 @@ def open_url(args: dict) -> dict:
         url = f"https://www.google.com/search?q={encoded}"
     if not url:
         raise ValueError("Missing url or query.")
+    if cancel is not None and cancel.is_set():
+        raise ActionCancelled("Action cancelled.")
     webbrowser.open(url)
     return {"opened": url}
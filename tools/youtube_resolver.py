@@ -0,0 +1,224 @@
+"""
+YouTube search -> first video id, with a SQLite cache and background prefetch.
+Live searches stop reading at the first videoId and follow up to three redirects.
+"""
+
+import http.client
+import re
+import sqlite3
+import ssl
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.config import Config
+
+
+_HOST = "www.youtube.com"
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+_VIDEO_ID_RE = re.compile(rb'"videoId":"([a-zA-Z0-9_-]{11})"')
+_WATCH_RE = re.compile(rb"watch\?v=([a-zA-Z0-9_-]{11})")
+_READ_SIZE = 16 * 1024
+_OVERLAP = 64  # keep the tail of the previous chunk so a match can straddle reads
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 3
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def watch_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}&autoplay=1"
+
+
+class YouTubeResolver:
+    def __init__(self, db_path: str | None = None, ttl_sec: float = 7 * 24 * 3600, timeout: float = 10.0) -> None:
+        self._db_path = db_path or Config().db_path
+        self._ttl_sec = ttl_sec
+        self._timeout = timeout
+        self._ssl_context = ssl.create_default_context()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yt-resolve")
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS youtube_cache ("
+                "query TEXT PRIMARY KEY, video_id TEXT, resolved_at REAL)"
+            )
+
+    def _cache_get(self, key: str) -> str | None:
+        with sqlite3.connect(self._db_path) as conn:
+            row = conn.execute(
+                "SELECT video_id, resolved_at FROM youtube_cache WHERE query = ?",
+                (key,),
+            ).fetchone()
+        if not row or time.time() - row[1] > self._ttl_sec:
+            return None
+        return row[0]
+
+    def _cache_put(self, key: str, video_id: str) -> None:
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO youtube_cache (query, video_id, resolved_at) VALUES (?, ?, ?)",
+                (key, video_id, time.time()),
+            )
+
+    def prefetch(self, query: str) -> None:
+        """Start resolving `query` in the background; later `resolve` calls reuse the result."""
+        key = normalize_query(query)
+        if not key:
+            return
+        with self._lock:
+            if key in self._inflight:
+                return
+            future = self._pool.submit(self._resolve_key, key)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f: self._forget(key, future))
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def resolve(self, query: str) -> str | None:
+        """Return the first video id for `query`, or None if it cannot be found."""
+        key = normalize_query(query)
+        if not key:
+            return None
+        with self._lock:
+            future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return future.result(timeout=self._timeout)
+            except Exception:
+                return None
+        return self._resolve_key(key)
+
+    def _resolve_key(self, key: str) -> str | None:
+        try:
+            cached = self._cache_get(key)
+        except sqlite3.Error:
+            cached = None
+        if cached:
+            return cached
+        try:
+            video_id = self._search(key)
+        except Exception:
+            return None
+        if video_id:
+            try:
+                self._cache_put(key, video_id)
+            except sqlite3.Error:
+                pass
+        return video_id
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(_HOST, timeout=self._timeout, context=self._ssl_context)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def _search(self, key: str) -> str | None:
+        url = f"https://{_HOST}/results?search_query=" + urllib.parse.quote_plus(key)
+        for _ in range(_MAX_REDIRECTS + 1):
+            video_id, location = self._get(url)
+            if location is None:
+                return video_id
+            url = urllib.parse.urljoin(url, location)
+        return None
+
+    def _get(self, url: str) -> tuple[str | None, str | None]:
+        """Fetch `url` and scan it; returns (video_id, redirect location)."""
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        headers = {"User-Agent": _USER_AGENT, "Accept-Encoding": "identity", "Connection": "keep-alive"}
+        if parts.scheme != "https" or parts.hostname is None:
+            return None, None
+        if parts.netloc != _HOST:
+            # off-host redirect (e.g. a consent page): one-off connection, not kept alive
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=self._timeout, context=self._ssl_context)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                if resp.status in _REDIRECT_STATUSES:
+                    resp.read()
+                    return None, resp.getheader("Location")
+                return self._scan(resp)[0], None
+            finally:
+                conn.close()
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # Stale keep-alive socket: reconnect once.
+                self._drop_connection()
+                if attempt:
+                    raise
+                continue
+            if resp.status in _REDIRECT_STATUSES:
+                resp.read()
+                if resp.will_close:
+                    self._drop_connection()
+                return None, resp.getheader("Location")
+            try:
+                video_id, drained = self._scan(resp)
+            except Exception:
+                self._drop_connection()
+                raise
+            if not drained or resp.will_close:
+                self._drop_connection()
+            return video_id, None
+        return None, None
+
+    @staticmethod
+    def _scan(resp) -> tuple[str | None, bool]:
+        """Read until the first video id; returns (video_id, body_fully_read)."""
+        if resp.status != 200:
+            resp.read()
+            return None, True
+        tail = b""
+        fallback = None
+        while True:
+            chunk = resp.read(_READ_SIZE)
+            if not chunk:
+                return fallback, True
+            window = tail + chunk
+            match = _VIDEO_ID_RE.search(window)
+            if match:
+                return match.group(1).decode("ascii"), False
+            if fallback is None:
+                watch = _WATCH_RE.search(window)
+                if watch:
+                    fallback = watch.group(1).decode("ascii")
+            tail = window[-_OVERLAP:]
+
+
+_RESOLVER = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_resolver() -> YouTubeResolver:
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = YouTubeResolver()
+        return _RESOLVER
@@ -11,13 +11,22 @@ class Avatar2D(QWidget):
     """
     Lightweight 2D avatar meant to feel like a VTuber-style companion.
     Uses user-provided PNG sequences when available; falls back to procedural art.
+    While speech audio plays, "speaking" frames are picked by the lip sync level,
+    so that sequence should go from mouth closed to mouth wide open.
     """
 
-    def __init__(self, assets_dir: str, on_chat: Callable | None = None, on_quit: Callable | None = None) -> None:
+    def __init__(
+        self,
+        assets_dir: str,
+        on_chat: Callable | None = None,
+        on_quit: Callable | None = None,
+        lipsync=None,
+    ) -> None:
         super().__init__()
         self._assets_dir = assets_dir
         self._on_chat = on_chat
         self._on_quit = on_quit
+        self._lipsync = lipsync if lipsync is not None and lipsync.enabled else None
         self._state = "idle"
         self._frame_idx = 0
         self._canvas_size = QSize(500, 700)
@@ -51,6 +60,13 @@ class Avatar2D(QWidget):
         self._timer.start(self._interval_for(state))
 
     def _next_frame(self) -> None:
+        if self._state == "speaking" and self._lipsync is not None:
+            seq = self._frames.get("speaking") or []
+            idx = min(len(seq) - 1, int(self._lipsync.level() * len(seq)))
+            if idx != self._frame_idx:
+                self._frame_idx = max(idx, 0)
+                self._update_frame()
+            return
         self._frame_idx = (self._frame_idx + 1) % max(len(self._frames.get(self._state, [])), 1)
         self._update_frame()
 
@@ -63,7 +79,7 @@ class Avatar2D(QWidget):
 
     def _interval_for(self, state: str) -> int:
         if state == "speaking":
-            return 80
+            return 40 if self._lipsync is not None else 80
         if state == "listening":
             return 120
         if state == "thinking":
@@ -128,8 +144,8 @@ class Avatar2D(QWidget):
 
         frames = []
         if state == "speaking":
-            mouths = ("soft", "open", "wide", "open")
-            eyes = ("open", "open", "open", "smile")
+            mouths = ("soft", "open", "wide")  # closed -> open, indexed by lip sync level
+            eyes = ("open", "open", "smile")
         elif state == "listening":
             mouths = ("dot", "dot", "soft")
             eyes = ("focused", "open", "open")
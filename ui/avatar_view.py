@@ -38,7 +38,7 @@ class _WinRect(ctypes.Structure):
 class _PandaApp(ShowBase):
     _BOUNDS_LIMIT = 1e5
 
-    def __init__(self, model_path: str, on_chat, on_quit):
+    def __init__(self, model_path: str, on_chat, on_quit, lipsync=None):
         # Panda3D oynasini Qt ichida ishlatish uchun alohida window ochmaslikka harakat qilamiz
         model_dir = os.path.dirname(model_path)
         if model_dir:
@@ -95,6 +95,7 @@ class _PandaApp(ShowBase):
         self._joint_anim = []
         self._jaw_phase = 0.0
         self._jaw_open = 0.0
+        self._lipsync = lipsync if lipsync is not None and lipsync.enabled else None
         self._blink_state = 0.0
         self._blink_until = 0.0
         self._next_blink_at = time.monotonic() + random.uniform(2.5, 4.8)
@@ -866,14 +867,12 @@ class _PandaApp(ShowBase):
             return
 
     def _update_face(self, dt: float, now: float) -> None:
-        # Jaw flap for speech-like movement
-        speed = 6.0 if self._state == "speaking" else 2.8
-        self._jaw_phase += dt * speed * math.pi * 2.0
-        amp = self._jaw_target_amp if hasattr(self, "_jaw_target_amp") else 6.0
-        mouth = abs(math.sin(self._jaw_phase)) * amp
-        if self._state != "speaking":
-            mouth *= 0.6
-        self._jaw_open = mouth
+        if self._state == "speaking" and self._lipsync is not None:
+            # Follow the audio envelope (closed between sentences); ease so 20 ms steps do not look jittery.
+            target = self._lipsync.level() * self._jaw_target_amp
+            self._jaw_open += (target - self._jaw_open) * min(1.0, dt * 25.0)
+        else:
+            self._update_jaw_flap(dt)
 
         # Blink timing
         if now >= self._next_blink_at:
@@ -885,6 +884,16 @@ class _PandaApp(ShowBase):
         else:
             self._blink_state = 0.0
 
+    def _update_jaw_flap(self, dt: float) -> None:
+        # Jaw flap for speech-like movement
+        speed = 6.0 if self._state == "speaking" else 2.8
+        self._jaw_phase += dt * speed * math.pi * 2.0
+        amp = self._jaw_target_amp if hasattr(self, "_jaw_target_amp") else 6.0
+        mouth = abs(math.sin(self._jaw_phase)) * amp
+        if self._state != "speaking":
+            mouth *= 0.6
+        self._jaw_open = mouth
+
     def _animate_joints(self, t: float, walking: bool = False) -> None:
         if not self._joint_anim:
             return
@@ -1105,10 +1114,10 @@ class AvatarView(QWidget):
     MVP: Panda3D alohida oynada ko‘rsatadi.
     (Agar xohlasang keyingi bosqichda Qt widget ichiga embed qilamiz.)
     """
-    def __init__(self, model_path: str, on_chat=None, on_quit=None) -> None:
+    def __init__(self, model_path: str, on_chat=None, on_quit=None, lipsync=None) -> None:
         super().__init__()
         layout = QVBoxLayout(self)
-        self._app = self._get_app(model_path, on_chat, on_quit)
+        self._app = self._get_app(model_path, on_chat, on_quit, lipsync)
         if self._app is None:
             return
 
@@ -1127,7 +1136,7 @@ class AvatarView(QWidget):
         finally:
             self._stepping = False
 
-    def _get_app(self, model_path: str, on_chat, on_quit):
+    def _get_app(self, model_path: str, on_chat, on_quit, lipsync=None):
         global _PANDA_APP
         if _PANDA_APP is not None:
             _PANDA_APP.load_model(model_path)
@@ -1135,7 +1144,7 @@ class AvatarView(QWidget):
         existing = getattr(builtins, "base", None)
         if existing is not None:
             return None
-        _PANDA_APP = _PandaApp(model_path, on_chat, on_quit)
+        _PANDA_APP = _PandaApp(model_path, on_chat, on_quit, lipsync)
         return _PANDA_APP
 
     def set_state(self, state: str) -> None:
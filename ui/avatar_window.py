@@ -4,6 +4,7 @@ from PySide6.QtCore import QPoint, Qt
 from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
 
 from core.config import Config
+from core.lipsync import get_lipsync
 
 
 class AvatarWindow(QWidget):
@@ -28,11 +29,16 @@ class AvatarWindow(QWidget):
             from ui.avatar_2d import Avatar2D  # local import to avoid Panda3D when unused
 
             assets_dir = os.path.join(base_dir, "assets", "waifu2d")
-            self._avatar = Avatar2D(assets_dir=assets_dir, on_chat=self._toggle_chat, on_quit=self._quit)
+            self._avatar = Avatar2D(
+                assets_dir=assets_dir,
+                on_chat=self._toggle_chat,
+                on_quit=self._quit,
+                lipsync=get_lipsync(),
+            )
         else:
             from ui.avatar_view import AvatarView  # Panda3D renderer
 
-            self._avatar = AvatarView(model_path, on_chat=self._toggle_chat, on_quit=self._quit)
+            self._avatar = AvatarView(model_path, on_chat=self._toggle_chat, on_quit=self._quit, lipsync=get_lipsync())
         if hasattr(self._chat_window, "set_avatar_window"):
             self._chat_window.set_avatar_window(self)
 
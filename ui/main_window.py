@@ -1,7 +1,9 @@
+import threading
 import time
-from PySide6.QtCore import Qt, QPoint, QTimer, QThread, Signal
-from PySide6.QtGui import QAction, QActionGroup, QTextCursor
+from PySide6.QtCore import Qt, QObject, QPoint, QRunnable, QThreadPool, QTimer, QThread, Signal
+from PySide6.QtGui import QAction, QActionGroup, QColor, QTextCharFormat, QTextCursor
 from PySide6.QtWidgets import (
+    QApplication,
     QHBoxLayout,
     QInputDialog,
     QLabel,
@@ -19,8 +21,14 @@ from PySide6.QtWidgets import (
 from core.agent import Agent
 from core.config import Config
 from core.executor import Executor
-from core.tts import TTSPlayer
+from core.lipsync import get_lipsync
+from core.synth import build_chain
+from core.tts import PRIORITY_ACTION, PRIORITY_PROACTIVE, PRIORITY_REPLY, TTSPlayer
+from core.tts_cache import AudioCache
 from ui.confirm_dialog import ConfirmDialog
+from ui.region_picker import RegionPicker
+from ui.screen_overlay import ScreenOverlay
+from ui.screen_reader import ScreenReader
 from core.waifu import WaifuLayer
 
 
@@ -41,6 +49,63 @@ class AgentWorker(QThread):
             self.failed.emit(str(exc))
 
 
+# Fixed lines spoken often enough to pre-synthesize into the TTS cache.
+# Action results are spoken through filter_reply; "Action cancelled." is spoken as is.
+_WARM_PHRASES = (
+    "Action executed.",
+    "Action completed.",
+    "No matching files found.",
+    "Opening the link.",
+    "Opening YouTube.",
+    "Opening Telegram.",
+    "Opening Explorer.",
+)
+_WARM_PLAIN_PHRASES = ("Action cancelled.",)
+
+
+class SpeechSignals(QObject):
+    """Carries TTS sentence callbacks from the audio thread to the UI thread."""
+
+    # (chat block number, sentence index, sentence)
+    sentence_started = Signal(int, int, str)
+    sentence_ended = Signal(int, int, str)
+
+
+class ActionSignals(QObject):
+    progress = Signal(float, str)
+    finished = Signal(dict)
+
+
+class ActionTask(QRunnable):
+    """Runs one executor action on the pool; signals are delivered on the UI thread."""
+
+    def __init__(self, executor: Executor, action: str, args: dict, confirmed: bool) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ActionSignals()
+        self.cancel_event = threading.Event()
+        self.action = action
+        self.args = args
+        self._executor = executor
+        self._confirmed = confirmed
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            outcome = self._executor.execute_action(
+                self.action,
+                self.args,
+                confirmed=self._confirmed,
+                progress=self.signals.progress.emit,
+                cancel=self.cancel_event,
+            )
+        except Exception as exc:  # pragma: no cover - executor already catches tool errors
+            outcome = {"status": "error", "message": str(exc)}
+        self.signals.finished.emit(outcome)
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -52,12 +117,30 @@ class MainWindow(QMainWindow):
         self._agent = Agent()
         self._config = Config()
         self._executor = Executor()
+        self._action_pool = QThreadPool(self)
+        self._action_pool.setMaxThreadCount(4)
+        self._action_tasks: list[ActionTask] = []
         self._worker = None
         self._request_timeout_ms = 20000
         self._drag_offset = QPoint()
         self._avatar_window = None
-        self._tts = TTSPlayer(self._config.tts_voice)
+        self._screen_reader: ScreenReader | None = None
+        self._screen_overlay: ScreenOverlay | None = None
+        self._screen_target = "monitor:1"
+        self._region_picker: RegionPicker | None = None
+        self._tts = TTSPlayer(
+            self._config.tts_voice,
+            synthesizers=build_chain(self._config.tts_backend),
+            cache=AudioCache(self._config.tts_cache_dir, max_bytes=self._config.tts_cache_mb * 1024 * 1024),
+            lipsync=get_lipsync(),
+        )
+        self._speech_signals = SpeechSignals()
+        self._speech_signals.sentence_started.connect(self._on_sentence_started)
+        self._speech_signals.sentence_ended.connect(self._on_sentence_ended)
+        self._speech_block = -1
+        self._speech_offset = 0
         self._waifu = WaifuLayer(self._config)
+        self._warm_tts_cache()
         self._last_interaction = time.monotonic()
         self._silence_timer = QTimer(self)
         self._silence_timer.timeout.connect(self._on_silence_tick)
@@ -73,6 +156,18 @@ class MainWindow(QMainWindow):
         self._send_btn = QPushButton("Send")
         self._send_btn.clicked.connect(self._on_send)
 
+        self._action_status = QLabel()
+        self._action_status.setStyleSheet("color: rgba(255, 255, 255, 180);")
+        self._stop_btn = QPushButton("Stop")
+        self._stop_btn.setFixedWidth(56)
+        self._stop_btn.clicked.connect(self._on_stop_actions)
+        action_row = QHBoxLayout()
+        action_row.addWidget(self._action_status, 1)
+        action_row.addWidget(self._stop_btn)
+        self._action_row = QWidget()
+        self._action_row.setLayout(action_row)
+        self._action_row.hide()
+
         menu_btn = QToolButton()
         menu_btn.setText("Settings")
         menu = QMenu(menu_btn)
@@ -89,6 +184,16 @@ class MainWindow(QMainWindow):
             language_menu.addAction(action)
             self._language_actions[key] = action
         self._language_group.triggered.connect(self._on_language_changed)
+        self._screen_action = menu.addAction("Read Screen")
+        self._screen_action.setCheckable(True)
+        self._screen_action.toggled.connect(self._on_toggle_screen_reader)
+        target_menu = menu.addMenu("Screen Target")
+        target_menu.addAction("Whole Screen").triggered.connect(lambda: self._set_screen_target("monitor:1"))
+        target_menu.addAction("Focused Window").triggered.connect(lambda: self._set_screen_target("focused"))
+        target_menu.addAction("Pick Region...").triggered.connect(self._on_pick_screen_region)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop_screen_reader)
         menu_btn.setMenu(menu)
         menu_btn.setPopupMode(QToolButton.InstantPopup)
         self._sync_language_menu()
@@ -116,6 +221,7 @@ class MainWindow(QMainWindow):
         content_layout.addWidget(self._chat)
         content_layout.addWidget(self._input)
         content_layout.addWidget(self._send_btn)
+        content_layout.addWidget(self._action_row)
 
         card = QWidget()
         card.setObjectName("chatCard")
@@ -152,7 +258,13 @@ class MainWindow(QMainWindow):
         self._send_btn.setEnabled(not busy)
         self._input.setEnabled(not busy)
 
-    def _append_chat(self, role: str, message: str, mood: str | None = None) -> None:
+    def _append_chat(
+        self,
+        role: str,
+        message: str,
+        mood: str | None = None,
+        priority: int = PRIORITY_REPLY,
+    ) -> None:
         if not message:
             return
         self._chat.append(f"{role}: {message}")
@@ -161,7 +273,19 @@ class MainWindow(QMainWindow):
         if role == "AIRI":
             self._set_avatar_state("speaking")
             style = self._waifu.style_tag()
-            self._tts.speak(message, style=style, on_done=lambda: QTimer.singleShot(600, self._after_speech))
+            block = self._chat.document().lastBlock().blockNumber()
+            proactive = priority == PRIORITY_PROACTIVE
+            self._tts.speak(
+                message,
+                style=style,
+                on_done=lambda: QTimer.singleShot(600, self._after_speech),
+                on_sentence_start=lambda i, s: self._speech_signals.sentence_started.emit(block, i, s),
+                on_sentence_end=lambda i, s: self._speech_signals.sentence_ended.emit(block, i, s),
+                priority=priority,
+                # Only the latest proactive line is worth saying, and only soon after it was due.
+                key="proactive" if proactive else None,
+                max_wait=15.0 if proactive else None,
+            )
             self._last_interaction = time.monotonic()
         elif role == "User":
             self._last_interaction = time.monotonic()
@@ -177,6 +301,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Missing API Key", "OpenRouter API key is required to continue.")
                 return
         self._input.clear()
+        self._tts.interrupt()
         self._append_chat("User", text)
         self._set_busy(True)
         self._set_avatar_state("thinking")
@@ -227,7 +352,7 @@ class MainWindow(QMainWindow):
         msg = self._waifu.tick(silence_sec=silence, now=time.time())
         if msg and not self._worker:
             styled = self._waifu.filter_reply(msg)
-            self._append_chat("AIRI", styled, mood=self._waifu.mood())
+            self._append_chat("AIRI", styled, mood=self._waifu.mood(), priority=PRIORITY_PROACTIVE)
 
     def _handle_action(self, result: dict) -> None:
         action = result.get("action")
@@ -235,17 +360,63 @@ class MainWindow(QMainWindow):
         preface = result.get("message")
         if preface:
             self._append_chat("HANA", self._waifu.filter_reply(preface))
+        self._start_action(action, args, confirmed=False)
+
+    def _start_action(self, action: str, args: dict, confirmed: bool) -> None:
+        task = ActionTask(self._executor, action, args, confirmed)
+        task.signals.progress.connect(self._on_action_progress)
+        task.signals.finished.connect(lambda outcome, task=task: self._on_action_finished(task, outcome))
+        self._action_tasks.append(task)
+        self._action_status.setText(f"Running {action}...")
+        self._action_row.show()
+        self._action_pool.start(task)
+
+    def _on_action_progress(self, fraction: float, message: str) -> None:
+        percent = max(0, min(100, int(fraction * 100)))
+        self._action_status.setText(f"{message} ({percent}%)" if message else f"{percent}%")
+
+    def _on_stop_actions(self) -> None:
+        for task in self._action_tasks:
+            task.cancel()
+        self._action_status.setText("Stopping...")
+
+    def _on_action_finished(self, task: ActionTask, outcome: dict) -> None:
+        if task in self._action_tasks:
+            self._action_tasks.remove(task)
+        if not self._action_tasks:
+            self._action_row.hide()
 
-        outcome = self._executor.execute_action(action, args, confirmed=False)
         if outcome.get("status") == "needs_confirmation":
+            # Confirmation stays on the UI thread; the confirmed run goes back to the pool.
             confirm = ConfirmDialog.confirm(self, outcome.get("message", "Confirm action?"))
             if not confirm:
-                self._append_chat("AIRI", "Action cancelled.")
+                self._append_chat("AIRI", "Action cancelled.", priority=PRIORITY_ACTION)
                 self._set_avatar_state("idle")
                 return
-            outcome = self._executor.execute_action(action, args, confirmed=True)
+            self._start_action(task.action, task.args, confirmed=True)
+            return
 
-        self._append_chat("AIRI", self._waifu.filter_reply(outcome.get("message", "Action completed.")), mood=self._waifu.mood())
+        message = outcome.get("message", "Action completed.")
+        matches = (outcome.get("result") or {}).get("matches")
+        if matches is not None:
+            if matches:
+                self._append_chat("HANA", "\n".join(f"{m['path']}  ({m['modified']})" for m in matches))
+            message = f"Found {len(matches)} matching files." if matches else "No matching files found."
+            if (outcome.get("result") or {}).get("building"):
+                message = (
+                    f"Found {len(matches)} matching files so far; I'm still indexing your files."
+                    if matches
+                    else "I'm still indexing your files. Please try again in a moment."
+                )
+        candidates = (outcome.get("result") or {}).get("candidates")
+        if candidates:
+            message = f"I couldn't find that app. Did you mean: {', '.join(candidates)}?"
+        lines = (outcome.get("result") or {}).get("lines")
+        if lines is not None:
+            if lines:
+                self._append_chat("HANA", "\n".join(f"[{line['time']}] {line['text']}" for line in lines))
+            message = f"Found {len(lines)} lines from your screen." if lines else "I didn't see that on your screen."
+        self._append_chat("AIRI", self._waifu.filter_reply(message), mood=self._waifu.mood(), priority=PRIORITY_ACTION)
         QTimer.singleShot(2000, lambda: self._set_avatar_state("idle"))
 
     def _on_set_api_key(self) -> None:
@@ -261,6 +432,60 @@ class MainWindow(QMainWindow):
         voice = Config.default_voice(language)
         self._config.tts_voice = voice
         self._tts.set_voice(voice)
+        self._warm_tts_cache()
+
+    def _on_toggle_screen_reader(self, checked: bool) -> None:
+        if checked:
+            self._start_screen_reader()
+        else:
+            self._stop_screen_reader()
+
+    def _start_screen_reader(self) -> None:
+        if self._screen_overlay is None:
+            self._screen_overlay = ScreenOverlay(on_close=lambda: self._screen_action.setChecked(False))
+        if self._screen_reader is None:
+            reader = ScreenReader(target=self._screen_target)
+            reader.text_ready.connect(self._screen_overlay.append_text)
+            reader.stats_ready.connect(self._screen_overlay.set_stats)
+            reader.error.connect(lambda message: self._append_chat("HANA", f"Screen reading: {message}"))
+            reader.finished.connect(lambda reader=reader: self._on_screen_reader_finished(reader))
+            self._screen_reader = reader
+            reader.start()
+        self._screen_overlay.show()
+
+    def _stop_screen_reader(self) -> None:
+        reader, self._screen_reader = self._screen_reader, None
+        if reader is not None:
+            reader.requestInterruption()
+            reader.wait(5000)
+        if self._screen_overlay is not None:
+            self._screen_overlay.hide()
+            self._screen_overlay.clear_text()
+
+    def _set_screen_target(self, target: str) -> None:
+        """Read `target` from now on (see core.screen_capture.parse_target); starts reading if it was off."""
+        self._screen_target = target
+        if self._screen_reader is not None:
+            self._screen_reader.set_target(target)
+            if self._screen_overlay is not None:
+                self._screen_overlay.clear_text()
+        else:
+            self._screen_action.setChecked(True)
+
+    def _on_pick_screen_region(self) -> None:
+        # Kept referenced while it is open; it deletes itself on close.
+        self._region_picker = RegionPicker()
+        self._region_picker.picked.connect(self._on_screen_region_picked)
+        self._region_picker.show()
+        self._region_picker.activateWindow()
+
+    def _on_screen_region_picked(self, left: int, top: int, width: int, height: int) -> None:
+        self._set_screen_target(f"region:{left},{top},{width},{height}")
+
+    def _on_screen_reader_finished(self, reader: ScreenReader) -> None:
+        # The reader stopped on its own (missing OCR dependency, pipeline failure).
+        if reader is self._screen_reader:
+            self._screen_action.setChecked(False)
 
     def _sync_language_menu(self) -> None:
         current = (self._config.language or "english").strip().lower()
@@ -283,7 +508,41 @@ class MainWindow(QMainWindow):
         self._agent.set_api_key(api_key)
         return True
 
+    def _warm_tts_cache(self) -> None:
+        waifu = self._waifu
+        lines = [variant for line in _WARM_PHRASES + waifu.common_lines() for variant in waifu.speech_variants(line)]
+        lines += [variant for line in _WARM_PLAIN_PHRASES for variant in waifu.speech_variants(line, styled=False)]
+        style = waifu.style_tag()
+        lines.sort(key=lambda line: line[1] != style)  # the current mood's lines are most likely next
+        self._tts.warm_up(lines)
+
+    def _on_sentence_started(self, block_number: int, index: int, sentence: str) -> None:
+        self._set_avatar_state("speaking")
+        if block_number != self._speech_block or index == 0:
+            self._speech_block = block_number
+            self._speech_offset = 0
+        block = self._chat.document().findBlockByNumber(block_number)
+        if not block.isValid():
+            return
+        pos = block.text().find(sentence, self._speech_offset)
+        if pos < 0:
+            return
+        self._speech_offset = pos + len(sentence)
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + pos)
+        cursor.setPosition(block.position() + pos + len(sentence), QTextCursor.KeepAnchor)
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = cursor
+        fmt = QTextCharFormat()
+        fmt.setBackground(QColor(255, 140, 207, 70))
+        selection.format = fmt
+        self._chat.setExtraSelections([selection])
+
+    def _on_sentence_ended(self, block_number: int, index: int, sentence: str) -> None:
+        self._chat.setExtraSelections([])
+
     def _after_speech(self) -> None:
+        self._chat.setExtraSelections([])
         self._set_avatar_state(self._waifu.idle_state())
 
     def toggle_visible(self) -> None:
@@ -0,0 +1,76 @@
+from PySide6.QtCore import QPoint, QRect, Qt, Signal
+from PySide6.QtGui import QColor, QGuiApplication, QPainter, QPen
+from PySide6.QtWidgets import QWidget
+
+
+class RegionPicker(QWidget):
+    """Full-desktop dimmed overlay; drag a rectangle to pick the screen region to read.
+
+    `picked` carries the region in physical desktop pixels (what mss expects),
+    ready for `core.screen_capture.RegionTarget`. Esc or a click without a drag cancels.
+    """
+
+    picked = Signal(int, int, int, int)
+    cancelled = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_DeleteOnClose, True)
+        self.setCursor(Qt.CrossCursor)
+        desktop = QRect()
+        for screen in QGuiApplication.screens():
+            desktop = desktop.united(screen.geometry())
+        self.setGeometry(desktop)
+        self._origin: QPoint | None = None
+        self._current: QPoint | None = None
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 90))
+        selection = self._selection()
+        if selection is not None:
+            painter.setCompositionMode(QPainter.CompositionMode_Clear)
+            painter.fillRect(selection, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor(255, 255, 255, 220), 1))
+            painter.drawRect(selection.adjusted(0, 0, -1, -1))
+
+    def mousePressEvent(self, event) -> None:
+        self._origin = self._current = event.position().toPoint()
+        self.update()
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._origin is not None:
+            self._current = event.position().toPoint()
+            self.update()
+
+    def mouseReleaseEvent(self, event) -> None:
+        self._current = event.position().toPoint()
+        selection = self._selection()
+        self.close()
+        if selection is None or selection.width() < 16 or selection.height() < 16:
+            self.cancelled.emit()
+            return
+        self.picked.emit(*self._to_physical(selection))
+
+    def keyPressEvent(self, event) -> None:
+        if event.key() == Qt.Key_Escape:
+            self.close()
+            self.cancelled.emit()
+
+    def _selection(self) -> QRect | None:
+        if self._origin is None or self._current is None:
+            return None
+        return QRect(self._origin, self._current).normalized()
+
+    def _to_physical(self, selection: QRect) -> tuple[int, int, int, int]:
+        # Qt works in logical pixels; scale by the DPI of the screen the selection starts on.
+        top_left = self.mapToGlobal(selection.topLeft())
+        screen = QGuiApplication.screenAt(top_left) or QGuiApplication.primaryScreen()
+        ratio = screen.devicePixelRatio()
+        origin = screen.geometry().topLeft()
+        left = origin.x() + (top_left.x() - origin.x()) * ratio
+        top = origin.y() + (top_left.y() - origin.y()) * ratio
+        return round(left), round(top), round(selection.width() * ratio), round(selection.height() * ratio)
@@ -39,9 +39,13 @@ class ScreenOverlay(QWidget):
         self._text.setReadOnly(True)
         self._text.setPlaceholderText("No OCR yet...")
 
+        self._stats = QLabel("")
+        self._stats.setStyleSheet("color: rgba(255, 255, 255, 150); font-size: 11px;")
+
         layout = QVBoxLayout()
         layout.addLayout(header)
         layout.addWidget(self._text)
+        layout.addWidget(self._stats)
 
         container = QWidget()
         container.setObjectName("overlayCard")
@@ -79,6 +83,16 @@ class ScreenOverlay(QWidget):
 
     def clear_text(self) -> None:
         self._text.clear()
+        self._stats.clear()
+
+    def set_stats(self, stats: dict) -> None:
+        """Show ScreenReader.stats(); MainWindow connects this to `stats_ready`."""
+        self._stats.setText(
+            f"OCR skipped {stats.get('skip_rate', 0.0) * 100:.0f}% of {stats.get('frames', 0)} frames"
+            f" · saved ~{stats.get('saved_seconds', 0.0):.1f}s CPU"
+            f" · {stats.get('lines_suppressed', 0)} repeated lines hidden"
+            f" · next in {stats.get('interval_ms', 0) / 1000.0:.1f}s ({stats.get('schedule', '')})"
+        )
 
     def _handle_close(self) -> None:
         self.hide()
@@ -1,15 +1,32 @@
 from typing import Optional
 from pathlib import Path
 import shutil
+import threading
+import time
 
 from PySide6.QtCore import QThread, Signal
 
+from core.screen_schedule import CaptureScheduler
+from core.screen_text import LineDeduper
+
 
 class ScreenReader(QThread):
-    """Capture the primary monitor and emit OCR text in the background."""
+    """Capture a screen target and emit OCR text in the background.
+
+    Capture pace adapts (`core.screen_schedule.CaptureScheduler`): slower while
+    the screen is static, faster while it changes, and never beyond the OCR
+    CPU budget. `interval_ms` is the pace right after a change.
+
+    The target is a `core.screen_capture.CaptureTarget` or its string form
+    ("monitor:N", "region:l,t,w,h", "window:<title>", "focused"); it is
+    re-resolved every frame, so windows are followed as they move. Frames that
+    changed are handed to `core.ocr_pool.OcrPipeline`, which recognizes their
+    dirty tiles on a process pool; capture keeps its own pace.
+    """
 
     text_ready = Signal(str)
     error = Signal(str)
+    stats_ready = Signal(dict)
 
     def __init__(
         self,
@@ -17,20 +34,50 @@ class ScreenReader(QThread):
         language: str = "eng",
         min_confidence: int = 65,
         max_chars: int = 800,
+        change_threshold: float = 0.004,
+        target=None,
+        repeat_window: float = 120.0,
+        similarity: float = 0.85,
+        min_interval_ms: int = 250,
+        max_interval_ms: int = 8000,
+        cpu_budget: float = 0.25,
+        ocr_preset: str = "balanced",
+        detect_text: bool = True,
+        record_history: bool = True,
     ) -> None:
         super().__init__()
-        self._interval_ms = max(200, int(interval_ms))
+        self._scheduler = CaptureScheduler(
+            interval=interval_ms / 1000.0,
+            min_interval=min_interval_ms / 1000.0,
+            max_interval=max_interval_ms / 1000.0,
+            cpu_budget=cpu_budget,
+        )
         self._language = language or "eng"
+        self._ocr_preset = ocr_preset
+        self._detect_text = detect_text
+        self._record_history = record_history
+        self._history = None
         self._min_confidence = max(0, min_confidence)
         self._max_chars = max_chars
-        self._last_text: Optional[str] = None
+        self._lines = LineDeduper(window=repeat_window, similarity=similarity)
+        self._change_threshold = change_threshold
+        self._frames = 0
+        self._skipped = 0
+        self._pipeline = None
+        self._failure: Optional[str] = None
+        self._target = target
+        self._capture_pixels = 0
+        self._wake = threading.Event()
 
     def run(self) -> None:
         try:
             import mss  # type: ignore
-            from PIL import Image  # type: ignore
             import pytesseract  # type: ignore
-            from pytesseract import Output  # type: ignore
+
+            from core.ocr_pool import OcrPipeline
+            from core.screen_capture import CaptureTarget, parse_target
+            from core.screen_diff import ChangeDetector, bgra_view
+            from tools.screen_history import get_history
             # If Tesseract isn't on PATH, try the default Windows install location
             if shutil.which("tesseract") is None:
                 win_tesseract = Path("C:/Program Files/Tesseract-OCR/tesseract.exe")
@@ -40,61 +87,125 @@ class ScreenReader(QThread):
             self.error.emit(f"Missing dependency: {exc}")
             return
 
+        # Capture runs here; recognition runs on a process pool and reports back through _on_lines.
+        self._failure = None
+        self._history = None
+        if self._record_history:
+            try:
+                self._history = get_history()
+            except Exception as exc:  # unwritable or corrupt history db: read the screen without history
+                print(f"[HANA] Screen history disabled: {exc}")
+        self._pipeline = OcrPipeline(
+            self._on_lines,
+            self._on_pipeline_error,
+            language=self._language,
+            min_confidence=self._min_confidence,
+            tesseract_cmd=pytesseract.pytesseract.tesseract_cmd,
+            preset=self._ocr_preset,
+            detect_text=self._detect_text,
+        )
         try:
+            self._pipeline.start()
+            detector = ChangeDetector(threshold=self._change_threshold)
+            scheduler = self._scheduler
+            observed_at = time.monotonic()
+            target_error = None
             with mss.mss() as sct:
-                monitor = sct.monitors[1]  # primary display
-                while not self.isInterruptionRequested():
+                while not self.isInterruptionRequested() and self._failure is None:
+                    started = time.monotonic()
+                    self._wake.clear()
+                    target = self._target
                     try:
-                        grab = sct.grab(monitor)
-                        img = Image.frombytes("RGB", grab.size, grab.bgra, "raw", "BGRX").convert("L")
-                        text = self._extract_text(pytesseract, Output, img)
-                        if text and text != self._last_text:
-                            self._last_text = text
-                            self.text_ready.emit(text)
-                    except pytesseract.TesseractNotFoundError:
-                        self.error.emit(
-                            "Tesseract OCR not found. Install it and ensure the `tesseract` executable is on PATH."
-                        )
-                        return
-                    except Exception as exc:
-                        self.error.emit(str(exc))
-                        return
-                    self.msleep(self._interval_ms)
+                        if not isinstance(target, CaptureTarget):
+                            target = self._target = parse_target(target)
+                        monitor = target.bounds(sct.monitors)
+                    except Exception as exc:  # bad target string, window API failure
+                        if str(exc) != target_error:  # report each failure once while it persists
+                            target_error = str(exc)
+                            self.error.emit(target_error)
+                        self._pause(scheduler.next_delay(False))
+                        continue
+                    target_error = None
+                    if monitor is None:  # window minimized or closed: wait for it
+                        self._pause(scheduler.next_delay(False))
+                        continue
+                    grab = sct.grab(monitor)
+                    self._capture_pixels = grab.width * grab.height
+                    self._frames += 1
+                    frame = bgra_view(grab.raw, grab.width, grab.height)  # no copy; mss allocates per grab
+                    changed = detector.changed(frame)
+                    if changed:
+                        self._pipeline.push(frame, started)
+                    else:
+                        self._skipped += 1
+                    now = time.monotonic()
+                    scheduler.observe(self._pipeline.busy_seconds, self._pipeline.frames_done, now - observed_at)
+                    observed_at = now
+                    delay = scheduler.next_delay(changed)
+                    self.stats_ready.emit(self.stats())
+                    # The interval is measured from capture start; OCR time is not added on top.
+                    self._pause(delay - (time.monotonic() - started))
+            if self._failure is not None:
+                self.error.emit(self._failure)
         except Exception as exc:  # pragma: no cover
             self.error.emit(str(exc))
+        finally:
+            self._pipeline.stop()
 
-    def _extract_text(self, pytesseract, Output, img) -> str:
-        """Run OCR and drop low-confidence noise before emitting."""
-        data = pytesseract.image_to_data(img, lang=self._language, output_type=Output.DICT)
-        texts: list[str] = []
-        current_line: list[str] = []
-        last_line_no: Optional[int] = None
-
-        for word, conf, line_no in zip(
-            data.get("text", []),
-            data.get("conf", []),
-            data.get("line_num", []),
-        ):
-            try:
-                conf_val = float(conf)
-            except (TypeError, ValueError):
-                continue
-            if conf_val < self._min_confidence:
-                continue
-            word = (word or "").strip()
-            if not word:
-                continue
-            if last_line_no is None or line_no == last_line_no:
-                current_line.append(word)
-            else:
-                texts.append(" ".join(current_line))
-                current_line = [word]
-            last_line_no = line_no
-
-        if current_line:
-            texts.append(" ".join(current_line))
-
-        joined = "\n".join(texts).strip()
+    def set_target(self, target) -> None:
+        """Switch the capture target (CaptureTarget or string); takes effect on the next frame."""
+        self._target = target
+        self._lines.clear()
+        self._wake.set()
+
+    def _pause(self, seconds: float) -> None:
+        """Sleep in short steps so long back-off intervals still react to stop and set_target."""
+        deadline = time.monotonic() + seconds
+        while not self.isInterruptionRequested() and not self._wake.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wake.wait(min(0.1, remaining))
+
+    def _on_lines(self, lines: list[str], captured_at: float) -> None:
+        # Only lines not shown within `repeat_window` go out; OCR jitter on old lines is absorbed.
+        fresh = self._lines.fresh(lines)
+        if fresh and self._history is not None:
+            target = self._target
+            self._history.add(fresh, target.describe() if hasattr(target, "describe") else str(target or ""))
+        text = self._join(fresh)
+        if text:
+            self.text_ready.emit(text)
+
+    def _on_pipeline_error(self, exc: Exception) -> None:
+        self._failure = str(exc)
+
+    def stats(self) -> dict:
+        """Frames captured/skipped, OCR time spent vs. saved by change gating (seconds), pipeline health."""
+        pipeline = self._pipeline
+        target = self._target
+        ocr_seconds = pipeline.ocr_seconds if pipeline is not None else 0.0
+        ocr_runs = self._frames - self._skipped
+        average = ocr_seconds / ocr_runs if ocr_runs else 0.0
+        stats = {
+            "frames": self._frames,
+            "skipped": self._skipped,
+            "skip_rate": round(self._skipped / self._frames, 3) if self._frames else 0.0,
+            "ocr_seconds": round(ocr_seconds, 2),
+            "saved_seconds": round(self._skipped * average, 2),
+            "ocr_fraction": round(pipeline.ocr_fraction, 3) if pipeline is not None else 0.0,
+            "target": target.describe() if hasattr(target, "describe") else (target or "monitor:1"),
+            "capture_pixels": self._capture_pixels,
+            "lines_emitted": self._lines.emitted,
+            "lines_suppressed": self._lines.suppressed,
+        }
+        stats.update(self._scheduler.stats())
+        if pipeline is not None:
+            stats.update(pipeline.stats())
+        return stats
+
+    def _join(self, lines: list[str]) -> str:
+        joined = "\n".join(lines).strip()
         if len(joined) > self._max_chars:
             truncated = joined[: self._max_chars]
             # Avoid cutting in the middle of a word for smoother TTS.